@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+ADW - Single entry point for all workflow phases.
+
+Usage:
+    python adws/adw.py <command> [args...]
+
+Commands run in this process. Each command module is imported only when it
+is selected, so `adw --help` and dispatch stay cheap.
+"""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+# command -> (module, description)
+COMMANDS = {
+    "plan": ("adw_plan", "Create implementation plan"),
+    "build": ("adw_build", "Implement from plan"),
+    "test": ("adw_test", "Run tests"),
+    "review": ("adw_review", "Review against spec"),
+    "pr": ("adw_pr", "Create pull request"),
+    "fix": ("adw_fix", "Auto-fix implementation errors"),
+    "classify": ("adw_classify", "Classify many issues in one provider call"),
+    "plan-build": ("adw_plan_build", "Plan + Build"),
+    "sdlc": ("adw_sdlc", "Full SDLC"),
+    "batch": ("adw_batch", "Full SDLC for many issues in parallel worktrees"),
+    "workspaces": ("adw_workspaces", "Manage the warm workspace pool"),
+    "webhook": ("adw_webhook", "Serve GitHub issue webhooks to local workers"),
+    "queue": ("adw_queue", "Durable job queue and phase workers"),
+    "runs": ("adw_runs", "Query run state by issue, branch, phase or status"),
+    "microbench": ("adw_microbench", "Benchmark output parsing against a stored baseline"),
+    "bench": ("adw_bench", "Benchmark end-to-end SDLC throughput on fake issues"),
+    "context": ("adw_context", "Build and show the repository context index"),
+}
+
+
+def usage() -> str:
+    """Build the top-level help text."""
+    lines = ["usage: adw <command> [args...]", "", "commands:"]
+    for name, (_, description) in COMMANDS.items():
+        lines.append(f"  {name:<12} {description}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 1
+    
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"❌ Unknown command: {command}\n")
+        print(usage())
+        return 1
+    
+    import importlib
+    module = importlib.import_module(COMMANDS[command][0])
+    return module.main(rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
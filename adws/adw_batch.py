@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+ADW Batch - Run the SDLC pipeline for many issues at once.
+
+Usage:
+    python adws/adw_batch.py <issue-number>... [--jobs N]
+        [--max-provider-calls N] [--max-check-jobs N] [--base origin/main] [--warm]
+
+Each issue runs `adw.py sdlc` in its own git worktree under
+agents/worktrees/<adw-id>, so branches and agents/<adw-id> state never
+collide. Provider calls and pnpm checks are capped separately across all
+pipelines through machine-wide slots (see adw_modules/limits.py).
+
+With --warm, worktrees come from the workspace pool (adw_modules/workspace.py)
+with dependencies and the Prisma client already in place, and go back to the
+pool afterwards.
+"""
+
+import sys
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from adw_modules.utils import generate_adw_id
+from adw_modules.worktrees import repo_root, resolve_ref, add_worktree, remove_worktree, link_node_modules
+from adw_modules.workspace import WorkspacePool
+
+
+ADW_ENTRY = Path(__file__).parent / "adw.py"
+
+
+def run_pipeline(
+    issue_number: int,
+    adw_id: str,
+    worktree: Path,
+    log_file: Path,
+    env: dict,
+    sdlc_args: list,
+) -> dict:
+    """Run one SDLC pipeline inside its worktree and return a summary row."""
+    start = time.monotonic()
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_file, "w") as log:
+        result = subprocess.run(
+            [sys.executable, str(ADW_ENTRY), "sdlc", str(issue_number), "--adw-id", adw_id] + sdlc_args,
+            cwd=worktree,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    return {
+        "issue_number": issue_number,
+        "adw_id": adw_id,
+        "worktree": str(worktree),
+        "log_file": str(log_file),
+        "returncode": result.returncode,
+        "duration_seconds": round(time.monotonic() - start, 3),
+    }
+
+
+def prepare_worktree(root: Path, adw_id: str, base: str, pool: Optional[WorkspacePool] = None) -> Optional[Path]:
+    """Check out `base` for one pipeline, from the pool when given."""
+    if pool:
+        return pool.acquire(base)
+    worktree = root / "agents" / "worktrees" / adw_id
+    if not add_worktree(worktree, base, str(root)):
+        return None
+    link_node_modules(worktree, root)
+    return worktree
+
+
+def finish_pipeline(
+    row: dict,
+    root: Path,
+    base: str,
+    pool: Optional[WorkspacePool] = None,
+    cleanup: bool = False,
+) -> None:
+    """Copy a pipeline's artifacts back and release or remove its worktree."""
+    worktree = Path(row["worktree"])
+    # Keep run artifacts next to the main checkout's other runs
+    artifacts = worktree / "agents" / row["adw_id"]
+    if artifacts.is_dir():
+        shutil.copytree(artifacts, root / "agents" / row["adw_id"], dirs_exist_ok=True)
+    if pool:
+        pool.release(worktree, base)
+        row["worktree"] = None
+    elif cleanup and row["returncode"] == 0 and remove_worktree(worktree, str(root)):
+        row["worktree"] = None
+
+
+def sdlc_flags(skip_test: bool = False, skip_review: bool = False) -> list:
+    """Extra `adw.py sdlc` arguments."""
+    flags = []
+    if skip_test:
+        flags.append("--skip-test")
+    if skip_review:
+        flags.append("--skip-review")
+    return flags
+
+
+def run(
+    issue_numbers: list,
+    jobs: Optional[int] = None,
+    max_provider_calls: Optional[int] = None,
+    max_check_jobs: Optional[int] = None,
+    base: str = "origin/main",
+    skip_test: bool = False,
+    skip_review: bool = False,
+    cleanup: bool = False,
+    warm: bool = False,
+) -> int:
+    """Run pipelines for `issue_numbers` concurrently."""
+    root = repo_root()
+    batch_id = generate_adw_id()
+    batch_dir = root / "agents" / f"batch-{batch_id}"
+    
+    if not resolve_ref(base, str(root)):
+        print(f"⚠️  {base} not found, using HEAD")
+        base = "HEAD"
+    
+    jobs = jobs or len(issue_numbers)
+    env = dict(os.environ)
+    if max_provider_calls:
+        env["ADW_MAX_PROVIDER_CALLS"] = str(max_provider_calls)
+    if max_check_jobs:
+        env["ADW_MAX_CHECK_JOBS"] = str(max_check_jobs)
+    
+    sdlc_args = sdlc_flags(skip_test, skip_review)
+    
+    print("=" * 60)
+    print(f"ADW Batch {batch_id}: {len(issue_numbers)} issues, {jobs} pipelines at a time")
+    print("=" * 60)
+    
+    # Worktrees are created up front: git serializes them on its index lock anyway
+    pool = WorkspacePool(root) if warm else None
+    pipelines = []
+    for issue_number in issue_numbers:
+        adw_id = generate_adw_id()
+        worktree = prepare_worktree(root, adw_id, base, pool)
+        if not worktree:
+            print(f"❌ #{issue_number}: could not create worktree")
+            continue
+        pipelines.append((issue_number, adw_id, worktree))
+        print(f"🌳 #{issue_number}: {adw_id} → {worktree}")
+    
+    results = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(
+                run_pipeline, issue_number, adw_id, worktree,
+                batch_dir / f"{issue_number}-{adw_id}.log", env, sdlc_args,
+            ): (issue_number, adw_id, worktree)
+            for issue_number, adw_id, worktree in pipelines
+        }
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as exc:
+                # A pipeline that raises is recorded as failed; the rest of the batch goes on
+                issue_number, adw_id, worktree = futures[future]
+                print(f"❌ #{issue_number} ({adw_id}): {type(exc).__name__}: {exc}")
+                results.append({
+                    "issue_number": issue_number,
+                    "adw_id": adw_id,
+                    "worktree": str(worktree),
+                    "log_file": str(batch_dir / f"{issue_number}-{adw_id}.log"),
+                    "returncode": None,
+                    "duration_seconds": None,
+                    "error": f"{type(exc).__name__}: {exc}",
+                })
+                continue
+            results.append(row)
+            icon = "✅" if row["returncode"] == 0 else "❌"
+            print(f"{icon} #{row['issue_number']} ({row['adw_id']}) in {row['duration_seconds']:.0f}s")
+    
+    for row in results:
+        finish_pipeline(row, root, base, pool, cleanup)
+    
+    results.sort(key=lambda row: issue_numbers.index(row["issue_number"]))
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    with open(batch_dir / "summary.json", "w") as f:
+        json.dump(results, f, indent=2)
+    
+    passed = sum(1 for row in results if row["returncode"] == 0)
+    print(f"\n📊 Batch: {passed}/{len(issue_numbers)} pipelines succeeded")
+    print(f"💾 Summary: {(batch_dir / 'summary.json').relative_to(root)}")
+    return 0 if passed == len(issue_numbers) else 1
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Batch - Concurrent SDLC pipelines")
+    parser.add_argument("issue_numbers", type=int, nargs="+", help="GitHub issue numbers")
+    parser.add_argument("--jobs", type=int, help="Pipelines to run at once (default: all)")
+    parser.add_argument("--max-provider-calls", type=int, help="Concurrent AI provider calls")
+    parser.add_argument("--max-check-jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Concurrent pnpm checks (default: half the CPUs)")
+    parser.add_argument("--base", default="origin/main", help="Ref each worktree starts from")
+    parser.add_argument("--skip-test", action="store_true", help="Skip test phase")
+    parser.add_argument("--skip-review", action="store_true", help="Skip review phase")
+    parser.add_argument("--cleanup", action="store_true", help="Remove worktrees of successful runs")
+    parser.add_argument("--warm", action="store_true", help="Use pre-initialized pool workspaces")
+    args = parser.parse_args(argv)
+    
+    return run(args.issue_numbers, args.jobs, args.max_provider_calls, args.max_check_jobs,
+               args.base, args.skip_test, args.skip_review, args.cleanup, args.warm)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
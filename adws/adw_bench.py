@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+ADW Bench - End-to-end SDLC throughput on one host.
+
+Usage:
+    python adws/adw_bench.py [--issues N] [--concurrency 1,2,4]
+        [--scenario JSON|PATH] [--latency SPEC] [--check-command CMD]
+        [--baseline PATH] [--json] [--keep]
+
+Builds a throwaway app repository with a local bare `origin`, serves N
+synthetic issues per concurrency level from a GitHub stand-in
+(adw_modules/github_stub.py), and drives each through plan → build → test
+→ review → pr with the fake provider (AI_PROVIDER=fake) and every check
+running --check-command. Pipelines run as `adw.py sdlc` in their own
+worktrees, exactly as `adw batch` runs them.
+
+For each level it reports throughput (runs per hour of wall time), p50/p95
+run and phase latency, and the peak RSS, open fds and process count of the
+whole process tree. With --baseline (an earlier --json output), the
+command exits 1 when throughput at any level dropped by more than 20%; it
+also exits 1 when a pipeline fails.
+"""
+
+import sys
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from adw_batch import prepare_worktree, run_pipeline, sdlc_flags
+from adw_modules.github_stub import GitHubStub
+from adw_modules.state import STATE_DB_NAME, StateStore
+from adw_modules.utils import generate_adw_id, percentile
+from adw_modules.worktrees import remove_worktree
+
+
+PHASES = ("plan", "build", "test", "review", "pr")
+DEFAULT_ISSUES = 8
+DEFAULT_CONCURRENCY = (1, 2, 4)
+DEFAULT_CHECK_COMMAND = "true"
+# Three provider calls per run: spec, /implement and /review
+DEFAULT_SCENARIO: Dict[str, Any] = {
+    "format": "claude",
+    "size": 16384,
+    "latency": "lognormal:0.5,0.4",
+    "seed": 1,
+    "commands": {
+        "/implement": {
+            "latency": "lognormal:1.5,0.4",
+            "edits": [{"path": "lib/services/supply.ts",
+                       "append": "\nexport const benchEdited = true;\n"}],
+        },
+    },
+}
+# Throughput may drop this much below the baseline before it is a regression
+THROUGHPUT_TOLERANCE = 0.2
+SAMPLE_INTERVAL = 0.1
+# Columns of format_level
+HEADER = f"{'conc':>4} {'ok':>7} {'runs/h':>8} {'p50 s':>7} {'p95 s':>7} {'RSS MB':>8} {'fds':>5} {'procs':>5}"
+
+# A tiny app in the layout the slash commands expect
+FIXTURE_FILES = {
+    ".gitignore": "agents/\nnode_modules/\n",
+    "package.json": '{\n  "name": "bench-app",\n  "private": true\n}\n',
+    "tsconfig.json": '{\n  "compilerOptions": {"strict": true}\n}\n',
+    "app/page.tsx": "export default function Page() {\n  return <main>Supplies</main>;\n}\n",
+    "app/api/supplies/route.ts": (
+        'import { listSupplies } from "@/lib/services/supply";\n\n'
+        "export async function GET() {\n  return Response.json(await listSupplies());\n}\n"
+    ),
+    "lib/services/supply.ts": "export async function listSupplies() {\n  return [];\n}\n",
+    "prisma/schema.prisma": "model Supply {\n  id   Int    @id @default(autoincrement())\n  name String\n}\n",
+    "tests/supply.test.ts": (
+        'import { listSupplies } from "@/lib/services/supply";\n\n'
+        'test("lists supplies", async () => {\n  expect(await listSupplies()).toEqual([]);\n});\n'
+    ),
+}
+ISSUE_TITLES = (
+    "Add supply search", "Show low stock warning", "Export supplies as CSV",
+    "Add supplier contact page", "Paginate the supply list", "Track supply price history",
+)
+
+
+def _git(args: List[str], cwd: Path) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=adw-bench", "-c", "user.email=bench@localhost"] + args,
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+def make_fixture(root: Path) -> Path:
+    """Commit the fixture app to `root/repo` and push it to a bare `root/origin.git`."""
+    origin, repo = root / "origin.git", root / "repo"
+    origin.mkdir(parents=True)
+    _git(["init", "--bare", "-b", "main"], origin)
+    repo.mkdir()
+    _git(["init", "-b", "main"], repo)
+    for name, content in FIXTURE_FILES.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    _git(["add", "."], repo)
+    _git(["commit", "-m", "Initial commit"], repo)
+    _git(["remote", "add", "origin", str(origin)], repo)
+    _git(["push", "-u", "origin", "main"], repo)
+    return repo
+
+
+def add_issues(stub: GitHubStub, first: int, count: int) -> List[int]:
+    """Serve `count` synthetic feature issues numbered from `first`."""
+    numbers = list(range(first, first + count))
+    for number in numbers:
+        title = ISSUE_TITLES[number % len(ISSUE_TITLES)]
+        stub.add_issue(number, f"{title} ({number})",
+                       f"As a clinic manager I want to {title.lower()} so that ordering is easier.",
+                       labels=("feature",))
+    return numbers
+
+
+def bench_env(root: Path, stub: GitHubStub, scenario: Dict[str, Any], check_command: str) -> dict:
+    """Environment for every pipeline: stand-in GitHub, fake provider, private caches."""
+    env = dict(os.environ)
+    env.update({
+        "GITHUB_API_URL": stub.url,
+        "GITHUB_REPO_URL": stub.repo_url,
+        "GITHUB_TOKEN": "bench",
+        "AI_PROVIDER": "fake",
+        "ADW_FAKE_SCENARIO": json.dumps(scenario),
+        "ADW_CHECK_COMMAND": check_command,
+        # Every run executes its checks rather than reusing the first run's pass
+        "ADW_CHECK_CACHE": "0",
+        "ADW_CACHE_DIR": str(root / "cache"),
+        "ADW_STATE_DB": str(root / "repo" / "agents" / STATE_DB_NAME),
+    })
+    env.pop("GITHUB_PAT", None)
+    return env
+
+
+def process_tree(pid: int) -> List[int]:
+    """`pid` and all its descendants, from /proc."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name is parenthesized and may contain spaces
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(children.get(current, []))
+    return tree
+
+
+class ResourceSampler:
+    """Polls the RSS and open fds of this process and its descendants in a thread.
+
+    Without /proc only this process's peak RSS is known, from getrusage.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.available = os.path.isdir("/proc/self/fd")
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if self.available else 0
+        self.peak_rss = 0
+        self.peak_fds = 0
+        self.peak_processes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        if not self.available:
+            import resource
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak_rss = max(self.peak_rss, rss if sys.platform == "darwin" else rss * 1024)
+            return
+        rss = fds = processes = 0
+        for pid in process_tree(os.getpid()):
+            try:
+                with open(f"/proc/{pid}/statm") as f:
+                    rss += int(f.read().split()[1]) * self.page_size
+                fds += len(os.listdir(f"/proc/{pid}/fd"))
+            except (OSError, IndexError, ValueError):
+                continue  # exited between listing and reading
+            processes += 1
+        self.peak_rss = max(self.peak_rss, rss)
+        self.peak_fds = max(self.peak_fds, fds)
+        self.peak_processes = max(self.peak_processes, processes)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self) -> "ResourceSampler":
+        self.sample()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def _latency(values: List[float]) -> Dict[str, Optional[float]]:
+    return {"p50": percentile(values, 50), "p95": percentile(values, 95)}
+
+
+def run_level(repo: Path, issue_numbers: List[int], concurrency: int, env: dict, log_dir: Path) -> Dict[str, Any]:
+    """Run one pipeline per issue, `concurrency` at a time, and summarize."""
+    setup_start = time.monotonic()
+    pipelines = []
+    for issue_number in issue_numbers:
+        adw_id = generate_adw_id()
+        worktree = prepare_worktree(repo, adw_id, "origin/main")
+        if worktree:
+            pipelines.append((issue_number, adw_id, worktree))
+    setup_seconds = time.monotonic() - setup_start
+
+    with ResourceSampler() as sampler:
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            rows = list(executor.map(
+                lambda pipeline: run_pipeline(
+                    *pipeline, log_dir / f"{pipeline[0]}-{pipeline[1]}.log", env, sdlc_flags()),
+                pipelines,
+            ))
+        wall_seconds = time.monotonic() - start
+
+    store = StateStore(Path(env["ADW_STATE_DB"]))
+    phases: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+    for row in rows:
+        state = store.load(row["adw_id"])
+        for phase, checkpoint in (state.checkpoints if state else {}).items():
+            phases.setdefault(phase, []).append(checkpoint.duration_seconds)
+        if remove_worktree(Path(row["worktree"]), str(repo)):
+            row["worktree"] = None
+
+    succeeded = sum(1 for row in rows if row["returncode"] == 0)
+    return {
+        "concurrency": concurrency,
+        "runs": len(issue_numbers),
+        "succeeded": succeeded,
+        "setup_seconds": round(setup_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "runs_per_hour": round(succeeded * 3600 / wall_seconds, 1) if wall_seconds else 0.0,
+        "run_seconds": _latency([row["duration_seconds"] for row in rows]),
+        "phase_seconds": {phase: _latency(values) for phase, values in phases.items()},
+        "peak_rss_mb": round(sampler.peak_rss / (1024 * 1024), 1),
+        "peak_fds": sampler.peak_fds if sampler.available else None,
+        "peak_processes": sampler.peak_processes if sampler.available else None,
+        "failed": [row["log_file"] for row in rows if row["returncode"] != 0],
+    }
+
+
+def run_bench(
+    issues: int = DEFAULT_ISSUES,
+    concurrency=DEFAULT_CONCURRENCY,
+    scenario: Optional[Dict[str, Any]] = None,
+    check_command: str = DEFAULT_CHECK_COMMAND,
+    workdir: Optional[Path] = None,
+    on_level=None,
+) -> Dict[str, Any]:
+    """Benchmark each concurrency level on fresh issues in a fixture repo under `workdir`."""
+    root = Path(workdir or tempfile.mkdtemp(prefix="adw-bench-"))
+    repo = make_fixture(root)
+    scenario = scenario or DEFAULT_SCENARIO
+    levels = []
+    with GitHubStub() as stub:
+        env = bench_env(root, stub, scenario, check_command)
+        for index, level in enumerate(concurrency):
+            # Fresh issue numbers per level, so branches never collide
+            numbers = add_issues(stub, index * issues + 1, issues)
+            result = run_level(repo, numbers, level, env, root / "logs" / f"c{level}")
+            levels.append(result)
+            if on_level:
+                on_level(result)
+        pulls = len(stub.pulls)
+    return {
+        "issues": issues,
+        "scenario": scenario,
+        "check_command": check_command,
+        "cpus": os.cpu_count(),
+        "python": ".".join(map(str, sys.version_info[:3])),
+        "pull_requests": pulls,
+        "workdir": str(root),
+        "levels": levels,
+    }
+
+
+def compare(levels: List[Dict[str, Any]], baseline: Dict[str, Any],
+            tolerance: float = THROUGHPUT_TOLERANCE) -> List[str]:
+    """Levels whose throughput fell more than `tolerance` below the baseline."""
+    base = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    regressions = []
+    for level in levels:
+        previous = base.get(level["concurrency"])
+        if previous and level["runs_per_hour"] < previous["runs_per_hour"] * (1 - tolerance):
+            regressions.append(f"concurrency {level['concurrency']}: {level['runs_per_hour']:.0f} runs/h "
+                               f"(baseline {previous['runs_per_hour']:.0f})")
+    return regressions
+
+
+def _seconds(value: Optional[float]) -> str:
+    return f"{value:.2f}" if value is not None else "-"
+
+
+def format_level(level: Dict[str, Any]) -> str:
+    phases = "  ".join(
+        f"{phase} {_seconds(latency['p50'])}/{_seconds(latency['p95'])}"
+        for phase, latency in level["phase_seconds"].items()
+    )
+    fds = level["peak_fds"] if level["peak_fds"] is not None else "-"
+    procs = level["peak_processes"] if level["peak_processes"] is not None else "-"
+    return (
+        f"{level['concurrency']:>4} {level['succeeded']:>3}/{level['runs']:<3} {level['runs_per_hour']:>8.0f} "
+        f"{_seconds(level['run_seconds']['p50']):>7} {_seconds(level['run_seconds']['p95']):>7} "
+        f"{level['peak_rss_mb']:>8.0f} {fds:>5} {procs:>5}\n"
+        f"     phases p50/p95 s: {phases}"
+    )
+
+
+def load_scenario(value: Optional[str]) -> Dict[str, Any]:
+    """--scenario as inline JSON or a file path; the default scenario when empty."""
+    if not value:
+        return json.loads(json.dumps(DEFAULT_SCENARIO))
+    return json.loads(value if value.strip().startswith("{") else Path(value).read_text())
+
+
+def run(
+    issues: int = DEFAULT_ISSUES,
+    concurrency=DEFAULT_CONCURRENCY,
+    scenario: Optional[str] = None,
+    latency: Optional[str] = None,
+    check_command: str = DEFAULT_CHECK_COMMAND,
+    baseline_path: Optional[Path] = None,
+    as_json: bool = False,
+    keep: bool = False,
+) -> int:
+    """Run the benchmark; returns 1 on a failed pipeline or a throughput regression."""
+    config = load_scenario(scenario)
+    if latency:
+        config["latency"] = latency
+        for overrides in (config.get("commands") or {}).values():
+            overrides.pop("latency", None)
+
+    if not as_json:
+        print("=" * 60)
+        print(f"ADW Bench: {issues} issues per level, concurrency {', '.join(map(str, concurrency))}")
+        print("=" * 60)
+        print(HEADER)
+    report = None if as_json else (lambda level: print(format_level(level), flush=True))
+
+    workdir = Path(tempfile.mkdtemp(prefix="adw-bench-"))
+    try:
+        results = run_bench(issues, concurrency, config, check_command, workdir, on_level=report)
+    finally:
+        if not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = json.loads(baseline_path.read_text()) if baseline_path and baseline_path.exists() else {}
+    regressions = compare(results["levels"], baseline)
+    failed = [log for level in results["levels"] for log in level["failed"]]
+
+    if as_json:
+        print(json.dumps({**results, "regressions": regressions}, indent=2))
+    else:
+        print(f"\n🔀 {results['pull_requests']} pull requests opened on {results['cpus']} CPUs")
+        if keep:
+            print(f"📁 Kept: {workdir}")
+    # Keep stdout parseable in --json mode; the JSON already lists both
+    out = sys.stderr if as_json else sys.stdout
+    if failed:
+        print(f"\n❌ {len(failed)} pipelines failed" + (":" if keep else " (rerun with --keep for logs)"), file=out)
+        for log in failed if keep else []:
+            print(f"   {log}", file=out)
+    if regressions:
+        print("\n❌ Throughput regressions against baseline:", file=out)
+        for regression in regressions:
+            print(f"   {regression}", file=out)
+    if failed or regressions:
+        return 1
+    if not as_json and baseline_path:
+        print("\n✅ No regressions" if baseline else f"\n⚠️  No baseline at {baseline_path}")
+    return 0
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Bench - End-to-end SDLC throughput")
+    parser.add_argument("--issues", type=int, default=DEFAULT_ISSUES, help="Issues per concurrency level")
+    parser.add_argument("--concurrency", default=",".join(map(str, DEFAULT_CONCURRENCY)),
+                        help="Comma-separated pipelines-at-once levels")
+    parser.add_argument("--scenario", help="Fake provider scenario, inline JSON or a file")
+    parser.add_argument("--latency", help="Latency of every command, e.g. uniform:0.5,2")
+    parser.add_argument("--check-command", default=DEFAULT_CHECK_COMMAND,
+                        help="Command every test-phase check runs")
+    parser.add_argument("--baseline", type=Path, help="Earlier --json output to compare throughput with")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--keep", action="store_true", help="Keep the fixture repo, state and logs")
+    args = parser.parse_args(argv)
+
+    try:
+        levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    except ValueError:
+        parser.error(f"invalid --concurrency: {args.concurrency}")
+    if not levels or min(levels) < 1 or args.issues < 1:
+        parser.error("--issues and every --concurrency level must be at least 1")
+    return run(args.issues, levels, args.scenario, args.latency, args.check_command,
+               args.baseline, args.json, args.keep)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
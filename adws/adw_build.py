@@ -9,59 +9,66 @@ Usage:
 import sys
 import argparse
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from adw_modules.state import load_state, save_state
+from adw_modules.state import load_state, save_state, record_phase
 from adw_modules.agent import run_slash_command
+from adw_modules.tracing import traced_run
 
 
-def main():
-    print("[DEBUG] adw_build.py started")
-    parser = argparse.ArgumentParser(description="ADW Build - Implement from plan")
-    parser.add_argument("issue_number", type=int, help="GitHub issue number")
-    parser.add_argument("adw_id", help="ADW ID")
-    args = parser.parse_args()
-    
-    print(f"[DEBUG] Arguments: issue_number={args.issue_number}, adw_id={args.adw_id}")
-    print(f"🔹 ADW ID: {args.adw_id}")
+def run(issue_number: int, adw_id: str) -> int:
+    """Run the build phase for an existing plan."""
+    print(f"🔹 ADW ID: {adw_id}")
     
     # Load state
-    state = load_state(args.adw_id)
+    state = load_state(adw_id)
     if not state:
-        print(f"❌ No state found for {args.adw_id}")
+        print(f"❌ No state found for {adw_id}")
         return 1
+    record_phase(state, "build", "running")
     
     print(f"📄 Plan: {state.plan_file}")
     print(f"🌿 Branch: {state.branch_name}")
     
     # Check we're on the right branch
-    import subprocess
-    result = subprocess.run(["git", "branch", "--show-current"], capture_output=True, text=True)
+    result = traced_run(["git", "branch", "--show-current"], capture_output=True, text=True)
     current_branch = result.stdout.strip()
     
     if current_branch != state.branch_name:
         print(f"⚠️  Switching to branch: {state.branch_name}")
-        subprocess.run(["git", "checkout", "-b", state.branch_name], capture_output=True)
+        traced_run(["git", "checkout", "-b", state.branch_name], capture_output=True)
     
     # Run implement command
     print("🤖 Running implementor...")
     success, output = run_slash_command(
         "/implement",
-        [state.plan_file, args.adw_id],
-        output_file=f"agents/{args.adw_id}/implementor/raw_output.txt"
+        [state.plan_file, adw_id],
+        output_file=f"agents/{adw_id}/implementor/raw_output.txt",
+        adw_id=adw_id
     )
     
     if success:
         print("✅ Implementation complete")
         print("\n📋 Next Steps:")
         print(f"  1. Review changes: git diff")
-        print(f"  2. Test: python adws/adw_test.py {args.issue_number} {args.adw_id}")
+        print(f"  2. Test: python adws/adw_test.py {issue_number} {adw_id}")
     else:
         print("❌ Implementation had issues")
     
+    record_phase(state, "build", "done" if success else "failed")
     return 0 if success else 1
 
 
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Build - Implement from plan")
+    parser.add_argument("issue_number", type=int, help="GitHub issue number")
+    parser.add_argument("adw_id", help="ADW ID")
+    args = parser.parse_args(argv)
+    
+    return run(args.issue_number, args.adw_id)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+ADW Classify - Classify a backlog of issues in one provider call.
+
+Usage:
+    python adws/adw_classify.py <issue-number>... [--output labels.json]
+    python adws/adw_classify.py --file issues.json [--format tsv]
+
+`--file` takes a JSON list (or JSON lines) of issues with number, title,
+body and labels, e.g. the output of
+`gh issue list --json number,title,body,labels`.
+"""
+
+import sys
+import argparse
+import json
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from adw_modules.classify import classify_issues, issue_from_dict
+from adw_modules.github import fetch_issues
+
+
+COLUMNS = ("issue_number", "issue_class", "branch_name", "source", "title")
+
+
+def load_issues_file(path: str) -> list:
+    """Load issues from a JSON array or JSON lines file."""
+    text = Path(path).read_text()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        records = json.loads(stripped)
+    else:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [issue_from_dict(record) for record in records]
+
+
+def format_table(rows: list) -> str:
+    """Render rows as an aligned text table."""
+    widths = {col: max([len(col)] + [len(str(row[col])) for row in rows]) for col in COLUMNS}
+    lines = ["  ".join(col.ljust(widths[col]) for col in COLUMNS).rstrip()]
+    lines.append("  ".join("-" * widths[col] for col in COLUMNS))
+    for row in rows:
+        lines.append("  ".join(str(row[col]).ljust(widths[col]) for col in COLUMNS).rstrip())
+    return "\n".join(lines)
+
+
+def format_tsv(rows: list) -> str:
+    """Render rows as tab-separated values with a header."""
+    lines = ["\t".join(COLUMNS)]
+    for row in rows:
+        lines.append("\t".join(str(row[col]).replace("\t", " ") for col in COLUMNS))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Classify - Batch issue classification")
+    parser.add_argument("issue_numbers", type=int, nargs="*", help="GitHub issue numbers to fetch")
+    parser.add_argument("--file", help="JSON/JSONL file of issues instead of fetching")
+    parser.add_argument("--local", action="store_true", help="Use the keyword classifier only")
+    parser.add_argument("--format", choices=["table", "tsv", "json"], default="table")
+    parser.add_argument("--output", help="Also write rows as JSON to this file")
+    args = parser.parse_args(argv)
+    
+    if args.file:
+        issues = load_issues_file(args.file)
+    else:
+        fetched = fetch_issues(args.issue_numbers, comments=0)
+        issues = []
+        for number in args.issue_numbers:
+            if number in fetched:
+                issues.append(fetched[number])
+            else:
+                print(f"⚠️  Skipping #{number}: could not fetch", file=sys.stderr)
+    
+    if not issues:
+        print("❌ No issues to classify", file=sys.stderr)
+        return 1
+    
+    print(f"🏷️  Classifying {len(issues)} issues...", file=sys.stderr)
+    rows = classify_issues(issues, use_provider=not args.local)
+    
+    if args.format == "json":
+        print(json.dumps(rows, indent=2))
+    elif args.format == "tsv":
+        print(format_tsv(rows))
+    else:
+        print(format_table(rows))
+    
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(rows, indent=2))
+        print(f"💾 Saved: {args.output}", file=sys.stderr)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+ADW Context - Build and show the repository context index.
+
+Usage:
+    python adws/adw_context.py [--json] [--rebuild] [--max-bytes N]
+
+Prints the digest that planning and /implement prompts inline (see
+adw_modules/context.py). Running it after a checkout or merge warms the
+cache, so the next pipeline finds the index ready.
+"""
+
+import sys
+import argparse
+import json
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from adw_modules.context import (
+    build_index,
+    format_digest,
+    get_context_cache,
+    get_digest_max_bytes,
+    load_index,
+)
+
+
+def run(as_json: bool = False, rebuild: bool = False, max_bytes: Optional[int] = None) -> int:
+    """Print the index of the current checkout; returns 1 outside git."""
+    start = time.monotonic()
+    counts: dict = {}
+    if rebuild:
+        index = build_index(".", get_context_cache(), counts=counts)
+        if index:
+            get_context_cache().put(index.key, asdict(index))
+    else:
+        index = load_index(".")
+    if not index:
+        print("❌ Not a git checkout")
+        return 1
+
+    if as_json:
+        print(json.dumps(asdict(index), indent=2))
+        return 0
+    print(format_digest(index, max_bytes or get_digest_max_bytes()))
+    reused = f", {counts['parsed']} files parsed, {counts['reused']} reused" if counts else ""
+    print(f"\n🗂️  {len(index.files)} files indexed in {time.monotonic() - start:.2f}s{reused}")
+    return 0
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Context - Repository context index")
+    parser.add_argument("--json", action="store_true", help="Print the full index as JSON")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Rebuild the index instead of reading it from the cache")
+    parser.add_argument("--max-bytes", type=int, help="Digest size cap (default: ADW_CONTEXT_MAX_BYTES or 6000)")
+    args = parser.parse_args(argv)
+
+    return run(args.json, args.rebuild, args.max_bytes)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+ADW Fake CLI - Local stand-in for the provider CLIs (`AI_PROVIDER=fake`).
+
+Usage:
+    python adws/adw_fake_cli.py [--output-format stream-json|text|kimi] <command>
+
+Reads the prompt from stdin and prints output shaped like the real CLI,
+spread over a sampled latency, after applying the scenario's file edits in
+the working directory. Faults: `hang` prints the first lines and never
+exits, `partial` stops mid-line and exits 0, `exit` prints everything and
+exits with `exit_code`, `garbage` prints unparseable output. See
+adw_modules/fake.py for the ADW_FAKE_SCENARIO format.
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from adw_modules import fake
+
+
+# Output is printed in this many bursts spread over the latency
+BURSTS = 10
+# Share of the latency before the first output
+FIRST_OUTPUT_SHARE = 0.2
+
+
+def emit(lines: List[str], latency: float, on_last_burst=None) -> None:
+    """Print `lines` in bursts so the last one lands after `latency` seconds."""
+    time.sleep(latency * FIRST_OUTPUT_SHARE)
+    per_burst = max(1, -(-len(lines) // BURSTS))
+    bursts = [lines[i:i + per_burst] for i in range(0, len(lines), per_burst)] or [[]]
+    pause = latency * (1 - FIRST_OUTPUT_SHARE) / max(1, len(bursts) - 1)
+    for i, burst in enumerate(bursts):
+        if i:
+            time.sleep(pause)
+        if i == len(bursts) - 1 and on_last_burst:
+            on_last_burst()
+        if burst:
+            sys.stdout.write("\n".join(burst) + "\n")
+            sys.stdout.flush()
+
+
+def run(command: str, prompt: str, output_format: Optional[str] = None) -> int:
+    """Play the scenario for one command; returns the exit code."""
+    scenario = fake.load_scenario(command)
+    if output_format:
+        scenario["format"] = next(f for f, flag in fake.FORMATS.items() if flag == output_format)
+    rng = fake.make_rng(scenario, command, prompt)
+    latency = fake.sample_latency(scenario["latency"], rng)
+    fault = fake.choose_fault(scenario["faults"], rng)
+
+    if fault == "garbage":
+        lines = fake.garbage(scenario["size"], rng).split("\n")
+    else:
+        lines = fake.render(command, prompt, scenario, rng).rstrip("\n").split("\n")
+    edit = lambda: fake.apply_edits(scenario["edits"], Path.cwd())
+
+    if fault == "hang":
+        emit(lines[:max(1, len(lines) // 10)], latency)
+        while True:
+            time.sleep(3600)
+    if fault == "partial":
+        cut = lines[:max(1, len(lines) // 2)]
+        emit(cut[:-1], latency)
+        sys.stdout.write(cut[-1][:max(1, len(cut[-1]) // 2)])
+        sys.stdout.flush()
+        return 0
+
+    emit(lines, latency, on_last_burst=edit)
+    return int(scenario["exit_code"]) if fault == "exit" else 0
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Fake CLI - Provider stand-in")
+    parser.add_argument("command", help="Slash command or prompt header")
+    parser.add_argument("--output-format", choices=list(fake.FORMATS.values()),
+                        help="Override the scenario's format")
+    args = parser.parse_args(argv)
+
+    prompt = "" if sys.stdin.isatty() else sys.stdin.read()
+    return run(args.command, prompt, args.output_format)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ Usage:
 import sys
 import argparse
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -16,11 +17,11 @@ from adw_modules.agent import run_slash_command
 from adw_modules.state import load_state, save_state
 
 
-def main():
+def main(argv: Optional[list] = None):
     parser = argparse.ArgumentParser(description="ADW Fix - Auto-fix errors")
     parser.add_argument("error_file", help="File containing error output")
     parser.add_argument("--adw-id", help="ADW ID for context")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     print("🔧 ADW Auto-Fix")
     print("=" * 60)
@@ -75,7 +76,8 @@ Start fixing now."""
     success, output = run_slash_command(
         "/fix",
         [fix_prompt],
-        output_file=f"agents/{args.adw_id}/fixer/raw_output.txt" if args.adw_id else None
+        output_file=f"agents/{args.adw_id}/fixer/raw_output.txt" if args.adw_id else None,
+        adw_id=args.adw_id
     )
     
     if success:
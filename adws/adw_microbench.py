@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+ADW Microbench - Time the parsing and utility hot paths on synthetic output.
+
+Usage:
+    python adws/adw_microbench.py [-k PATTERN] [--sizes small,medium,large]
+        [--baseline PATH] [--update-baseline] [--json]
+
+Each case runs on generated Claude/Kimi transcripts (see
+adw_modules/transcripts.py) at several sizes, including adversarial Kimi
+output. Time per call is the best of several repeats, divided by a fixed
+calibration workload so numbers are comparable across machines; memory is
+the tracemalloc peak of one call. Results are compared with the stored
+baseline and the command exits 1 when a case is slower or uses more memory
+than the baseline allows. --update-baseline records the current numbers.
+"""
+
+import sys
+import argparse
+import gc
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from adw_modules import transcripts
+
+
+SIZES = {"small": 16 * 1024, "medium": 256 * 1024, "large": 4 * 1024 * 1024}
+DEFAULT_SIZES = ("small", "medium")
+BASELINE_PATH = Path(__file__).parent / "adw_tests" / "microbench_baseline.json"
+
+# Allowed growth over the baseline before a case counts as a regression
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.25
+MEMORY_SLACK_BYTES = 64 * 1024
+# Each timing sample runs the case for at least this long
+MIN_SAMPLE_SECONDS = 0.05
+REPEAT = 5
+
+
+@dataclass
+class BenchCase:
+    """`func(make(size))` is timed; `make` runs outside the measurement."""
+    name: str
+    make: Callable[[int], Any]
+    func: Callable[[Any], Any]
+
+
+def _feed_lines(feed: Callable[[str], Any], lines: List[str]) -> None:
+    for line in lines:
+        feed(line)
+
+
+def _spec_stream(lines: List[str]) -> str:
+    from adw_modules.spec import SpecExtractor
+    extractor = SpecExtractor()
+    _feed_lines(extractor.feed_line, lines)
+    return extractor.finish()
+
+
+def _claude_stream(lines: List[str]) -> tuple:
+    from adw_modules.claude import ClaudeStream
+    stream = ClaudeStream(echo_prefix=None)
+    _feed_lines(stream.feed_line, lines)
+    return stream.text, stream.usage()
+
+
+def _kimi_output(output: str) -> str:
+    from adw_modules.providers import KimiProvider
+    return KimiProvider()._parse_kimi_output(output)
+
+
+def _parse_spec(output: str) -> str:
+    from adw_plan import parse_spec_from_output
+    return parse_spec_from_output(output)
+
+
+def _issue(size: int) -> tuple:
+    body = transcripts.claude_text(size)
+    return body.split("\n", 1)[0], body, [{"name": "enhancement"}, {"name": "area/api"}]
+
+
+def _classify(issue: tuple) -> str:
+    from adw_modules.utils import classify_issue
+    return classify_issue(*issue)
+
+
+def _slugify(text: str) -> str:
+    from adw_modules.utils import slugify
+    return slugify(text)
+
+
+def _run_state(size: int):
+    from datetime import datetime
+    from adw_modules.data_types import ADWStateData, PhaseCheckpoint
+    outputs = [f"src/app/api/route_{i:05d}/route.ts" for i in range(max(1, size // 40))]
+    checkpoint = PhaseCheckpoint(status="done", input_hash="0" * 64, outputs=outputs,
+                                 started_at=datetime(2025, 1, 1), duration_seconds=1.0)
+    return ADWStateData(adw_id="bench001", issue_number="1", branch_name="feat-1-bench",
+                        phase="build", status="done", checkpoints={"plan": checkpoint})
+
+
+def _save_load(state) -> Any:
+    from adw_modules.state import save_state, load_state
+    save_state(state)
+    return load_state(state.adw_id)
+
+
+CASES = [
+    BenchCase("parse_spec.claude", transcripts.claude_text, _parse_spec),
+    BenchCase("parse_spec.kimi", transcripts.kimi_transcript, _parse_spec),
+    BenchCase("spec_stream.kimi", lambda size: transcripts.kimi_transcript(size).split("\n"), _spec_stream),
+    BenchCase("claude_stream.json", lambda size: transcripts.claude_stream_json(size).split("\n"), _claude_stream),
+    BenchCase("kimi_output.transcript", transcripts.kimi_transcript, _kimi_output),
+    BenchCase("kimi_output.unterminated", transcripts.kimi_unterminated, _kimi_output),
+    BenchCase("kimi_output.unbalanced", transcripts.kimi_unbalanced, _kimi_output),
+    BenchCase("kimi_output.escapes", transcripts.kimi_escapes, _kimi_output),
+    BenchCase("kimi_output.nested", transcripts.kimi_nested, _kimi_output),
+    BenchCase("kimi_output.strings", transcripts.kimi_strings, _kimi_output),
+    BenchCase("slugify", transcripts.claude_text, _slugify),
+    BenchCase("classify_issue", _issue, _classify),
+    BenchCase("state.save_load", _run_state, _save_load),
+]
+
+
+def _calibration_workload() -> None:
+    data = [{"id": i, "name": f"item-{i}", "tags": ["a", "b"]} for i in range(300)]
+    text = json.dumps(data)
+    json.loads(text)
+    "".join(sorted(text.split(",")))
+
+
+def best_time(func: Callable[[], Any], min_time: float = MIN_SAMPLE_SECONDS,
+              repeat: int = REPEAT) -> float:
+    """Best seconds per call over `repeat` samples, with GC paused."""
+    start = time.perf_counter()
+    func()
+    single = time.perf_counter() - start
+    number = max(1, int(min_time / single)) if single > 0 else 1000
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return min(samples)
+
+
+def calibrate() -> float:
+    """Seconds for the fixed reference workload on this machine."""
+    return best_time(_calibration_workload, repeat=7)
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Peak bytes allocated by Python during one call."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@contextmanager
+def scratch_dir() -> Iterator[Path]:
+    """Run cases in a temporary directory with their own state store."""
+    cwd, saved_db = Path.cwd(), os.environ.get("ADW_STATE_DB")
+    with tempfile.TemporaryDirectory() as root:
+        os.chdir(root)
+        os.environ["ADW_STATE_DB"] = str(Path(root) / "state.db")
+        try:
+            yield Path(root)
+        finally:
+            os.chdir(cwd)
+            if saved_db is None:
+                os.environ.pop("ADW_STATE_DB", None)
+            else:
+                os.environ["ADW_STATE_DB"] = saved_db
+
+
+def measure(case: BenchCase, size_name: str, unit: float,
+            min_time: float = MIN_SAMPLE_SECONDS, repeat: int = REPEAT) -> Dict[str, Any]:
+    payload = case.make(SIZES[size_name])
+    call = lambda: case.func(payload)
+    seconds = best_time(call, min_time, repeat)
+    return {
+        "case": case.name,
+        "size": size_name,
+        "bytes": SIZES[size_name],
+        "seconds": seconds,
+        "score": round(seconds / unit, 3),
+        "mb_per_s": round(SIZES[size_name] / seconds / 1e6, 1) if seconds else None,
+        "peak_bytes": peak_memory(call),
+    }
+
+
+def select_cases(pattern: Optional[str] = None) -> List[BenchCase]:
+    return [case for case in CASES if not pattern or pattern in case.name]
+
+
+def run_suite(sizes=DEFAULT_SIZES, pattern: Optional[str] = None,
+              min_time: float = MIN_SAMPLE_SECONDS, repeat: int = REPEAT,
+              cases: Optional[List[BenchCase]] = None) -> Dict[str, Any]:
+    """Measure every selected case (`cases`, or those matching `pattern`) at every size."""
+    with scratch_dir():
+        unit = calibrate()
+        results = [measure(case, size, unit, min_time, repeat)
+                   for case in (cases or select_cases(pattern)) for size in sizes]
+    return {"python": platform.python_version(), "unit_seconds": unit, "results": results}
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    return f"{result['case']}@{result['size']}"
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+            time_tolerance: float = TIME_TOLERANCE,
+            memory_tolerance: float = MEMORY_TOLERANCE) -> List[str]:
+    """Descriptions of results that regressed against `baseline`."""
+    regressions = []
+    cases = baseline.get("cases", {})
+    for result in results:
+        base = cases.get(result_key(result))
+        if not base:
+            continue
+        if result["score"] > base["score"] * (1 + time_tolerance):
+            regressions.append(f"{result_key(result)}: time {result['score']:.3f} "
+                               f"vs baseline {base['score']:.3f}")
+        memory_limit = base["peak_bytes"] * (1 + memory_tolerance) + MEMORY_SLACK_BYTES
+        if result["peak_bytes"] > memory_limit:
+            regressions.append(f"{result_key(result)}: peak memory {result['peak_bytes']:,} B "
+                               f"vs baseline {base['peak_bytes']:,} B")
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Any]:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def update_baseline(suite: Dict[str, Any], path: Path = BASELINE_PATH) -> None:
+    """Record the results, keeping baseline entries for cases not run."""
+    baseline = load_baseline(path)
+    cases = baseline.get("cases", {})
+    for result in suite["results"]:
+        cases[result_key(result)] = {"score": result["score"], "peak_bytes": result["peak_bytes"]}
+    baseline = {"python": suite["python"], "cases": dict(sorted(cases.items()))}
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def format_results(results: List[Dict[str, Any]], baseline: Dict[str, Any]) -> str:
+    cases = baseline.get("cases", {})
+    lines = [f"{'case':<28} {'size':<7} {'ms/call':>9} {'MB/s':>8} {'peak KB':>9} {'score':>8} {'vs base':>8}"]
+    for r in results:
+        base = cases.get(result_key(r))
+        change = f"{(r['score'] / base['score'] - 1) * 100:+.0f}%" if base and base["score"] else "-"
+        lines.append(f"{r['case']:<28} {r['size']:<7} {r['seconds'] * 1000:>9.3f} "
+                     f"{r['mb_per_s'] or 0:>8.1f} {r['peak_bytes'] / 1024:>9.0f} "
+                     f"{r['score']:>8.2f} {change:>8}")
+    return "\n".join(lines)
+
+
+def run(sizes=DEFAULT_SIZES, pattern: Optional[str] = None, baseline_path: Path = BASELINE_PATH,
+        update: bool = False, as_json: bool = False) -> int:
+    """Run the suite; returns 1 if a case regressed against the baseline."""
+    suite = run_suite(sizes, pattern)
+    baseline = load_baseline(baseline_path)
+    regressions = compare(suite["results"], baseline)
+    if regressions:
+        # Re-measure before failing, so one noisy sample is not a regression
+        retry = {regression.split("@")[0] for regression in regressions}
+        again = run_suite(sizes, repeat=REPEAT * 2, cases=[c for c in CASES if c.name in retry])
+        by_key = {result_key(r): r for r in again["results"]}
+        suite["results"] = [by_key.get(result_key(r), r) for r in suite["results"]]
+        regressions = compare(suite["results"], baseline)
+
+    if as_json:
+        print(json.dumps({**suite, "regressions": regressions}, indent=2))
+    else:
+        print(format_results(suite["results"], baseline))
+        print(f"\ncalibration unit: {suite['unit_seconds'] * 1e6:.0f} µs")
+        if baseline and baseline.get("python") != suite["python"]:
+            print(f"⚠️  Baseline recorded on Python {baseline.get('python')}, running {suite['python']}")
+
+    if update:
+        update_baseline(suite, baseline_path)
+        print(f"💾 Baseline updated: {baseline_path}")
+        return 0
+    if regressions:
+        print("\n❌ Regressions against baseline:")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+    if not as_json:
+        print("\n✅ No regressions" if baseline else "\n⚠️  No baseline; run with --update-baseline")
+    return 0
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Microbench - Parsing and utility hot paths")
+    parser.add_argument("-k", dest="pattern", help="Only run cases whose name contains PATTERN")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES),
+                        help=f"Comma-separated sizes from: {', '.join(SIZES)}")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Record these results as the baseline")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown size: {', '.join(unknown)}")
+    return run(sizes, args.pattern, args.baseline, args.update_baseline, args.json)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,64 @@
 """Claude Code agent integration - now supports multiple providers."""
 
-from typing import Optional, Tuple
+import os
+import subprocess
+from pathlib import Path
+from typing import Callable, Optional, Tuple
 from .providers import get_provider
+from .cache import DiskCache, hash_key
+from .commands import BATCH_CLASSIFY_COMMAND, SPEC_COMMAND
+from .limits import slot
+from .state import record_call
+from .tracing import span
+
+
+# Commands whose output depends only on their inputs, with cache TTLs in seconds
+CACHEABLE_COMMANDS = {
+    "/classify_issue": 7 * 24 * 3600,
+    BATCH_CLASSIFY_COMMAND: 7 * 24 * 3600,
+    SPEC_COMMAND: 24 * 3600,
+}
+
+PROMPT_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+
+def prompt_cache_enabled() -> bool:
+    """Prompt caching is opt-in through ADW_PROMPT_CACHE=1."""
+    return os.getenv("ADW_PROMPT_CACHE", "0") == "1"
+
+
+def get_prompt_cache() -> DiskCache:
+    """Cache of successful provider responses."""
+    max_mb = os.getenv("ADW_PROMPT_CACHE_MAX_MB")
+    max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else PROMPT_CACHE_MAX_BYTES
+    return DiskCache("prompts", max_bytes=max_bytes)
+
+
+def get_tree_hash(working_dir: Optional[str] = None) -> Optional[str]:
+    """Tree hash of HEAD, or None outside a git checkout."""
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD^{tree}"],
+        cwd=working_dir,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def prompt_cache_key(provider_name: str, command: str, args: list, tree_hash: str) -> str:
+    """Cache key for a provider response."""
+    return hash_key("prompt", provider_name, command, list(args), tree_hash)
 
 
 def run_slash_command(
     command: str,
     args: list,
     working_dir: Optional[str] = None,
-    output_file: Optional[str] = None
+    output_file: Optional[str] = None,
+    cache: Optional[bool] = None,
+    on_line: Optional[Callable[[str], bool]] = None,
+    adw_id: Optional[str] = None,
+    cache_inputs: Optional[list] = None,
 ) -> Tuple[bool, str]:
     """Run an AI command using the configured provider.
     
@@ -17,9 +67,56 @@ def run_slash_command(
         args: Arguments for the command
         working_dir: Working directory
         output_file: File to save output
+        cache: Reuse responses for cacheable commands (default: ADW_PROMPT_CACHE)
+        on_line: Called with each output line as it streams; returning True
+            stops the provider early (not called on a cache hit)
+        adw_id: Run to record the call's latency and token usage against
+        cache_inputs: What the response depends on, when `args` also carry
+            per-run values such as an ADW ID (default: `args`)
         
     Returns:
         (success, output)
     """
     provider = get_provider()
-    return provider.run_command(command, args, working_dir, output_file)
+    with span("provider.call", command=command[:40], provider=provider.name) as current:
+        return _run_slash_command(provider, current, command, args, working_dir,
+                                  output_file, cache, on_line, adw_id, cache_inputs)
+
+
+def _run_slash_command(provider, current, command, args, working_dir, output_file,
+                       cache, on_line, adw_id, cache_inputs) -> Tuple[bool, str]:
+    def run_provider() -> Tuple[bool, str]:
+        with slot("provider"):
+            success, output = provider.run_command(command, args, working_dir, output_file, on_line)
+        call = getattr(provider, "last_call", None)
+        if call:
+            current.set(success=success, turns=call.turns, output_tokens=call.output_tokens,
+                        first_output_seconds=call.first_output_seconds)
+        if adw_id and call:
+            record_call(adw_id, call)
+        return success, output
+    
+    use_cache = prompt_cache_enabled() if cache is None else cache
+    ttl = CACHEABLE_COMMANDS.get(command)
+    if not use_cache or ttl is None:
+        return run_provider()
+    
+    tree_hash = get_tree_hash(working_dir)
+    if not tree_hash:
+        return run_provider()
+    
+    prompt_cache = get_prompt_cache()
+    key = prompt_cache_key(provider.name, command, args if cache_inputs is None else cache_inputs, tree_hash)
+    cached = prompt_cache.get(key)
+    if cached is not None:
+        print(f"   [Prompt cache hit: {command}]")
+        current.set(cached=True)
+        if output_file:
+            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+            Path(output_file).write_text(cached)
+        return True, cached
+    
+    success, output = run_provider()
+    if success:
+        prompt_cache.put(key, output, ttl=ttl)
+    return success, output
@@ -0,0 +1,110 @@
+"""Size-bounded on-disk JSON cache shared by ADW components."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def get_cache_dir() -> Path:
+    """Root directory for ADW caches (`ADW_CACHE_DIR`, default ~/.cache/adw)."""
+    return Path(os.getenv("ADW_CACHE_DIR") or Path.home() / ".cache" / "adw")
+
+
+def hash_key(*parts: Any) -> str:
+    """Stable sha256 key for JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class DiskCache:
+    """JSON entries stored one file per key, evicted least-recently-used first.
+
+    Entry access time is tracked through the file mtime, which `get` bumps on
+    every hit. `put` evicts the oldest entries once the namespace grows past
+    `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        default_ttl: Optional[float] = None,
+        root: Optional[Path] = None,
+    ):
+        self.directory = Path(root or get_cache_dir()) / namespace
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at < time.time():
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value atomically, then enforce the size bound."""
+        ttl = self.default_ttl if ttl is None else ttl
+        entry = {
+            "created_at": time.time(),
+            "expires_at": time.time() + ttl if ttl else None,
+            "value": value,
+        }
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def delete(self, key: str) -> None:
+        """Drop a single entry."""
+        self._path(key).unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        """Remove least-recently-used entries until under `max_bytes`."""
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            path.unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes:
+                break
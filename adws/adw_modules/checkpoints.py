@@ -0,0 +1,168 @@
+"""Per-phase checkpoints so an SDLC run can resume where it stopped."""
+
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .cache import hash_key
+from .data_types import ADWStateData, PhaseCheckpoint
+from .state import load_state, save_state, find_runs
+from .tracing import span
+
+
+# Phases read the source trees and top-level config. Run artifacts, build
+# output and dependencies are left out: hashing never walks node_modules or
+# .next, and a rebuild does not invalidate a phase.
+WORKTREE_PATHSPECS = (
+    "app", "lib", "prisma", "tests", "scripts",
+    ":(glob)*.json", ":(glob)*.yaml", ":(glob)*.ts", ":(glob)*.mjs",
+    ":(exclude,glob)**/node_modules/**", ":(exclude,glob)**/.next/**", ":(exclude,glob)**/*.tsbuildinfo",
+)
+
+
+def phase_outputs(phase: str, state: ADWStateData) -> List[str]:
+    """Artifacts a completed phase leaves behind."""
+    outputs = {
+        "plan": [state.plan_file],
+        "build": [f"agents/{state.adw_id}/implementor/raw_output.txt"],
+        "test": [f"agents/{state.adw_id}/test_results.json"],
+        "review": [f"agents/{state.adw_id}/reviewer/raw_output.txt"],
+    }.get(phase, [])
+    return [path for path in outputs if path]
+
+
+def issue_fingerprint(issue_number: int) -> str:
+    """Hash of the issue text and comments the plan is generated from."""
+    from .github import fetch_issue
+
+    issue = fetch_issue(issue_number)
+    if not issue:
+        return hash_key("issue", issue_number)
+    return hash_key("issue", issue.title, issue.body, [c.body for c in issue.comments])
+
+
+def worktree_fingerprint(cwd: Optional[str] = None) -> Optional[str]:
+    """Hash of HEAD's tree plus uncommitted changes under WORKTREE_PATHSPECS."""
+    head = subprocess.run(["git", "rev-parse", "HEAD^{tree}"], cwd=cwd, capture_output=True, text=True)
+    status = subprocess.run(
+        ["git", "status", "--porcelain", "-z", "--untracked-files=all", "--"] + list(WORKTREE_PATHSPECS),
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if head.returncode != 0 or status.returncode != 0:
+        return None
+
+    entries = status.stdout.split("\0")
+    paths = []
+    index = 0
+    while index < len(entries):
+        entry = entries[index]
+        index += 1
+        if not entry:
+            continue
+        if entry[0] in "RC":
+            index += 1  # rename/copy entries are followed by the source path
+        paths.append(entry[3:])
+    existing = sorted(p for p in paths if Path(cwd or ".", p).is_file())
+    blobs = []
+    if existing:
+        hashed = subprocess.run(
+            ["git", "hash-object", "--stdin-paths"],
+            cwd=cwd, input="\n".join(existing), capture_output=True, text=True,
+        )
+        if hashed.returncode != 0:
+            return None
+        blobs = hashed.stdout.split()
+    deleted = sorted(set(paths) - set(existing))
+    return hash_key("worktree", head.stdout.strip(), list(zip(existing, blobs)), deleted)
+
+
+def latest_run(issue_number: int) -> Optional[str]:
+    """ADW ID of the most recently updated run for an issue."""
+    runs = find_runs(issue_number=issue_number, limit=1)
+    return runs[0]["state"].adw_id if runs else None
+
+
+class PhaseTracker:
+    """Computes phase input hashes, records checkpoints and decides what to skip.
+
+    A phase's input hash chains the previous phase's hash with its own
+    inputs: the issue for plan, the spec for build, and the working tree for
+    test, review and pr. A phase is skipped on resume when its checkpoint
+    is `done`, its input hash still matches and its outputs still exist.
+    """
+
+    def __init__(self, issue_number: int, adw_id: Optional[str] = None, resume: bool = False):
+        self.issue_number = issue_number
+        self.adw_id = adw_id
+        self.resume = resume
+        self.previous = ""
+        self.hashes: Dict[str, Optional[str]] = {}
+
+    def input_hash(self, phase: str) -> Optional[str]:
+        with span("checkpoint.hash", phase=phase):
+            return self._input_hash(phase)
+
+    def _input_hash(self, phase: str) -> Optional[str]:
+        if phase == "plan":
+            own = issue_fingerprint(self.issue_number)
+        elif phase == "build":
+            state = load_state(self.adw_id) if self.adw_id else None
+            plan_file = Path(state.plan_file) if state and state.plan_file else None
+            own = hash_key(plan_file.read_text()) if plan_file and plan_file.exists() else None
+        else:
+            own = worktree_fingerprint()
+        return hash_key(phase, self.previous, own) if own else None
+
+    def fresh(self, phase: str) -> bool:
+        """Whether `phase` can be skipped; also fixes its input hash for `run`."""
+        self.hashes[phase] = self.input_hash(phase)
+        if not self.resume or not self.adw_id:
+            return False
+        state = load_state(self.adw_id)
+        checkpoint = state.checkpoints.get(phase) if state else None
+        valid = (
+            checkpoint is not None
+            and checkpoint.status == "done"
+            and checkpoint.input_hash is not None
+            and checkpoint.input_hash == self.hashes[phase]
+            and all(Path(path).exists() for path in checkpoint.outputs)
+        )
+        if valid:
+            self.previous = self.hashes[phase]
+        else:
+            # Everything after the first stale phase runs again
+            self.resume = False
+        return valid
+
+    def run(self, phase: str, func: Callable, *args):
+        """Run a phase and record its checkpoint; returns the phase's result."""
+        input_hash = self.hashes.pop(phase) if phase in self.hashes else self.input_hash(phase)
+        started_at = datetime.now()
+        start = time.monotonic()
+        with span("phase", phase=phase) as current:
+            result = func(*args)
+            current.set(result=result)
+        if phase == "plan":
+            self.adw_id = result or self.adw_id
+            success = bool(result)
+        else:
+            success = result == 0
+        self.record(phase, input_hash, started_at, time.monotonic() - start, success)
+        self.previous = input_hash or ""
+        return result
+
+    def record(self, phase: str, input_hash: Optional[str], started_at: datetime,
+               duration: float, success: bool) -> None:
+        state = load_state(self.adw_id) if self.adw_id else None
+        if not state:
+            return
+        state.checkpoints[phase] = PhaseCheckpoint(
+            status="done" if success else "failed",
+            input_hash=input_hash,
+            outputs=[path for path in phase_outputs(phase, state) if Path(path).exists()],
+            started_at=started_at,
+            duration_seconds=round(duration, 3),
+        )
+        save_state(state)
@@ -0,0 +1,277 @@
+"""Check definitions and runners for the test phase."""
+
+import contextvars
+import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .cache import DiskCache, hash_key
+from .limits import slot
+from .tracing import span
+
+
+CHECK_TIMEOUT = 300
+CHECK_CACHE_VERSION = 1
+CHECK_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# Every check depends on the installed toolchain.
+TOOLCHAIN_INPUTS = ("package.json", "pnpm-lock.yaml", "tsconfig.json")
+SOURCE_INPUTS = ("app", "lib", "tests", "prisma")
+
+
+@dataclass
+class Check:
+    """A single check and the checks it has to wait for."""
+    key: str
+    name: str
+    command: str
+    purpose: str
+    depends_on: Tuple[str, ...] = ()
+    blocking: bool = True
+    inputs: Tuple[str, ...] = SOURCE_INPUTS
+
+
+DEFAULT_CHECKS = [
+    Check("typecheck", "TypeScript Check", "pnpm tsc --noEmit", "Validate TypeScript types",
+          inputs=SOURCE_INPUTS + ("*.ts", "*.mjs")),
+    Check("lint", "Lint Check", "pnpm lint", "Check code quality",
+          inputs=SOURCE_INPUTS + ("eslint.config.mjs", "next.config.ts")),
+    Check("unit", "Unit Tests", "pnpm test", "Run unit tests",
+          inputs=("app", "lib", "tests", "vitest.config.ts")),
+    Check("build", "Build Test", "pnpm build", "Verify production build", depends_on=("typecheck",),
+          inputs=SOURCE_INPUTS + ("public", "next.config.ts")),
+]
+
+
+def load_checks() -> List[Check]:
+    """The test phase's checks; with `ADW_CHECK_COMMAND` set, each runs that command instead.
+
+    The override keeps the check graph intact for smoke runs and benchmarks
+    on hosts without the Node toolchain.
+    """
+    command = os.getenv("ADW_CHECK_COMMAND")
+    if not command:
+        return list(DEFAULT_CHECKS)
+    return [replace(check, command=command) for check in DEFAULT_CHECKS]
+
+
+def input_key(check: Check, cwd: Optional[str] = None) -> Optional[str]:
+    """Content hash of a check's command and input files.
+
+    Files are enumerated with git (tracked plus untracked, minus ignored) and
+    hashed from the working tree, so uncommitted edits change the key.
+    Returns None outside a git checkout.
+    """
+    pathspecs = list(TOOLCHAIN_INPUTS) + list(check.inputs)
+    listed = subprocess.run(
+        ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard", "--"] + pathspecs,
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if listed.returncode != 0:
+        return None
+    paths = sorted({
+        path for path in listed.stdout.split("\0")
+        if path and os.path.isfile(os.path.join(cwd or ".", path))
+    })
+
+    blobs: List[str] = []
+    if paths:
+        hashed = subprocess.run(
+            ["git", "hash-object", "--stdin-paths"],
+            cwd=cwd, input="\n".join(paths), capture_output=True, text=True,
+        )
+        if hashed.returncode != 0:
+            return None
+        blobs = hashed.stdout.split()
+    return hash_key(CHECK_CACHE_VERSION, check.command, list(zip(paths, blobs)))
+
+
+def check_cache_enabled() -> bool:
+    """Check result caching is on unless ADW_CHECK_CACHE=0."""
+    return os.getenv("ADW_CHECK_CACHE", "1") != "0"
+
+
+def get_check_cache() -> DiskCache:
+    """Cache of passing check results, keyed by `input_key`."""
+    return DiskCache("checks", max_bytes=CHECK_CACHE_MAX_BYTES)
+
+
+def default_workers(checks: List[Check]) -> int:
+    """Size the worker pool to the machine, capped by the number of checks."""
+    env_workers = os.getenv("ADW_CHECK_WORKERS")
+    if env_workers:
+        return max(1, int(env_workers))
+    return max(1, min(len(checks), os.cpu_count() or 1))
+
+
+def _result(check: Check, passed: bool, duration: float, error: Optional[str] = None) -> dict:
+    result = {
+        "test_name": check.name,
+        "passed": passed,
+        "execution_command": check.command,
+        "test_purpose": check.purpose,
+        "duration_seconds": round(duration, 3),
+    }
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+class CheckRunner:
+    """Runs checks as subprocesses that can be cancelled as a group."""
+
+    def __init__(
+        self,
+        timeout: int = CHECK_TIMEOUT,
+        cwd: Optional[str] = None,
+        cache: Optional[DiskCache] = None,
+    ):
+        self.timeout = timeout
+        self.cwd = cwd
+        self.cache = cache
+        self.cancelled = threading.Event()
+        self._procs: Dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+
+    def run(self, check: Check) -> dict:
+        """Run one check, reusing a cached pass for identical inputs."""
+        with span("check", check=check.name) as current:
+            result = self._run(check)
+            current.set(passed=result["passed"], cached=result.get("cached", False))
+            return result
+
+    def _run(self, check: Check) -> dict:
+        start = time.monotonic()
+        if self.cancelled.is_set():
+            return _result(check, False, 0.0, "Cancelled")
+
+        key = input_key(check, self.cwd) if self.cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached:
+                result = _result(check, True, time.monotonic() - start)
+                result.update(cached=True, cache_key=key,
+                              original_duration_seconds=cached.get("duration_seconds"))
+                return result
+
+        with slot("check"):
+            if self.cancelled.is_set():
+                return _result(check, False, 0.0, "Cancelled")
+            result = self._execute(check, time.monotonic())
+        if key and result["passed"]:
+            self.cache.put(key, result)
+        return result
+
+    def _execute(self, check: Check, start: float) -> dict:
+        try:
+            process = subprocess.Popen(
+                check.command,
+                shell=True,
+                cwd=self.cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                start_new_session=True,
+            )
+        except Exception as e:
+            return _result(check, False, time.monotonic() - start, str(e))
+
+        with self._lock:
+            self._procs[check.key] = process
+        if self.cancelled.is_set():
+            _kill_group(process)
+        try:
+            stdout, stderr = process.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            _kill_group(process)
+            process.communicate()
+            return _result(check, False, time.monotonic() - start,
+                           f"Test timed out after {self.timeout // 60} minutes")
+        finally:
+            with self._lock:
+                self._procs.pop(check.key, None)
+
+        duration = time.monotonic() - start
+        if self.cancelled.is_set() and process.returncode != 0:
+            return _result(check, False, duration, "Cancelled")
+        if process.returncode == 0:
+            return _result(check, True, duration)
+        return _result(check, False, duration, stderr[:500] if stderr else "Test failed")
+
+    def cancel(self) -> None:
+        """Kill every running check."""
+        self.cancelled.set()
+        with self._lock:
+            processes = list(self._procs.values())
+        for process in processes:
+            _kill_group(process)
+
+
+def _kill_group(process: subprocess.Popen) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_checks_parallel(
+    checks: List[Check],
+    max_workers: Optional[int] = None,
+    on_result: Optional[Callable[[Check, dict], None]] = None,
+    runner: Optional[CheckRunner] = None,
+) -> List[dict]:
+    """Run checks concurrently, respecting `depends_on`.
+
+    A check starts once all of its dependencies have passed. When a blocking
+    check fails, running checks are cancelled and nothing new is started.
+    Results are returned in the order of `checks`; checks that never finished
+    are left out, like the sequential fail-fast loop does.
+    """
+    runner = runner or CheckRunner()
+    max_workers = max_workers or default_workers(checks)
+    by_key = {check.key: check for check in checks}
+    results: Dict[str, dict] = {}
+    pending = list(checks)
+    running = {}
+    failed = False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            if not failed:
+                for check in list(pending):
+                    if len(running) >= max_workers:
+                        break
+                    deps = [d for d in check.depends_on if d in by_key]
+                    if any(d in results and not results[d]["passed"] for d in deps):
+                        pending.remove(check)
+                    elif all(d in results for d in deps):
+                        pending.remove(check)
+                        # Copy the context so check spans nest under the caller's
+                        running[pool.submit(contextvars.copy_context().run, runner.run, check)] = check
+            else:
+                pending.clear()
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                check = running.pop(future)
+                result = future.result()
+                if runner.cancelled.is_set() and result.get("error") == "Cancelled":
+                    if on_result:
+                        on_result(check, result)
+                    continue
+                results[check.key] = result
+                if on_result:
+                    on_result(check, result)
+                if not result["passed"] and check.blocking and not failed:
+                    failed = True
+                    runner.cancel()
+
+    return [results[check.key] for check in checks if check.key in results]
@@ -0,0 +1,131 @@
+"""Batch issue classification."""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+from .agent import run_slash_command, BATCH_CLASSIFY_COMMAND
+from .data_types import GitHubIssue, GitHubLabel, GitHubUser
+from .utils import classify_issue, generate_branch_name
+
+
+ISSUE_CLASSES = ("/chore", "/bug", "/feature")
+DEFAULT_BATCH_SIZE = 40
+MAX_BODY_CHARS = 1500
+
+
+def get_batch_size() -> int:
+    """Issues per provider call (`ADW_CLASSIFY_BATCH_SIZE`)."""
+    return max(1, int(os.getenv("ADW_CLASSIFY_BATCH_SIZE", DEFAULT_BATCH_SIZE)))
+
+
+def issue_from_dict(data: dict) -> GitHubIssue:
+    """Build an issue from loose JSON, e.g. `gh issue list --json number,title,body,labels`."""
+    labels = []
+    for label in data.get("labels") or []:
+        if isinstance(label, dict):
+            labels.append(GitHubLabel(name=label.get("name", ""), color=label.get("color", "")))
+        else:
+            labels.append(GitHubLabel(name=str(label), color=""))
+    return GitHubIssue(
+        number=int(data["number"]),
+        title=data.get("title", ""),
+        body=data.get("body") or "",
+        state=data.get("state", "open"),
+        author=GitHubUser(login=(data.get("author") or {}).get("login", "")),
+        labels=labels,
+        created_at=data.get("created_at") or data.get("createdAt") or "1970-01-01T00:00:00Z",
+        updated_at=data.get("updated_at") or data.get("updatedAt") or "1970-01-01T00:00:00Z",
+        url=data.get("url") or data.get("html_url") or "",
+    )
+
+
+def build_batch_prompt(issues: List[GitHubIssue]) -> str:
+    """Prompt asking for one JSON classification per issue."""
+    payload = [
+        {
+            "number": issue.number,
+            "title": issue.title,
+            "labels": [label.name for label in issue.labels],
+            "body": (issue.body or "")[:MAX_BODY_CHARS],
+        }
+        for issue in issues
+    ]
+    return f"""You are a GitHub issue classifier. Classify EACH issue below as ONE of: /chore, /bug, /feature.
+
+Classification rules:
+- /chore: maintenance, refactoring, config, docs
+- /bug: bug fixes, errors
+- /feature: new features
+
+Respond ONLY with a JSON array, one object per issue, nothing else:
+[{{"number": 1, "class": "/feature"}}]
+
+Issues:
+{json.dumps(payload, indent=1, ensure_ascii=False)}"""
+
+
+def parse_batch_response(output: str) -> Optional[Dict[int, str]]:
+    """Map issue number to class from a JSON response, or None if unparseable.
+
+    Accepts the array on its own, inside a ```json fence, or surrounded by
+    other text. Entries with an unknown class are dropped.
+    """
+    start = output.find("[")
+    end = output.rfind("]")
+    if start == -1 or end <= start:
+        return None
+    try:
+        entries = json.loads(output[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(entries, list):
+        return None
+
+    classes = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        issue_class = str(entry.get("class", "")).strip()
+        try:
+            number = int(entry.get("number"))
+        except (TypeError, ValueError):
+            continue
+        if issue_class in ISSUE_CLASSES:
+            classes[number] = issue_class
+    return classes
+
+
+def classify_issues(issues: List[GitHubIssue], use_provider: bool = True) -> List[dict]:
+    """Classify many issues with one provider call per batch.
+
+    Issues the provider does not answer for, or every issue in a batch whose
+    response cannot be parsed, fall back to the local keyword classifier.
+    Returns one row per issue, in input order.
+    """
+    batch_size = get_batch_size()
+    rows = []
+    for offset in range(0, len(issues), batch_size):
+        batch = issues[offset:offset + batch_size]
+        classes: Dict[int, str] = {}
+        if use_provider:
+            success, output = run_slash_command(BATCH_CLASSIFY_COMMAND, [build_batch_prompt(batch)])
+            parsed = parse_batch_response(output) if success else None
+            if parsed is None:
+                print("⚠️  Could not parse batch classification, using keyword classifier")
+            classes = parsed or {}
+
+        for issue in batch:
+            issue_class = classes.get(issue.number)
+            source = "provider"
+            if issue_class is None:
+                issue_class = classify_issue(issue.title, issue.body or "", issue.labels)
+                source = "keyword"
+            rows.append({
+                "issue_number": issue.number,
+                "title": issue.title,
+                "issue_class": issue_class,
+                "branch_name": generate_branch_name(issue.number, issue.title, issue_class),
+                "source": source,
+            })
+    return rows
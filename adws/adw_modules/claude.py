@@ -0,0 +1,117 @@
+"""Incremental parser for Claude CLI `--output-format stream-json` output.
+
+With `-p --output-format stream-json --verbose` the CLI prints one JSON
+object per line: a `system` init event, `assistant` and `user` messages as
+turns progress, and a final `result` event with timing, turn count, token
+usage and cost.
+"""
+
+import json
+import time
+from typing import Callable, Dict, List, Optional
+
+
+USAGE_FIELDS = {
+    "input_tokens": "input_tokens",
+    "output_tokens": "output_tokens",
+    "cache_read_input_tokens": "cache_read_tokens",
+    "cache_creation_input_tokens": "cache_creation_tokens",
+}
+
+
+class ClaudeStream:
+    """Consumes stream-json lines as they arrive.
+
+    Assistant text is echoed with `echo_prefix` (None disables echo) and
+    passed line by line to `on_text`; when `on_text` returns True,
+    `feed_line` does too, so `stream_command` can stop the CLI. A stopped
+    run never sees the `result` event: `text` is then all assistant text up
+    to the stop, and `usage()` covers only the turns seen. Lines that are
+    not JSON (warnings, a truncated last line) are ignored.
+    """
+
+    def __init__(
+        self,
+        on_text: Optional[Callable[[str], Optional[bool]]] = None,
+        echo_prefix: Optional[str] = "   ",
+    ):
+        self.on_text = on_text
+        self.echo_prefix = echo_prefix
+        self.started = time.monotonic()
+        self.first_output: Optional[float] = None  # monotonic time of the first assistant event
+        self.texts: List[str] = []
+        self.result: Optional[dict] = None
+        self._usage: Dict[str, dict] = {}  # latest usage per assistant message id
+        self._stopped = False
+
+    def feed_line(self, line: str) -> bool:
+        """Consume one output line; returns True once `on_text` asked to stop."""
+        line = line.strip()
+        if self._stopped or not line.startswith("{"):
+            return self._stopped
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return False
+
+        kind = event.get("type")
+        if kind == "assistant":
+            if self.first_output is None:
+                self.first_output = time.monotonic()
+            message = event.get("message") or {}
+            message_id = message.get("id") or f"turn-{len(self._usage)}"
+            self._usage[message_id] = message.get("usage") or self._usage.get(message_id) or {}
+            for block in message.get("content") or []:
+                if block.get("type") == "text":
+                    self._text(block.get("text") or "")
+                elif block.get("type") == "tool_use" and self.echo_prefix is not None:
+                    print(f"{self.echo_prefix}[tool: {block.get('name')}]", flush=True)
+                if self._stopped:
+                    break
+        elif kind == "result":
+            self.result = event
+        return self._stopped
+
+    def _text(self, text: str) -> None:
+        self.texts.append(text)
+        for line in text.split("\n"):
+            if self.echo_prefix is not None:
+                print(f"{self.echo_prefix}{line}", flush=True)
+            if self.on_text and self.on_text(line):
+                self._stopped = True
+                return
+
+    @property
+    def stopped(self) -> bool:
+        """Whether `on_text` stopped the run before its result."""
+        return self._stopped
+
+    @property
+    def text(self) -> str:
+        """The final answer, or all assistant text if the run did not finish."""
+        if self.result and isinstance(self.result.get("result"), str):
+            return self.result["result"]
+        return "\n".join(self.texts)
+
+    @property
+    def is_error(self) -> bool:
+        return bool(self.result and self.result.get("is_error"))
+
+    @property
+    def turns(self) -> Optional[int]:
+        if self.result and self.result.get("num_turns") is not None:
+            return self.result["num_turns"]
+        return len(self._usage) or None
+
+    def usage(self) -> Dict[str, Optional[float]]:
+        """Token counts (and cost, when reported) as `ProviderCall` fields."""
+        totals: Dict[str, Optional[float]] = {}
+        if self.result and self.result.get("usage"):
+            usages = [self.result["usage"]]
+        else:
+            usages = list(self._usage.values())
+        for source, target in USAGE_FIELDS.items():
+            values = [u[source] for u in usages if isinstance(u.get(source), int)]
+            totals[target] = sum(values) if values else None
+        totals["cost_usd"] = self.result.get("total_cost_usd") if self.result else None
+        return totals
@@ -0,0 +1,8 @@
+"""Names of the prompt commands ADW sends to providers.
+
+Kept free of imports so the fake provider CLI can share them with
+agent.py without loading the rest of the package.
+"""
+
+SPEC_COMMAND = "Generate a detailed implementation spec:"
+BATCH_CLASSIFY_COMMAND = "Classify these GitHub issues:"
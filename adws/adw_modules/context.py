@@ -0,0 +1,384 @@
+"""Precomputed repository context for planning and implementation prompts.
+
+The index covers the app's file tree, the exports of `lib/services/*`, the
+handlers of every `app/api/**/route.ts`, the Prisma models and which
+sources each test imports. It is keyed by the HEAD tree hash plus the
+blobs of uncommitted changes, and built incrementally: each file's
+extraction is cached by its blob hash, so a change re-reads only the files
+it touched. `context_digest` renders a compact markdown summary that
+prompts inline so the agent does not have to explore the repo first.
+"""
+
+import os
+import re
+import subprocess
+from dataclasses import asdict, dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional
+
+from .cache import DiskCache, hash_key
+from .impact import IMPORT_PATTERN, TEST_FILE, resolve_import
+from .tracing import span
+
+
+CONTEXT_INDEX_VERSION = 1
+CONTEXT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_DIGEST_MAX_BYTES = 6000
+DIGEST_SECTION_LINES = 30
+DIGEST_LINE_BYTES = 300
+# Room kept in each section for its "- ... N more" line
+_MORE_RESERVE = 40
+
+INDEX_PATHS = ("app", "lib", "prisma", "tests")
+SCHEMA_FILE = "prisma/schema.prisma"
+SERVICE_FILE = re.compile(r"^lib/services/[^/]+\.tsx?$")
+ROUTE_FILE = re.compile(r"^app/(?:.*/)?api/(?:.*/)?route\.[jt]sx?$")
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")
+
+EXPORT_PATTERN = re.compile(
+    r"^export\s+(?:default\s+)?(?:declare\s+)?(?:async\s+)?"
+    r"(function\*?|class|interface|type|const|let|enum)\s+(\w+)",
+    re.MULTILINE,
+)
+HANDLER_PATTERN = re.compile(
+    r"^export\s+(?:async\s+function\s+|function\s+|const\s+)(" + "|".join(HTTP_METHODS) + r")\b",
+    re.MULTILINE,
+)
+BLOCK_PATTERN = re.compile(r"^(model|enum)\s+(\w+)\s*\{(.*?)^\}", re.MULTILINE | re.DOTALL)
+# Route groups like `(admin)` are not part of the URL
+ROUTE_GROUP = re.compile(r"/\([^/]+\)")
+
+
+@dataclass
+class RepoIndex:
+    """What the agent would otherwise learn by exploring the repo."""
+    key: str
+    tree: str
+    files: List[str] = field(default_factory=list)
+    # path -> ["function searchSupplies", "interface SearchSuppliesResult", ...]
+    services: Dict[str, List[str]] = field(default_factory=dict)
+    # route file -> handled HTTP methods
+    routes: Dict[str, List[str]] = field(default_factory=dict)
+    # model or enum name -> ["id String @id", ...] or enum values
+    models: Dict[str, List[str]] = field(default_factory=dict)
+    enums: Dict[str, List[str]] = field(default_factory=dict)
+    # test file -> source files it imports
+    tests: Dict[str, List[str]] = field(default_factory=dict)
+
+
+def context_index_enabled() -> bool:
+    """Prompts include the context digest unless ADW_CONTEXT_INDEX=0."""
+    return os.getenv("ADW_CONTEXT_INDEX", "1") != "0"
+
+
+def get_context_cache() -> DiskCache:
+    """Cache of whole indexes by key and per-file extractions by blob."""
+    return DiskCache("context", max_bytes=CONTEXT_CACHE_MAX_BYTES)
+
+
+def _git(args: List[str], cwd: str, input: Optional[str] = None) -> Optional[str]:
+    result = subprocess.run(["git"] + args, cwd=cwd, input=input, capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def _dirty_paths(cwd: str) -> Optional[List[str]]:
+    """Paths under INDEX_PATHS that differ from HEAD, including untracked files."""
+    status = _git(["status", "--porcelain", "-z", "--untracked-files=all", "--"] + list(INDEX_PATHS), cwd)
+    if status is None:
+        return None
+    entries = status.split("\0")
+    paths, index = [], 0
+    while index < len(entries):
+        entry = entries[index]
+        index += 1
+        if not entry:
+            continue
+        if entry[0] in "RC":
+            index += 1  # rename/copy entries are followed by the source path
+        paths.append(entry[3:])
+    return sorted(set(paths))
+
+
+def _hash_objects(paths: List[str], cwd: str) -> Optional[Dict[str, str]]:
+    if not paths:
+        return {}
+    hashed = _git(["hash-object", "--stdin-paths"], cwd, input="\n".join(paths))
+    return dict(zip(paths, hashed.split())) if hashed is not None else None
+
+
+@dataclass
+class TreeState:
+    """Cache key of a checkout: HEAD's tree plus its uncommitted changes."""
+    key: str
+    tree: str
+    # dirty path -> blob hash of the working tree copy, None when deleted
+    changed: Dict[str, Optional[str]]
+
+
+def tree_state(cwd: str = ".") -> Optional[TreeState]:
+    """The checkout's TreeState, or None outside a git checkout."""
+    tree = _git(["rev-parse", "HEAD^{tree}"], cwd)
+    dirty = _dirty_paths(cwd)
+    if tree is None or dirty is None:
+        return None
+    existing = [path for path in dirty if os.path.isfile(os.path.join(cwd, path))]
+    hashed = _hash_objects(existing, cwd)
+    if hashed is None:
+        return None
+    changed: Dict[str, Optional[str]] = {path: hashed.get(path) for path in dirty}
+    key = hash_key("context", CONTEXT_INDEX_VERSION, tree.strip(), sorted(changed.items()))
+    return TreeState(key, tree.strip(), changed)
+
+
+def _worktree_blobs(cwd: str, state: TreeState) -> Optional[Dict[str, str]]:
+    """path -> blob hash of the working tree copy, for every file under INDEX_PATHS."""
+    listed = _git(["ls-files", "-s", "-z", "--"] + list(INDEX_PATHS), cwd)
+    if listed is None:
+        return None
+    blobs = {}
+    for entry in listed.split("\0"):
+        if entry:
+            meta, path = entry.split("\t", 1)
+            blobs[path] = meta.split()[1]
+    for path, blob in state.changed.items():
+        if blob:
+            blobs[path] = blob
+        else:
+            blobs.pop(path, None)
+    return blobs
+
+
+def route_path(path: str) -> str:
+    """URL of a route file: app/api/supplies/[id]/route.ts -> /api/supplies/[id]."""
+    url = "/" + str(PurePosixPath(path).parent.relative_to("app"))
+    return ROUTE_GROUP.sub("", url)
+
+
+def extract_exports(text: str) -> List[str]:
+    """`kind name` for each top-level export, in source order."""
+    return [f"{kind.rstrip('*')} {name}" for kind, name in EXPORT_PATTERN.findall(text)]
+
+
+def extract_handlers(text: str) -> List[str]:
+    """HTTP methods a route file exports handlers for."""
+    found = set(HANDLER_PATTERN.findall(text))
+    return [method for method in HTTP_METHODS if method in found]
+
+
+def extract_schema(text: str) -> Dict[str, Dict[str, List[str]]]:
+    """Prisma models (field lines) and enums (values), without block attributes."""
+    models, enums = {}, {}
+    for kind, name, body in BLOCK_PATTERN.findall(text):
+        lines = [
+            " ".join(line.split("//")[0].split())
+            for line in body.splitlines()
+        ]
+        lines = [line for line in lines if line and not line.startswith("@@")]
+        (models if kind == "model" else enums)[name] = lines
+    return {"models": models, "enums": enums}
+
+
+def extract_imports(text: str) -> List[str]:
+    """Import specifiers, deduplicated in source order."""
+    specs = (next(group for group in match.groups() if group) for match in IMPORT_PATTERN.finditer(text))
+    return list(dict.fromkeys(specs))
+
+
+def _extractor(path: str):
+    if SERVICE_FILE.match(path):
+        return "exports", extract_exports
+    if ROUTE_FILE.match(path):
+        return "handlers", extract_handlers
+    if path == SCHEMA_FILE:
+        return "schema", extract_schema
+    if path.startswith("tests/") and TEST_FILE.search(path):
+        return "imports", extract_imports
+    return None
+
+
+def _extract(path: str, blob: str, cwd: str, cache: Optional[DiskCache], counts: Dict[str, int]):
+    """`path`'s extraction, reused from the cache when its blob was seen before."""
+    kind, func = _extractor(path)
+    file_key = hash_key("context-file", CONTEXT_INDEX_VERSION, kind, blob)
+    if cache is not None:
+        cached = cache.get(file_key)
+        if cached is not None:
+            counts["reused"] += 1
+            return cached
+    try:
+        text = Path(cwd, path).read_text(errors="ignore")
+    except OSError:
+        return None
+    value = func(text)
+    counts["parsed"] += 1
+    if cache is not None:
+        cache.put(file_key, value)
+    return value
+
+
+def build_index(
+    cwd: str = ".",
+    cache: Optional[DiskCache] = None,
+    state: Optional[TreeState] = None,
+    counts: Optional[Dict[str, int]] = None,
+) -> Optional[RepoIndex]:
+    """Index the checkout at `cwd`, reusing cached per-file extractions.
+
+    `counts` receives how many files were parsed and how many reused.
+    """
+    state = state or tree_state(cwd)
+    if state is None:
+        return None
+    blobs = _worktree_blobs(cwd, state)
+    if blobs is None:
+        return None
+
+    index = RepoIndex(key=state.key, tree=state.tree, files=sorted(blobs))
+    counts = counts if counts is not None else {}
+    counts.update(parsed=0, reused=0)
+    imports: Dict[str, List[str]] = {}
+    for path in index.files:
+        extractor = _extractor(path)
+        if not extractor:
+            continue
+        value = _extract(path, blobs[path], cwd, cache, counts)
+        if value is None:
+            continue
+        if extractor[0] == "exports":
+            index.services[path] = value
+        elif extractor[0] == "handlers":
+            index.routes[path] = value
+        elif extractor[0] == "schema":
+            index.models, index.enums = value["models"], value["enums"]
+        else:
+            imports[path] = value
+
+    # Resolution depends on which files exist, so it is redone on every build
+    files = set(index.files)
+    for test, specs in imports.items():
+        targets = (resolve_import(spec, PurePosixPath(test), files) for spec in specs)
+        sources = [t for t in targets if t and not t.startswith("tests/")]
+        index.tests[test] = list(dict.fromkeys(sources))
+    return index
+
+
+def load_index(cwd: str = ".", use_cache: bool = True) -> Optional[RepoIndex]:
+    """The index for the checkout's current state, from the cache when unchanged."""
+    cache = get_context_cache() if use_cache else None
+    with span("context.index") as current:
+        state = tree_state(cwd)
+        if state is None:
+            return None
+        stored = cache.get(state.key) if cache is not None else None
+        if stored is not None:
+            current.set(cached=True)
+            return RepoIndex(**stored)
+        counts: Dict[str, int] = {}
+        index = build_index(cwd, cache, state, counts)
+        if index is None:
+            return None
+        current.set(cached=False, files=len(index.files), **counts)
+        if cache is not None:
+            cache.put(index.key, asdict(index))
+        return index
+
+
+def _file_tree(files: List[str]) -> List[str]:
+    """One line per directory: `lib/services/: stock-movements.ts, supplies.ts`."""
+    by_dir: Dict[str, List[str]] = {}
+    for path in files:
+        directory, _, name = path.rpartition("/")
+        by_dir.setdefault(directory, []).append(name)
+    return [f"- {directory}/: {', '.join(names)}" for directory, names in sorted(by_dir.items())]
+
+
+def _clip(line: str, limit: int = DIGEST_LINE_BYTES) -> str:
+    encoded = line.encode()
+    if len(encoded) <= limit:
+        return line
+    return encoded[:limit - 3].decode(errors="ignore") + "..."
+
+
+def _fair_shares(demands: List[int], budget: int) -> List[int]:
+    """Split `budget` so small demands are met in full and large ones share the rest."""
+    shares = [0] * len(demands)
+    order = sorted(range(len(demands)), key=demands.__getitem__)
+    for rank, i in enumerate(order):
+        shares[i] = min(demands[i], max(0, budget) // (len(demands) - rank))
+        budget -= shares[i]
+    return shares
+
+
+def format_digest(index: RepoIndex, max_bytes: int = DEFAULT_DIGEST_MAX_BYTES) -> str:
+    """Compact markdown summary of `index`, at most `max_bytes`.
+
+    Each section keeps at most DIGEST_SECTION_LINES lines of at most
+    DIGEST_LINE_BYTES, and ends with "- ... N more" when it is cut short.
+    The specific sections split the budget, small ones kept whole and the
+    largest sharing the rest; the file tree, the least specific, gets what
+    they leave.
+    """
+    sections = []
+    if index.services:
+        sections.append(("Services (lib/services exports)", "files", [
+            f"- {path}: {', '.join(symbols)}" for path, symbols in sorted(index.services.items())
+        ]))
+    if index.routes:
+        sections.append(("API routes", "routes", [
+            f"- {' '.join(methods) or '-'} {route_path(path)} ({path})" for path, methods in sorted(index.routes.items())
+        ]))
+    if index.models or index.enums:
+        sections.append((f"Prisma models ({SCHEMA_FILE})", "models", [
+            f"- {name}: {'; '.join(fields)}" for name, fields in index.models.items()
+        ] + [f"- enum {name}: {', '.join(values)}" for name, values in index.enums.items()]))
+    if index.tests:
+        sections.append(("Tests -> sources", "tests", [
+            f"- {test} -> {', '.join(sources) or '(no app imports)'}" for test, sources in sorted(index.tests.items())
+        ]))
+    specific = len(sections)
+    files = _file_tree(index.files)
+    if files:
+        sections.append(("Files", "directories", files))
+
+    header = f"Repository context (tree {index.tree[:12]}, precomputed; open files only to edit them)"
+    shown = [[_clip(line) for line in lines[:DIGEST_SECTION_LINES]] for _, _, lines in sections]
+    demands = [
+        len(f"\n\n### {title}\n".encode()) + sum(len(line.encode()) + 1 for line in kept)
+        + (_MORE_RESERVE if len(kept) < len(lines) else 0)
+        for (title, _, lines), kept in zip(sections, shown)
+    ]
+    parts = [header]
+    budget = max_bytes - len(header.encode())
+    shares = _fair_shares(demands[:specific], budget)
+    shares.append(budget - sum(shares))
+    for (title, noun, lines), candidates, demand, share in zip(sections, shown, demands, shares):
+        heading = f"\n\n### {title}\n"
+        room = share - len(heading.encode()) - _MORE_RESERVE
+        if share >= demand:
+            kept = list(candidates)
+        elif room < 0:
+            continue
+        else:
+            kept, used = [], 0
+            for line in candidates:
+                used += len(line.encode()) + 1
+                if used > room:
+                    break
+                kept.append(line)
+        if len(kept) < len(lines):
+            kept.append(f"- ... {len(lines) - len(kept)} more {noun}")
+        parts.append(heading + "\n".join(kept))
+    return "".join(parts)
+
+
+def get_digest_max_bytes() -> int:
+    """Digest size cap (`ADW_CONTEXT_MAX_BYTES`)."""
+    return int(os.getenv("ADW_CONTEXT_MAX_BYTES", DEFAULT_DIGEST_MAX_BYTES))
+
+
+def context_digest(cwd: Optional[str] = None) -> str:
+    """The digest to inline in a prompt, or "" when disabled or outside git."""
+    if not context_index_enabled():
+        return ""
+    index = load_index(cwd or ".")
+    return format_digest(index, get_digest_max_bytes()) if index else ""
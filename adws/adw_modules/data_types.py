@@ -1,7 +1,7 @@
 """Data types for ADW system."""
 
 from datetime import datetime
-from typing import Optional, List, Literal
+from typing import Optional, Dict, List, Literal
 from pydantic import BaseModel, Field
 from enum import Enum
 
@@ -49,6 +49,8 @@ class TestResult(BaseModel):
     execution_command: str
     test_purpose: str
     error: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    cached: bool = False
 
 
 class ReviewIssue(BaseModel):
@@ -66,6 +68,35 @@ class ReviewResult(BaseModel):
     review_issues: List[ReviewIssue] = []
 
 
+class PhaseCheckpoint(BaseModel):
+    """Completion record of one SDLC phase."""
+    status: Literal["done", "failed"]
+    input_hash: Optional[str] = None
+    outputs: List[str] = []
+    started_at: datetime
+    duration_seconds: float
+
+
+class ProviderCall(BaseModel):
+    """Timing and usage of one provider CLI call."""
+    provider: str
+    command: str
+    phase: Optional[str] = None
+    started_at: datetime
+    success: bool
+    latency_seconds: float
+    first_output_seconds: Optional[float] = None
+    turns: Optional[int] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    cache_read_tokens: Optional[int] = None
+    cache_creation_tokens: Optional[int] = None
+    cost_usd: Optional[float] = None
+    # Stopped early by `on_line`: the CLI's final result never arrived, so
+    # turns and tokens cover only the turns seen and cost is unknown
+    truncated: bool = False
+
+
 class ADWStateData(BaseModel):
     """ADW state."""
     adw_id: str
@@ -73,3 +104,6 @@ class ADWStateData(BaseModel):
     branch_name: Optional[str] = None
     plan_file: Optional[str] = None
     issue_class: Optional[IssueClassSlashCommand] = None
+    phase: Optional[str] = None
+    status: Optional[Literal["running", "done", "failed"]] = None
+    checkpoints: Dict[str, PhaseCheckpoint] = {}
@@ -0,0 +1,186 @@
+"""Streaming subprocess execution for provider CLIs."""
+
+import os
+import queue
+import subprocess
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from .tracing import span
+from .watchdog import Watchdog, kill_process_group
+
+
+DEFAULT_TAIL_BYTES = 1024 * 1024
+# Upper bound on a single blocking read, so limits are checked regularly
+POLL_SECONDS = 1.0
+
+
+def get_tail_bytes() -> int:
+    """Bytes of output kept in memory for parsing (`ADW_OUTPUT_TAIL_BYTES`)."""
+    return int(os.getenv("ADW_OUTPUT_TAIL_BYTES", DEFAULT_TAIL_BYTES))
+
+
+@dataclass
+class ExecResult:
+    """Outcome of a streamed command."""
+    returncode: Optional[int]
+    output: str
+    truncated: bool = False
+    total_bytes: int = 0
+    timed_out: Optional[str] = None
+    stopped: bool = False
+
+
+class OutputTail:
+    """Keeps the last `max_bytes` of line output."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.lines: deque = deque()
+        self.size = 0
+        self.total = 0
+        self.truncated = False
+
+    def append(self, line: str) -> None:
+        size = len(line) + 1
+        self.lines.append(line)
+        self.size += size
+        self.total += size
+        while self.size > self.max_bytes and len(self.lines) > 1:
+            self.size -= len(self.lines.popleft()) + 1
+            self.truncated = True
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+def _feed_stdin(stdin, input_text: str) -> None:
+    try:
+        stdin.write(input_text)
+    except (BrokenPipeError, OSError):
+        pass
+    finally:
+        try:
+            stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+
+def _pump(stream, lines: queue.Queue) -> None:
+    try:
+        for raw_line in stream:
+            lines.put(raw_line)
+    finally:
+        lines.put(None)
+
+
+def stream_command(
+    cmd_parts: list,
+    input_text: Optional[str] = None,
+    working_dir: Optional[str] = None,
+    output_file: Optional[str] = None,
+    on_line: Optional[Callable[[str], Optional[bool]]] = None,
+    echo_prefix: Optional[str] = "   ",
+    max_tail_bytes: Optional[int] = None,
+    watchdog: Optional[Watchdog] = None,
+) -> ExecResult:
+    """Run a command, streaming its combined output line by line.
+
+    Each line is appended to `output_file` as soon as it arrives, echoed with
+    `echo_prefix` (None disables echo) and passed to `on_line`; when `on_line`
+    returns True the output is complete, so the command is stopped and
+    `stopped` is set. Only the last `max_tail_bytes` are kept in memory and
+    returned as `output`.
+
+    The command runs in its own process group. When the watchdog (default:
+    limits from the environment) fires, the whole group is killed and the
+    reason is returned in `timed_out`.
+    """
+    with span("subprocess", command=" ".join(map(str, cmd_parts[:2]))) as current:
+        result = _stream_command(cmd_parts, input_text, working_dir, output_file, on_line,
+                                 echo_prefix, max_tail_bytes, watchdog)
+        current.set(returncode=result.returncode, bytes=result.total_bytes)
+        if result.timed_out:
+            current.set(timed_out=result.timed_out)
+        if result.stopped:
+            current.set(stopped=True)
+        return result
+
+
+def _stream_command(cmd_parts, input_text, working_dir, output_file, on_line,
+                    echo_prefix, max_tail_bytes, watchdog) -> ExecResult:
+    tail = OutputTail(max_tail_bytes or get_tail_bytes())
+    watchdog = watchdog or Watchdog.from_env()
+    timed_out = None
+    stopped = False
+    artifact = None
+    if output_file:
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        artifact = open(output_file, "w", buffering=1)
+
+    try:
+        process = subprocess.Popen(
+            cmd_parts,
+            cwd=working_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.PIPE if input_text else subprocess.DEVNULL,
+            text=True,
+            errors="replace",
+            start_new_session=True,
+        )
+        if input_text:
+            threading.Thread(target=_feed_stdin, args=(process.stdin, input_text), daemon=True).start()
+        lines: queue.Queue = queue.Queue()
+        threading.Thread(target=_pump, args=(process.stdout, lines), daemon=True).start()
+
+        while True:
+            timed_out = watchdog.expired()
+            if timed_out:
+                break
+            time_left = watchdog.time_left()
+            wait_seconds = POLL_SECONDS if time_left is None else min(POLL_SECONDS, time_left)
+            try:
+                raw_line = lines.get(timeout=wait_seconds)
+            except queue.Empty:
+                continue
+            if raw_line is None:
+                break
+
+            watchdog.touch()
+            line = raw_line.rstrip("\n")
+            tail.append(line)
+            if artifact:
+                artifact.write(line + "\n")
+            if echo_prefix is not None:
+                print(f"{echo_prefix}{line}", flush=True)
+            if on_line and on_line(line):
+                stopped = True
+                break
+
+        if not timed_out and not stopped:
+            # Output is closed; the process may still linger before exiting
+            while process.poll() is None:
+                timed_out = watchdog.expired()
+                if timed_out:
+                    break
+                try:
+                    process.wait(timeout=POLL_SECONDS)
+                except subprocess.TimeoutExpired:
+                    pass
+        if timed_out:
+            kill_process_group(process)
+            if echo_prefix is not None:
+                print(f"{echo_prefix}[killed: {timed_out}]", flush=True)
+        elif stopped:
+            kill_process_group(process)
+            if echo_prefix is not None:
+                print(f"{echo_prefix}[stopped: output complete]", flush=True)
+    finally:
+        if artifact:
+            artifact.close()
+
+    return ExecResult(process.returncode, tail.text(), tail.truncated, tail.total, timed_out, stopped)
@@ -0,0 +1,161 @@
+"""Scenarios for the fake provider (`AI_PROVIDER=fake`).
+
+The fake provider runs `adw_fake_cli.py`, a local stand-in for the
+provider CLIs. What it prints, how long it takes, which files it edits and
+how it fails come from a scenario: a JSON object in `ADW_FAKE_SCENARIO`
+(inline, or the path of a JSON file):
+
+    {
+      "format": "claude",            # claude (stream-json) | claude-text | kimi
+      "size": 4096,                  # approximate output bytes
+      "latency": "uniform:0.5,2",    # seconds per call, see sample_latency
+      "seed": 1,                     # omit for different output every call
+      "faults": {"hang": 0.05, "partial": 0.05, "exit": 0.05, "garbage": 0.05},
+      "exit_code": 1,                # used by the exit fault
+      "edits": [{"path": "app/x.ts", "content": "..."}],
+      "commands": {"/implement": {"latency": "lognormal:30,0.5"}}
+    }
+
+Entries under `commands` override the top level for that command.
+"""
+
+import json
+import os
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import transcripts
+from .commands import BATCH_CLASSIFY_COMMAND, SPEC_COMMAND
+
+
+# format -> the CLI's --output-format
+FORMATS = {"claude": "stream-json", "claude-text": "text", "kimi": "kimi"}
+FAULTS = ("hang", "partial", "exit", "garbage")
+DEFAULT_SCENARIO: Dict[str, Any] = {
+    "format": "claude",
+    "size": 4096,
+    "latency": 0,
+    "seed": None,
+    "faults": {},
+    "exit_code": 1,
+    "edits": [],
+}
+
+_SPEC_HEADER = re.compile(r"^# Spec \d+: .*$", re.MULTILINE)
+_ISSUE_NUMBER = re.compile(r'"number":\s*(\d+)')
+
+
+def load_scenario(command: str = "") -> Dict[str, Any]:
+    """The scenario in `ADW_FAKE_SCENARIO`, with `command`'s overrides applied."""
+    raw = os.getenv("ADW_FAKE_SCENARIO", "").strip()
+    config: Dict[str, Any] = {}
+    if raw:
+        config = json.loads(raw if raw.startswith("{") else Path(raw).read_text())
+    scenario = {**DEFAULT_SCENARIO, **config}
+    scenario.update((config.get("commands") or {}).get(command) or {})
+    scenario.pop("commands", None)
+    if scenario["format"] not in FORMATS:
+        raise ValueError(f"unknown fake provider format: {scenario['format']}")
+    return scenario
+
+
+def make_rng(scenario: Dict[str, Any], command: str, prompt: str) -> random.Random:
+    """Seeded per command and prompt when the scenario has a seed."""
+    seed = scenario.get("seed")
+    return random.Random(f"{seed}:{command}:{prompt}") if seed is not None else random.Random()
+
+
+def sample_latency(spec: Any, rng: random.Random) -> float:
+    """Seconds drawn from `spec`.
+
+    A number is a fixed latency; otherwise one of `fixed:S`,
+    `uniform:LOW,HIGH`, `normal:MEAN,SD`, `lognormal:MEDIAN,SIGMA` or
+    `exp:MEAN`.
+    """
+    if isinstance(spec, (int, float)):
+        return max(0.0, float(spec))
+    kind, _, params = str(spec).partition(":")
+    if not params:
+        return max(0.0, float(kind))
+    values = [float(v) for v in params.split(",")]
+    if kind == "fixed":
+        seconds = values[0]
+    elif kind == "uniform":
+        seconds = rng.uniform(values[0], values[1])
+    elif kind == "normal":
+        seconds = rng.gauss(values[0], values[1])
+    elif kind == "lognormal":
+        seconds = values[0] * rng.lognormvariate(0, values[1])
+    elif kind == "exp":
+        seconds = rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    else:
+        raise ValueError(f"unknown latency distribution: {kind}")
+    return max(0.0, seconds)
+
+
+def choose_fault(faults: Dict[str, float], rng: random.Random) -> Optional[str]:
+    """One of `faults` by probability, or None."""
+    roll = rng.random()
+    for fault in FAULTS:
+        roll -= float(faults.get(fault, 0))
+        if roll < 0:
+            return fault
+    return None
+
+
+def answer(command: str, prompt: str, scenario: Dict[str, Any], rng: random.Random) -> str:
+    """The final answer text for `command`."""
+    if command == SPEC_COMMAND:
+        spec = transcripts.synthetic_spec(max(512, scenario["size"] // 4), rng.randrange(1 << 30))
+        header = _SPEC_HEADER.search(prompt)
+        return header.group() + spec[spec.index("\n"):] if header else spec
+    if command == BATCH_CLASSIFY_COMMAND:
+        numbers = dict.fromkeys(int(n) for n in _ISSUE_NUMBER.findall(prompt))
+        return json.dumps([{"number": n, "class": "/feature"} for n in numbers])
+    if command == "/classify_issue":
+        return "/feature"
+    edited = "".join(f"\n- {edit['path']}" for edit in scenario["edits"])
+    return f"Done: {command}{edited}"
+
+
+def render(command: str, prompt: str, scenario: Dict[str, Any], rng: random.Random) -> str:
+    """Complete CLI output in the scenario's format, about `size` bytes."""
+    text = answer(command, prompt, scenario, rng)
+    size, seed = scenario["size"], rng.randrange(1 << 30)
+    if scenario["format"] == "kimi":
+        return transcripts.kimi_transcript(size, seed, text=text)
+    if scenario["format"] == "claude":
+        return transcripts.claude_stream_json(size, seed, result=text)
+    return transcripts.claude_text(size, seed, text=text)
+
+
+def garbage(size: int, rng: random.Random) -> str:
+    """Output no parser should trust: broken events, broken JSON, control bytes."""
+    pieces = ["TextPart(type='text', text='unterminated", '{"type": "assistant", "message": {"con',
+              "\x1b[31m\x00�", "]]]))}", "TextPart(", '"\\', "# Spec"]
+    out, total = [], 0
+    while total < size:
+        piece = rng.choice(pieces) + "".join(chr(rng.randrange(32, 0x2FF)) for _ in range(rng.randrange(40)))
+        out.append(piece)
+        total += len(piece)
+    return "\n".join(out) + "\n"
+
+
+def apply_edits(edits: List[Dict[str, Any]], root: Path) -> List[Path]:
+    """Write, append to or delete files under `root`; returns the paths touched."""
+    touched = []
+    for edit in edits:
+        path = root / edit["path"]
+        if edit.get("delete"):
+            path.unlink(missing_ok=True)
+        elif "append" in edit:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a") as f:
+                f.write(edit["append"])
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(edit.get("content", ""))
+        touched.append(path)
+    return touched
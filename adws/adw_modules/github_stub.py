@@ -0,0 +1,247 @@
+"""In-process stand-in for the GitHub REST API, for offline tests and benchmarks."""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def _timestamp() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+class GitHubStub:
+    """Serves issues, comments and pull requests for one repository from memory.
+
+    Supports ETag/If-None-Match, `Link` pagination, the aliased `issue(number:)`
+    GraphQL queries built by `github.build_issues_query`, and `fail_next()` queues canned error
+    responses (e.g. rate limits) ahead of the real ones. Every request is
+    recorded in `requests` as `(method, path, headers)`.
+
+        with GitHubStub() as stub:
+            stub.add_issue(1, "Add login")
+            os.environ["GITHUB_API_URL"] = stub.url
+    """
+
+    def __init__(self, owner: str = "acme", repo: str = "app"):
+        self.owner = owner
+        self.repo = repo
+        self.issues: Dict[int, dict] = {}
+        self.comments: Dict[int, List[dict]] = {}
+        self.pulls: List[dict] = []
+        self.requests: List[tuple] = []
+        self.failures: deque = deque()
+        self.lock = threading.Lock()
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    # -- data ---------------------------------------------------------------
+
+    @property
+    def repo_url(self) -> str:
+        return f"https://github.com/{self.owner}/{self.repo}"
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_issue(self, number: int, title: str, body: str = "", labels: tuple = ()) -> dict:
+        now = _timestamp()
+        with self.lock:
+            self.issues[number] = {
+                "number": number,
+                "title": title,
+                "body": body,
+                "state": "open",
+                "user": {"login": "octocat"},
+                "labels": [{"name": name, "color": "ededed"} for name in labels],
+                "created_at": now,
+                "updated_at": now,
+                "html_url": f"{self.repo_url}/issues/{number}",
+            }
+            self.comments.setdefault(number, [])
+            return self.issues[number]
+
+    def add_comment(self, number: int, body: str, login: str = "octocat") -> dict:
+        with self.lock:
+            comments = self.comments.setdefault(number, [])
+            comment = {
+                "id": number * 100000 + len(comments) + 1,
+                "body": body,
+                "user": {"login": login},
+                "created_at": _timestamp(),
+            }
+            comments.append(comment)
+            return comment
+
+    def fail_next(self, status: int, headers: Optional[dict] = None, body: str = "", count: int = 1) -> None:
+        """Answer the next `count` requests with `status` instead of real data."""
+        with self.lock:
+            for _ in range(count):
+                self.failures.append((status, headers or {}, body))
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def start(self) -> "GitHubStub":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._handle(self, "GET")
+
+            def do_POST(self):
+                stub._handle(self, "POST")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self) -> "GitHubStub":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # -- request handling ---------------------------------------------------
+
+    def _send(self, handler, status: int, payload=None, headers: Optional[dict] = None) -> None:
+        body = b"" if payload is None else (
+            payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+        )
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.send_header("X-RateLimit-Remaining", "4999")
+        for name, value in (headers or {}).items():
+            handler.send_header(name, str(value))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _send_cacheable(self, handler, payload, headers: Optional[dict] = None) -> None:
+        etag = '"' + hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest() + '"'
+        headers = dict(headers or {}, ETag=etag)
+        if handler.headers.get("If-None-Match") == etag:
+            self._send(handler, 304, None, headers)
+        else:
+            self._send(handler, 200, payload, headers)
+
+    def _send_page(self, handler, path: str, items: list, query: dict) -> None:
+        """Send one page of `items` with GitHub-style `Link` pagination."""
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        last = max(1, -(-len(items) // per_page))
+        base = f"{self.url}/repos/{self.owner}/{self.repo}{path}?per_page={per_page}&page="
+        links = []
+        if page < last:
+            links += [f'<{base}{page + 1}>; rel="next"', f'<{base}{last}>; rel="last"']
+        if page > 1:
+            links += [f'<{base}1>; rel="first"', f'<{base}{page - 1}>; rel="prev"']
+        headers = {"Link": ", ".join(links)} if links else {}
+        self._send_cacheable(handler, items[(page - 1) * per_page:page * per_page], headers)
+
+    def _handle(self, handler, method: str) -> None:
+        parsed = urlparse(handler.path)
+        length = int(handler.headers.get("Content-Length") or 0)
+        data = json.loads(handler.rfile.read(length) or b"null") if length else None
+        with self.lock:
+            self.requests.append((method, parsed.path, dict(handler.headers)))
+            failure = self.failures.popleft() if self.failures else None
+        if failure:
+            status, headers, body = failure
+            self._send(handler, status, body or {"message": "stubbed failure"}, headers)
+            return
+
+        if parsed.path == "/graphql" and method == "POST":
+            self._send(handler, 200, self._graphql(data or {}))
+            return
+
+        prefix = f"/repos/{self.owner}/{self.repo}"
+        if not parsed.path.startswith(prefix):
+            self._send(handler, 404, {"message": "Not Found"})
+            return
+        parts = parsed.path[len(prefix):].strip("/").split("/")
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        self._route(handler, method, parts, query, data)
+
+    def _route(self, handler, method: str, parts: List[str], query: dict, data) -> None:
+        if parts == ["pulls"] and method == "POST":
+            with self.lock:
+                number = 1000 + len(self.pulls) + 1
+                pull = dict(data or {}, number=number, html_url=f"{self.repo_url}/pull/{number}")
+                self.pulls.append(pull)
+            self._send(handler, 201, pull)
+            return
+
+        if len(parts) >= 2 and parts[0] == "issues" and parts[1].isdigit():
+            number = int(parts[1])
+            if number not in self.issues:
+                self._send(handler, 404, {"message": "Not Found"})
+            elif len(parts) == 2 and method == "GET":
+                issue = dict(self.issues[number], comments=len(self.comments.get(number, [])))
+                self._send_cacheable(handler, issue)
+            elif parts[2:] == ["comments"] and method == "POST":
+                self._send(handler, 201, self.add_comment(number, (data or {}).get("body", "")))
+            elif parts[2:] == ["comments"] and method == "GET":
+                self._send_page(handler, f"/issues/{number}/comments", self.comments.get(number, []), query)
+            else:
+                self._send(handler, 404, {"message": "Not Found"})
+            return
+
+        self._send(handler, 404, {"message": "Not Found"})
+
+    def _graphql(self, request: dict) -> dict:
+        """Answer an aliased issue query with `IssueFields` nodes."""
+        query = request.get("query", "")
+        variables = request.get("variables") or {}
+        if (variables.get("owner"), variables.get("name")) != (self.owner, self.repo):
+            return {"data": {"repository": None}, "errors": [{"type": "NOT_FOUND"}]}
+
+        def first(connection: str) -> int:
+            match = re.search(connection + r"\(first: (\d+)\)", query)
+            return int(match.group(1)) if match else 0
+
+        labels, comments = first("labels"), first("comments")
+        repository, errors = {}, []
+        with self.lock:
+            for alias, number in re.findall(r"(\w+): issue\(number: (\d+)\)", query):
+                issue = self.issues.get(int(number))
+                if not issue:
+                    repository[alias] = None
+                    errors.append({"type": "NOT_FOUND", "path": ["repository", alias]})
+                    continue
+                repository[alias] = {
+                    "number": issue["number"],
+                    "title": issue["title"],
+                    "body": issue["body"],
+                    "state": issue["state"].upper(),
+                    "url": issue["html_url"],
+                    "createdAt": issue["created_at"],
+                    "updatedAt": issue["updated_at"],
+                    "author": issue["user"],
+                    "labels": {"nodes": issue["labels"][:labels]},
+                    "comments": {"nodes": [
+                        {"body": c["body"], "createdAt": c["created_at"], "author": c["user"]}
+                        for c in self.comments.get(int(number), [])[:comments]
+                    ]},
+                }
+        response = {"data": {"repository": repository}}
+        if errors:
+            response["errors"] = errors
+        return response
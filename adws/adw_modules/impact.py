@@ -0,0 +1,157 @@
+"""Change-aware test selection for the Next.js app."""
+
+import re
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Set
+
+
+SOURCE_DIRS = ("app", "lib", "tests")
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs")
+TEST_FILE = re.compile(r"\.(test|spec)\.[cm]?[jt]sx?$")
+
+# Changes to these touch every test, so the whole suite runs.
+FULL_SUITE_FILES = {
+    "package.json",
+    "pnpm-lock.yaml",
+    "prisma/schema.prisma",
+    "tsconfig.json",
+    "tests/setup.ts",
+}
+FULL_SUITE_PATTERN = re.compile(r"^(?:[^/]+\.config\.[cm]?[jt]s|\.eslintrc[^/]*|\.env[^/]*)$")
+
+IMPORT_PATTERN = re.compile(
+    r"""\bfrom\s+['"]([^'"]+)['"]"""
+    r"""|\bimport\s*\(?\s*['"]([^'"]+)['"]"""
+    r"""|\b(?:require|vi\.mock|jest\.mock)\(\s*['"]([^'"]+)['"]"""
+)
+
+
+@dataclass
+class Selection:
+    """Which tests and lint targets a change set needs."""
+    full: bool
+    reason: str
+    tests: List[str] = field(default_factory=list)
+    lint_files: List[str] = field(default_factory=list)
+
+
+def _git_lines(args: list, cwd: Optional[str]) -> Optional[List[str]]:
+    result = subprocess.run(["git"] + args, cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+
+def changed_files(base: str = "origin/main", cwd: Optional[str] = None) -> Optional[List[str]]:
+    """Files changed since the merge base with `base`, including uncommitted work.
+
+    Returns None when git cannot answer (missing base, not a repo).
+    """
+    merge_base = _git_lines(["merge-base", base, "HEAD"], cwd)
+    if not merge_base:
+        return None
+    diffed = _git_lines(["diff", "--name-only", merge_base[0]], cwd)
+    untracked = _git_lines(["ls-files", "--others", "--exclude-standard"], cwd)
+    if diffed is None or untracked is None:
+        return None
+    return sorted(set(diffed) | set(untracked))
+
+
+def needs_full_suite(path: str) -> bool:
+    """Whether a changed path invalidates test selection."""
+    return path in FULL_SUITE_FILES or bool(FULL_SUITE_PATTERN.match(path))
+
+
+def resolve_import(spec: str, importer: PurePosixPath, files: Set[str]) -> Optional[str]:
+    """The file in `files` an `@/` or relative import of `importer` points at."""
+    if spec.startswith("@/"):
+        base = PurePosixPath(spec[2:])
+    elif spec.startswith("."):
+        base = importer.parent / spec
+    else:
+        return None
+
+    # Collapse "..", which PurePosixPath keeps verbatim
+    parts: List[str] = []
+    for part in base.parts:
+        if part == "..":
+            if parts:
+                parts.pop()
+        elif part != ".":
+            parts.append(part)
+    stem = "/".join(parts)
+
+    candidates = [stem] + [stem + ext for ext in SOURCE_EXTENSIONS]
+    candidates += [f"{stem}/index{ext}" for ext in SOURCE_EXTENSIONS]
+    for candidate in candidates:
+        if candidate in files:
+            return candidate
+    return None
+
+
+def build_reverse_graph(root: str = ".") -> Dict[str, Set[str]]:
+    """Map each source file to the files that import it."""
+    root_path = Path(root)
+    files: Set[str] = set()
+    for directory in SOURCE_DIRS:
+        for path in (root_path / directory).rglob("*"):
+            if path.suffix in SOURCE_EXTENSIONS and "node_modules" not in path.parts:
+                files.add(path.relative_to(root_path).as_posix())
+
+    importers: Dict[str, Set[str]] = {}
+    for rel in files:
+        try:
+            text = (root_path / rel).read_text(errors="ignore")
+        except OSError:
+            continue
+        importer = PurePosixPath(rel)
+        for match in IMPORT_PATTERN.finditer(text):
+            spec = next(group for group in match.groups() if group)
+            target = resolve_import(spec, importer, files)
+            if target and target != rel:
+                importers.setdefault(target, set()).add(rel)
+    return importers
+
+
+def affected_tests(changed: List[str], root: str = ".") -> List[str]:
+    """Test files that are, or transitively import, one of `changed`."""
+    importers = build_reverse_graph(root)
+    seen: Set[str] = set()
+    queue = [path for path in changed]
+    while queue:
+        path = queue.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        queue.extend(importers.get(path, ()))
+    return sorted(
+        path for path in seen
+        if path.startswith("tests/") and TEST_FILE.search(path) and (Path(root) / path).exists()
+    )
+
+
+def select_tests(base: str = "origin/main", root: str = ".") -> Selection:
+    """Pick the tests and lint targets for the current change set."""
+    changed = changed_files(base, cwd=root)
+    if changed is None:
+        return Selection(full=True, reason=f"could not diff against {base}")
+
+    triggers = [path for path in changed if needs_full_suite(path)]
+    if triggers:
+        return Selection(full=True, reason=f"{triggers[0]} changed")
+
+    lint_files = [
+        path for path in changed
+        if path.endswith(SOURCE_EXTENSIONS)
+        and path.split("/", 1)[0] in SOURCE_DIRS
+        and (Path(root) / path).exists()
+    ]
+    tests = affected_tests(changed, root)
+    return Selection(
+        full=False,
+        reason=f"{len(changed)} changed files",
+        tests=tests,
+        lint_files=lint_files,
+    )
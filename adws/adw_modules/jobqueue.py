@@ -0,0 +1,283 @@
+"""Durable SQLite job queue whose units of work are SDLC phases."""
+
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .utils import generate_adw_id
+
+
+SDLC_PHASES = ("plan", "build", "test", "review", "pr")
+# Phases whose failure does not stop the job (adw_sdlc.py only warns on review)
+NONBLOCKING_PHASES = ("review",)
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    issue_number INTEGER NOT NULL,
+    adw_id TEXT NOT NULL UNIQUE,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    host TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS phases (
+    job_id INTEGER NOT NULL REFERENCES jobs(id),
+    position INTEGER NOT NULL,
+    phase TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    not_before REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    PRIMARY KEY (job_id, position)
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs(status, priority DESC, id);
+CREATE INDEX IF NOT EXISTS phases_by_status ON phases(status, lease_expires);
+"""
+
+
+def get_queue_path() -> Path:
+    """Queue database (`ADW_QUEUE_DB`, default agents/.queue.db)."""
+    return Path(os.getenv("ADW_QUEUE_DB") or Path("agents") / ".queue.db")
+
+
+@dataclass
+class Lease:
+    """A claimed phase; valid while `expires` is in the future."""
+    job_id: int
+    position: int
+    phase: str
+    issue_number: int
+    adw_id: str
+    worker: str
+    expires: float
+    attempt: int
+
+
+class JobQueue:
+    """Jobs of SDLC phases, claimed one phase at a time under a lease.
+
+    A job's phases run in order. Workers claim the next pending phase of the
+    highest-priority job, holding a lease they extend with `heartbeat()`;
+    a lease that is not renewed expires and the phase is requeued, so a
+    crashed worker's phase is picked up by another worker process. Every
+    operation uses its own connection, so one queue object can be shared
+    between threads and the database between processes (WAL mode,
+    `BEGIN IMMEDIATE` for claims). The queue is single-host: WAL does not
+    work over a network filesystem, so all workers share the machine, and
+    a job's worktree, with the database. `host` only records where a job
+    last ran, for `adw_queue.py list`.
+    """
+
+    def __init__(self, path: Optional[Path] = None, retry_delay: float = RETRY_DELAY_SECONDS):
+        self.path = Path(path or get_queue_path())
+        self.retry_delay = retry_delay
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA busy_timeout=30000")
+        db.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    # -- producers ----------------------------------------------------------
+
+    def enqueue(
+        self,
+        issue_number: int,
+        phases: tuple = SDLC_PHASES,
+        priority: int = 0,
+        adw_id: Optional[str] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> int:
+        """Add a job running `phases` for an issue; returns its id."""
+        now = time.time()
+        with self._transaction() as db:
+            job_id = db.execute(
+                "INSERT INTO jobs (issue_number, adw_id, priority, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (issue_number, adw_id or generate_adw_id(), priority, now, now),
+            ).lastrowid
+            db.executemany(
+                "INSERT INTO phases (job_id, position, phase, max_attempts) VALUES (?, ?, ?, ?)",
+                [(job_id, position, phase, max_attempts) for position, phase in enumerate(phases)],
+            )
+        return job_id
+
+    # -- workers ------------------------------------------------------------
+
+    def _requeue_expired(self, db: sqlite3.Connection, now: float) -> int:
+        expired = db.execute(
+            "SELECT job_id, position, attempts, max_attempts FROM phases "
+            "WHERE status = 'running' AND lease_expires < ?", (now,)
+        ).fetchall()
+        for row in expired:
+            if row["attempts"] >= row["max_attempts"]:
+                self._fail(db, row["job_id"], row["position"], "lease expired", now)
+            else:
+                db.execute(
+                    "UPDATE phases SET status = 'pending', lease_owner = NULL, lease_expires = NULL, "
+                    "error = 'lease expired' WHERE job_id = ? AND position = ?",
+                    (row["job_id"], row["position"]),
+                )
+        return len(expired)
+
+    def requeue_expired(self) -> int:
+        """Return phases with lapsed leases to the queue; returns how many."""
+        with self._transaction() as db:
+            return self._requeue_expired(db, time.time())
+
+    def claim(self, worker: str, host: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Lease]:
+        """Lease the next runnable phase, or None if there is none."""
+        now = time.time()
+        with self._transaction() as db:
+            self._requeue_expired(db, now)
+            row = db.execute(
+                """
+                SELECT p.job_id, p.position, p.phase, p.attempts, j.issue_number, j.adw_id
+                FROM jobs j JOIN phases p ON p.job_id = j.id
+                WHERE j.status IN ('queued', 'running')
+                  AND p.status = 'pending' AND p.not_before <= ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM phases q
+                      WHERE q.job_id = p.job_id AND q.position < p.position AND q.status != 'done'
+                  )
+                ORDER BY j.priority DESC, j.id
+                LIMIT 1
+                """,
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            expires = now + lease_seconds
+            db.execute(
+                "UPDATE phases SET status = 'running', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, started_at = ?, error = NULL WHERE job_id = ? AND position = ?",
+                (worker, expires, now, row["job_id"], row["position"]),
+            )
+            db.execute(
+                "UPDATE jobs SET status = 'running', host = ?, updated_at = ? WHERE id = ?",
+                (host, now, row["job_id"]),
+            )
+        return Lease(row["job_id"], row["position"], row["phase"], row["issue_number"],
+                     row["adw_id"], worker, expires, row["attempts"] + 1)
+
+    def heartbeat(self, lease: Lease, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend a lease; False if it was lost (expired and requeued)."""
+        expires = time.time() + lease_seconds
+        with self._transaction() as db:
+            updated = db.execute(
+                "UPDATE phases SET lease_expires = ? WHERE job_id = ? AND position = ? "
+                "AND status = 'running' AND lease_owner = ? AND lease_expires >= ?",
+                (expires, lease.job_id, lease.position, lease.worker, time.time()),
+            ).rowcount
+        if updated:
+            lease.expires = expires
+        return bool(updated)
+
+    def _fail(self, db: sqlite3.Connection, job_id: int, position: int, error: str, now: float) -> None:
+        db.execute(
+            "UPDATE phases SET status = 'failed', lease_owner = NULL, lease_expires = NULL, "
+            "finished_at = ?, error = ? WHERE job_id = ? AND position = ?",
+            (now, error, job_id, position),
+        )
+        db.execute("UPDATE jobs SET status = 'failed', updated_at = ? WHERE id = ?", (now, job_id))
+
+    def complete(self, lease: Lease, success: bool, error: Optional[str] = None) -> str:
+        """Record a phase outcome; returns the job status afterwards.
+
+        A failed phase is retried after a delay until it runs out of
+        attempts, then fails the job, except for non-blocking phases.
+        Outcomes for a lease that was lost are ignored.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT p.attempts, p.max_attempts, p.lease_owner, p.status, j.status AS job_status "
+                "FROM phases p JOIN jobs j ON j.id = p.job_id WHERE p.job_id = ? AND p.position = ?",
+                (lease.job_id, lease.position),
+            ).fetchone()
+            if row["status"] != "running" or row["lease_owner"] != lease.worker:
+                return row["job_status"]
+
+            if success or lease.phase in NONBLOCKING_PHASES:
+                db.execute(
+                    "UPDATE phases SET status = 'done', lease_owner = NULL, lease_expires = NULL, "
+                    "finished_at = ?, error = ? WHERE job_id = ? AND position = ?",
+                    (now, None if success else error, lease.job_id, lease.position),
+                )
+                remaining = db.execute(
+                    "SELECT COUNT(*) FROM phases WHERE job_id = ? AND status != 'done'", (lease.job_id,)
+                ).fetchone()[0]
+                status = "running" if remaining else "done"
+            elif row["attempts"] < row["max_attempts"]:
+                db.execute(
+                    "UPDATE phases SET status = 'pending', lease_owner = NULL, lease_expires = NULL, "
+                    "not_before = ?, error = ? WHERE job_id = ? AND position = ?",
+                    (now + self.retry_delay * row["attempts"], error, lease.job_id, lease.position),
+                )
+                status = "running"
+            else:
+                self._fail(db, lease.job_id, lease.position, error or "failed", now)
+                return "failed"
+            db.execute("UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?", (status, now, lease.job_id))
+            return status
+
+    # -- inspection ---------------------------------------------------------
+
+    def reset(self, job_id: int) -> None:
+        """Rerun a job's unfinished phases, with fresh attempts."""
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE phases SET status = 'pending', attempts = 0, not_before = 0, lease_owner = NULL, "
+                "lease_expires = NULL, error = NULL WHERE job_id = ? AND status != 'done'", (job_id,)
+            )
+            db.execute("UPDATE jobs SET status = 'queued', host = NULL, updated_at = ? WHERE id = ?",
+                       (now, job_id))
+
+    def jobs(self, status: Optional[str] = None) -> List[dict]:
+        """Jobs with their phases, highest priority first."""
+        with self._connect() as db:
+            query = "SELECT * FROM jobs" + (" WHERE status = ?" if status else "")
+            rows = db.execute(query + " ORDER BY priority DESC, id", (status,) if status else ()).fetchall()
+            jobs = []
+            for row in rows:
+                job = dict(row)
+                job["phases"] = [dict(phase) for phase in db.execute(
+                    "SELECT * FROM phases WHERE job_id = ? ORDER BY position", (row["id"],)
+                )]
+                jobs.append(job)
+            return jobs
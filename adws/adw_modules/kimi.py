@@ -0,0 +1,450 @@
+"""Incremental tokenizer for Kimi CLI `--print` output.
+
+Kimi prints each event as a Python repr on its own line, e.g.::
+
+    TextPart(type='text', text='# Spec 001: ...')
+    ToolCall(type='function', id='tool_1', function=FunctionBody(name='Shell', arguments='{...}'))
+    StatusUpdate(context_usage=0.12, token_usage=None)
+
+`KimiStream` turns that output into typed events in one forward pass and
+accepts it in arbitrary chunks. Only the event in progress is buffered, and
+events of kinds the caller did not ask for are scanned but never parsed.
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+KIMI_EVENT_KINDS = frozenset({
+    "TurnBegin", "TurnEnd", "StepBegin", "StepInterrupted", "CompactionBegin", "CompactionEnd",
+    "StatusUpdate", "TextPart", "ThinkPart", "ImageURLPart", "AudioURLPart",
+    "ToolCall", "ToolCallPart", "ToolResult", "SubagentEvent",
+    "ApprovalRequest", "ApprovalRequestResolved",
+})
+# Lines that are not events come through as PlainText
+PLAIN_TEXT = "PlainText"
+DEFAULT_MAX_EVENT_BYTES = 16 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+_START = re.compile(r"[ \t]*([A-Z]\w*)\(")
+_SPECIAL = re.compile(r"['\"()\[\]{}]")
+# Repr strings never contain raw newlines, so one marks a malformed event.
+# Strings are scanned by searching for the next quote, backslash or newline
+# rather than with a repeated regex group: each character is looked at once,
+# and memory stays flat on long or escape-heavy strings.
+_STRING_START = re.compile(r"""\s*([rbuRBU]{0,2})(['"])""")
+_STRING_STOPS = {quote: re.compile(f"[{quote}\\\\\n]") for quote in "'\""}
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<num>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)
+      | (?P<name>[A-Za-z_][\w.]*)
+      | (?P<punct>[()\[\]{},:=])
+      | (?P<other>\S)
+    )""", re.VERBOSE)
+_CONSTANTS = {"None": None, "True": True, "False": False}
+_CLOSERS = {"(": ")", "[": "]", "{": "}"}
+
+
+@dataclass
+class KimiEvent:
+    """One event; `fields` holds its parsed keyword arguments.
+
+    Nested objects become dicts with their class name under `_kind`.
+    """
+    kind: str
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+
+class TextPart(KimiEvent):
+    @property
+    def text(self) -> str:
+        return self.fields.get("text") or ""
+
+
+class ThinkPart(KimiEvent):
+    @property
+    def think(self) -> str:
+        return self.fields.get("think") or ""
+
+
+class ToolCall(KimiEvent):
+    @property
+    def id(self) -> Optional[str]:
+        return self.fields.get("id")
+
+    @property
+    def name(self) -> Optional[str]:
+        function = self.fields.get("function")
+        return function.get("name") if isinstance(function, dict) else None
+
+    @property
+    def arguments(self) -> Optional[str]:
+        function = self.fields.get("function")
+        return function.get("arguments") if isinstance(function, dict) else None
+
+
+class ToolResult(KimiEvent):
+    @property
+    def tool_call_id(self) -> Optional[str]:
+        return self.fields.get("tool_call_id")
+
+    @property
+    def output(self) -> Any:
+        value = self.fields.get("return_value")
+        return value.get("output") if isinstance(value, dict) else value
+
+    @property
+    def is_error(self) -> bool:
+        value = self.fields.get("return_value")
+        return isinstance(value, dict) and (bool(value.get("is_error")) or value.get("_kind") == "ToolError")
+
+
+class StatusUpdate(KimiEvent):
+    @property
+    def context_usage(self) -> Optional[float]:
+        return self.fields.get("context_usage")
+
+    @property
+    def token_usage(self) -> Any:
+        return self.fields.get("token_usage")
+
+
+class PlainText(KimiEvent):
+    """A line of output that is not an event."""
+
+    @property
+    def text(self) -> str:
+        return self.fields.get("text") or ""
+
+
+EVENT_TYPES = {
+    "TextPart": TextPart,
+    "ThinkPart": ThinkPart,
+    "ToolCall": ToolCall,
+    "ToolResult": ToolResult,
+    "StatusUpdate": StatusUpdate,
+    PLAIN_TEXT: PlainText,
+}
+
+
+def make_event(kind: str, fields: Optional[Dict[str, Any]] = None) -> KimiEvent:
+    return EVENT_TYPES.get(kind, KimiEvent)(kind, fields or {})
+
+
+def _string_end(text: str, pos: int, quote: str) -> int:
+    """End of the string body starting at `pos`: its closing quote, or the
+    newline, dangling backslash or end of text that cuts it short."""
+    stop = _STRING_STOPS[quote]
+    while True:
+        match = stop.search(text, pos)
+        if not match:
+            return len(text)
+        end = match.start()
+        if match.group() != "\\":
+            return end
+        # A backslash before the newline or end of text is where the string stops
+        if end + 1 >= len(text) or text[end + 1] == "\n":
+            return end
+        pos = end + 2
+
+
+def _tokenize(text: str) -> List[tuple]:
+    tokens, pos = [], 0
+    while True:
+        match = _STRING_START.match(text, pos)
+        if match:
+            end = _string_end(text, match.end(), match.group(2))
+            if end < len(text) and text[end] == match.group(2):
+                tokens.append(("str", text[match.start(1):end + 1]))
+                pos = end + 1
+                continue
+        match = _TOKEN.match(text, pos)
+        if not match:
+            return tokens
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        pos = match.end()
+
+
+class _Parser:
+    """Recursive-descent parser for one complete event repr."""
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.index = 0
+
+    def peek(self, offset: int = 0) -> tuple:
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self) -> tuple:
+        token = self.peek()
+        self.index += 1
+        return token
+
+    def expect(self, value: str) -> None:
+        if self.take()[1] != value:
+            raise ValueError(f"expected {value!r}")
+
+    def value(self) -> Any:
+        kind, text = self.peek()
+        if kind == "str":
+            self.index += 1
+            if text[0] in "'\"" and "\\" not in text:
+                return text[1:-1]  # nothing to unescape; literal_eval is costly per string
+            return ast.literal_eval(text)
+        if kind == "num":
+            self.index += 1
+            return float(text) if any(c in text for c in ".eE") else int(text)
+        if kind == "name":
+            self.index += 1
+            if self.peek()[1] == "(":
+                return self.call(text)
+            return _CONSTANTS.get(text, text)
+        if text in _CLOSERS:
+            self.index += 1
+            return self.collection(text)
+        return self.skip()
+
+    def call(self, name: str) -> Dict[str, Any]:
+        self.expect("(")
+        result: Dict[str, Any] = {"_kind": name}
+        args = []
+        while self.peek()[1] != ")":
+            if self.peek()[0] is None:
+                raise ValueError("unterminated call")
+            start = self.index
+            if self.peek()[0] == "name" and self.peek(1)[1] == "=":
+                key = self.take()[1]
+                self.index += 1
+                result[key] = self.value()
+            else:
+                args.append(self.value())
+            if self.peek()[1] == ",":
+                self.index += 1
+            elif self.index == start:
+                self.index += 1  # a stray closer such as `]`
+        self.index += 1
+        if args:
+            result["_args"] = args
+        return result
+
+    def collection(self, opener: str) -> Any:
+        closer = _CLOSERS[opener]
+        items, pairs = [], {}
+        while self.peek()[1] != closer:
+            if self.peek()[0] is None:
+                raise ValueError("unterminated collection")
+            start = self.index
+            item = self.value()
+            if opener == "{" and self.peek()[1] == ":":
+                self.index += 1
+                pairs[item if isinstance(item, (str, int, float, bool, type(None))) else repr(item)] = self.value()
+            else:
+                items.append(item)
+            if self.peek()[1] == ",":
+                self.index += 1
+            elif self.index == start:
+                self.index += 1  # a stray closer such as `)` in a list
+        self.index += 1
+        return pairs if opener == "{" and (pairs or not items) else items
+
+    def skip(self) -> str:
+        """Raw text of a value this parser does not understand (e.g. `<Enum.X: 1>`)."""
+        parts, depth = [], 0
+        while True:
+            kind, text = self.peek()
+            if kind is None or (depth == 0 and text in (",", ")", "]", "}")):
+                return " ".join(parts)
+            if text in _CLOSERS:
+                depth += 1
+            elif text in (")", "]", "}"):
+                depth -= 1
+            parts.append(text)
+            self.index += 1
+
+
+def parse_event(text: str) -> KimiEvent:
+    """Parse one complete event repr such as `TextPart(type='text', text='hi')`."""
+    parser = _Parser(text)
+    kind, name = parser.take()
+    if kind != "name":
+        raise ValueError("event must start with its type name")
+    fields = parser.call(name)
+    fields.pop("_kind")
+    return make_event(name, fields)
+
+
+class KimiStream:
+    """Turns chunks of Kimi output into events.
+
+    Args:
+        kinds: Event kinds to emit (e.g. `{"TextPart"}`); None emits all.
+            Use `PLAIN_TEXT` for lines that are not events.
+        bare_others: Also emit events of other kinds, without parsing their
+            fields, for callers that only need to know they happened.
+        max_event_bytes: Events larger than this are given up on and passed
+            through as plain text, bounding memory on malformed output.
+    """
+
+    def __init__(
+        self,
+        kinds: Optional[Iterable[str]] = None,
+        bare_others: bool = False,
+        max_event_bytes: int = DEFAULT_MAX_EVENT_BYTES,
+    ):
+        self.kinds = None if kinds is None else frozenset(kinds)
+        self.bare_others = bare_others
+        self.max_event_bytes = max_event_bytes
+        self._pending: List[str] = []  # top-level text not yet ending in a newline
+        self._buf = ""  # unscanned text of the event in progress
+        self._kind: Optional[str] = None  # event in progress
+        self._parts: List[str] = []  # scanned text of the event in progress
+        self._keep = False
+        self._size = 0
+        self._closers: List[str] = []  # closers expected by the event in progress
+        self._open: Dict[str, int] = {}  # how many of each closer are expected
+        self._quote: Optional[str] = None
+
+    def wants(self, kind: str) -> bool:
+        return self.kinds is None or kind in self.kinds
+
+    def feed(self, chunk: str) -> List[KimiEvent]:
+        """Consume a chunk of output; returns the events it completed."""
+        if self._kind is None and "\n" not in chunk:
+            self._pending.append(chunk)
+            return []
+        if self._pending:
+            chunk = "".join(self._pending) + chunk
+            self._pending = []
+        return self._drain(self._buf + chunk if self._buf else chunk, final=False)
+
+    def finish(self) -> List[KimiEvent]:
+        """Flush the rest of the output; an unterminated event becomes plain text."""
+        text = self._buf + "".join(self._pending)
+        self._buf, self._pending = "", []
+        return self._drain(text, final=True)
+
+    def _drain(self, buf: str, final: bool) -> List[KimiEvent]:
+        events: List[KimiEvent] = []
+        pos = 0
+        while True:
+            if self._kind is None:
+                if pos >= len(buf):
+                    break
+                newline = buf.find("\n", pos)
+                if newline == -1 and not final:
+                    self._pending.append(buf[pos:])
+                    pos = len(buf)
+                    break
+                end = len(buf) if newline == -1 else newline
+                match = _START.match(buf, pos, end)
+                if match and match.group(1) in KIMI_EVENT_KINDS:
+                    self._begin(match.group(1))
+                    if self._keep:
+                        self._parts.append(buf[pos:match.end()])
+                    pos = match.end()
+                    continue
+                if self.wants(PLAIN_TEXT):
+                    events.append(PlainText(PLAIN_TEXT, {"text": buf[pos:end]}))
+                pos = end + 1
+                continue
+
+            scan, status = self._scan(buf, pos)
+            if self._keep:
+                self._parts.append(buf[pos:scan])
+            self._size += scan - pos
+            pos = scan
+            if status == "more":
+                if self._size <= self.max_event_bytes and not final:
+                    break
+                status = "broken"
+            if status == "done":
+                events.extend(self._complete())
+                # Drop the line break that ends the event
+                while pos < len(buf) and buf[pos] in " \t\r":
+                    pos += 1
+                if pos < len(buf) and buf[pos] == "\n":
+                    pos += 1
+            else:
+                events.extend(self._abandon())
+                if pos < len(buf) and buf[pos] == "\n":
+                    pos += 1
+        self._buf = buf[pos:] if self._kind is not None else ""
+        return events
+
+    def _begin(self, kind: str) -> None:
+        self._kind = kind
+        self._keep = self.wants(kind) or self.wants(PLAIN_TEXT)
+        self._parts = []
+        self._size = 0
+        self._closers = [")"]
+        self._open = {")": 1, "]": 0, "}": 0}
+        self._quote = None
+
+    def _scan(self, buf: str, pos: int) -> tuple:
+        """Advance through the event in progress; returns (position, status)."""
+        while True:
+            if self._quote:
+                end = _string_end(buf, pos, self._quote)
+                if end >= len(buf) or (buf[end] == "\\" and end + 1 >= len(buf)):
+                    return end, "more"
+                if buf[end] == self._quote:
+                    self._quote = None
+                    pos = end + 1
+                    continue
+                return end, "broken"
+            match = _SPECIAL.search(buf, pos)
+            if not match:
+                return len(buf), "more"
+            pos = match.end()
+            char = match.group()
+            if char in "'\"":
+                self._quote = char
+            elif char in _CLOSERS:
+                closer = _CLOSERS[char]
+                self._closers.append(closer)
+                self._open[closer] += 1
+            elif self._open[char]:
+                # Unwind to the matching opener; a closer nothing expects is stray
+                while True:
+                    closer = self._closers.pop()
+                    self._open[closer] -= 1
+                    if closer == char:
+                        break
+                if not self._closers:
+                    return pos, "done"
+
+    def _complete(self) -> List[KimiEvent]:
+        kind, self._kind = self._kind, None
+        if not self.wants(kind):
+            self._parts = []
+            return [KimiEvent(kind)] if self.bare_others else []
+        text = "".join(self._parts)
+        self._parts = []
+        try:
+            return [parse_event(text)]
+        except (ValueError, SyntaxError, RecursionError):
+            return [make_event(kind)]
+
+    def _abandon(self) -> List[KimiEvent]:
+        """Pass a malformed or oversized event through as plain text lines."""
+        self._kind = None
+        text = "".join(self._parts)
+        self._parts = []
+        if not self.wants(PLAIN_TEXT):
+            return []
+        return [PlainText(PLAIN_TEXT, {"text": line}) for line in text.split("\n")]
+
+
+def iter_events(
+    output: str,
+    kinds: Optional[Iterable[str]] = None,
+    bare_others: bool = False,
+) -> Iterator[KimiEvent]:
+    """Events in complete Kimi output, parsed a chunk at a time."""
+    stream = KimiStream(kinds, bare_others)
+    for start in range(0, len(output), CHUNK_SIZE):
+        yield from stream.feed(output[start:start + CHUNK_SIZE])
+    yield from stream.finish()
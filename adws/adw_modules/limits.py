@@ -0,0 +1,61 @@
+"""Machine-wide concurrency limits shared by ADW processes."""
+
+import fcntl
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .cache import get_cache_dir
+
+
+# Slot kind -> environment variable holding its limit
+LIMIT_VARS = {
+    "provider": "ADW_MAX_PROVIDER_CALLS",
+    "check": "ADW_MAX_CHECK_JOBS",
+}
+POLL_SECONDS = 0.1
+
+
+def get_limit(kind: str) -> Optional[int]:
+    """Configured slot count for `kind`, or None when unlimited."""
+    value = os.getenv(LIMIT_VARS[kind], "")
+    return int(value) if value and int(value) > 0 else None
+
+
+def get_lock_dir() -> Path:
+    """Directory of slot lock files (`ADW_LOCK_DIR`, default under the cache dir)."""
+    return Path(os.getenv("ADW_LOCK_DIR") or get_cache_dir() / "locks")
+
+
+@contextmanager
+def slot(kind: str) -> Iterator[None]:
+    """Hold one of the `kind` slots for the duration of the block.
+
+    Slots are `flock`ed files, so the limit holds across every process on the
+    machine that shares the lock directory, and a crashed holder releases its
+    slot automatically. Without a configured limit this is a no-op.
+    """
+    limit = get_limit(kind)
+    if not limit:
+        yield
+        return
+
+    lock_dir = get_lock_dir()
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    while True:
+        for index in range(limit):
+            fd = os.open(lock_dir / f"{kind}-{index}.lock", os.O_CREAT | os.O_RDWR, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+            return
+        time.sleep(POLL_SECONDS)
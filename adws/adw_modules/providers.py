@@ -1,14 +1,52 @@
-"""AI Provider implementations for Claude and Kimi."""
+"""AI Provider implementations for Claude, Kimi and a local fake."""
 
 import os
-import subprocess
+import sys
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 from abc import ABC, abstractmethod
 
+from .claude import ClaudeStream
+from .context import context_digest
+from .data_types import ProviderCall
+from .executor import stream_command
+from .fake import FORMATS as FAKE_FORMATS, load_scenario
+from .kimi import iter_events
+
+
+CLAUDE_OUTPUT_FORMATS = ("stream-json", "text")
+
+
+def get_claude_output_format() -> str:
+    """Claude CLI output format (`ADW_CLAUDE_OUTPUT`, default stream-json)."""
+    output_format = os.getenv("ADW_CLAUDE_OUTPUT", "stream-json")
+    return output_format if output_format in CLAUDE_OUTPUT_FORMATS else "stream-json"
+
+
+class LineTimer:
+    """Passes output lines on while noting when the first one arrived."""
+    
+    def __init__(self, on_line: Optional[Callable[[str], bool]] = None):
+        self.on_line = on_line
+        self.started = time.monotonic()
+        self.first_output: Optional[float] = None
+    
+    def __call__(self, line: str) -> bool:
+        if self.first_output is None:
+            self.first_output = time.monotonic()
+        return bool(self.on_line and self.on_line(line))
+
 
 class AIProvider(ABC):
-    """Abstract base class for AI providers."""
+    """Abstract base class for AI providers.
+    
+    After each `run_command`, `last_call` holds its timing and usage.
+    """
+    
+    name = ""
+    last_call: Optional[ProviderCall] = None
     
     @abstractmethod
     def run_command(
@@ -16,7 +54,8 @@ class AIProvider(ABC):
         command: str,
         args: list,
         working_dir: Optional[str] = None,
-        output_file: Optional[str] = None
+        output_file: Optional[str] = None,
+        on_line: Optional[Callable[[str], bool]] = None
     ) -> Tuple[bool, str]:
         """Run an AI command.
         
@@ -25,6 +64,10 @@ class AIProvider(ABC):
             args: Arguments for the command
             working_dir: Working directory
             output_file: File to save output
+            on_line: Called with each raw output line; returning True
+                stops the CLI early and counts as success. The output is
+                then what arrived before the stop, and `last_call` is
+                marked `truncated`
             
         Returns:
             (success, output)
@@ -35,11 +78,33 @@ class AIProvider(ABC):
     def get_binary_path(self) -> str:
         """Get the path to the AI CLI binary."""
         pass
+    
+    def _record_call(
+        self,
+        command: str,
+        started_at: datetime,
+        started: float,
+        first_output: Optional[float],
+        success: bool,
+        **usage
+    ) -> None:
+        self.last_call = ProviderCall(
+            provider=self.name,
+            command=command,
+            started_at=started_at,
+            success=success,
+            latency_seconds=round(time.monotonic() - started, 3),
+            first_output_seconds=None if first_output is None else round(first_output - started, 3),
+            **usage
+        )
 
 
 class ClaudeProvider(AIProvider):
     """Claude Code CLI provider."""
     
+    name = "claude"
+    label = "Claude"
+    
     def get_binary_path(self) -> str:
         return os.getenv("CLAUDE_CODE_PATH", "claude")
     
@@ -48,7 +113,8 @@ class ClaudeProvider(AIProvider):
         command: str,
         args: list,
         working_dir: Optional[str] = None,
-        output_file: Optional[str] = None
+        output_file: Optional[str] = None,
+        on_line: Optional[Callable[[str], bool]] = None
     ) -> Tuple[bool, str]:
         """Run a Claude Code slash command."""
         claude_path = self.get_binary_path()
@@ -65,79 +131,61 @@ class ClaudeProvider(AIProvider):
         else:
             input_text = "\n".join(args)
         
-        cmd_parts = [claude_path, "-p", "--dangerously-skip-permissions", command]
+        cmd_parts = [claude_path, "-p", "--dangerously-skip-permissions"]
+        if get_claude_output_format() == "stream-json":
+            # JSON events carry turns, token usage and timing
+            cmd_parts += ["--output-format", "stream-json", "--verbose"]
+        cmd_parts.append(command)
         
-        return self._execute(cmd_parts, input_text, working_dir, output_file)
+        return self._execute(command, cmd_parts, input_text, working_dir, output_file, on_line)
     
     def _execute(
         self,
+        command: str,
         cmd_parts: list,
         input_text: str,
         working_dir: Optional[str],
-        output_file: Optional[str]
+        output_file: Optional[str],
+        on_line: Optional[Callable[[str], bool]] = None
     ) -> Tuple[bool, str]:
-        """Execute the command."""
-        is_ci = os.getenv("CI", "").lower() == "true"
+        """Execute the command, streaming output to `output_file`.
         
+        In stream-json mode the raw events go to `output_file`, while the
+        assistant's text is echoed, passed to `on_line` and returned.
+        """
+        started_at = datetime.now()
+        stream = ClaudeStream(on_line) if "stream-json" in cmd_parts else None
+        timer = LineTimer(stream.feed_line if stream else on_line)
+        success, output, stopped = False, "", False
         try:
-            if is_ci:
-                print(f"   [Running Claude command: {cmd_parts[3]}]")
-                process = subprocess.Popen(
-                    cmd_parts,
-                    cwd=working_dir,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    stdin=subprocess.PIPE
-                )
-                
-                if input_text:
-                    process.stdin.write(input_text)
-                    process.stdin.close()
-                
-                output_lines = []
-                for line in process.stdout:
-                    line = line.rstrip()
-                    output_lines.append(line)
-                    print(f"   {line}")
-                
-                process.wait(timeout=600)
-                output = "\n".join(output_lines)
-                
-                if output_file:
-                    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-                    with open(output_file, "w") as f:
-                        f.write(output)
-                
-                return process.returncode == 0, output
+            print(f"   [Running {self.label} command: {command}]")
+            result = stream_command(
+                cmd_parts, input_text, working_dir, output_file, timer,
+                echo_prefix=None if stream else "   ",
+            )
+            stopped = result.stopped
+            if result.timed_out:
+                output = f"Command timed out: {result.timed_out}"
             else:
-                result = subprocess.run(
-                    cmd_parts,
-                    cwd=working_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=300,
-                    input=input_text
-                )
-                
-                output = result.stdout + result.stderr
-                
-                if output_file:
-                    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-                    with open(output_file, "w") as f:
-                        f.write(output)
-                
-                return result.returncode == 0, output
-                
-        except subprocess.TimeoutExpired:
-            return False, "Command timed out"
+                success = (result.returncode == 0 or result.stopped) and not (stream and stream.is_error)
+                output = stream.text if stream else result.output
         except Exception as e:
-            return False, str(e)
+            output = str(e)
+        
+        if stream:
+            self._record_call(command, started_at, timer.started, stream.first_output, success,
+                              turns=stream.turns, truncated=stopped, **stream.usage())
+        else:
+            self._record_call(command, started_at, timer.started, timer.first_output, success,
+                              truncated=stopped)
+        return success, output
 
 
 class KimiProvider(AIProvider):
     """Kimi Code CLI provider."""
     
+    name = "kimi"
+    
     def get_binary_path(self) -> str:
         return os.getenv("KIMI_CODE_PATH", "kimi")
     
@@ -146,13 +194,14 @@ class KimiProvider(AIProvider):
         command: str,
         args: list,
         working_dir: Optional[str] = None,
-        output_file: Optional[str] = None
+        output_file: Optional[str] = None,
+        on_line: Optional[Callable[[str], bool]] = None
     ) -> Tuple[bool, str]:
         """Run a Kimi command by interpolating the prompt template."""
         kimi_path = self.get_binary_path()
         
         # Interpolate the command template with arguments
-        prompt = self._interpolate_command(command, args)
+        prompt = self._interpolate_command(command, args, working_dir)
         
         # Build command with appropriate flags
         # --print: non-interactive mode (auto-approves all actions like --yolo)
@@ -162,7 +211,7 @@ class KimiProvider(AIProvider):
         # For implementation commands, we could skip --thinking for speed
         # but keeping it ensures better code quality
         
-        success, output = self._execute(cmd_parts, working_dir, output_file)
+        success, output = self._execute(command, cmd_parts, working_dir, output_file, on_line)
         
         # Parse Kimi's output format to extract useful text
         if success:
@@ -177,18 +226,13 @@ class KimiProvider(AIProvider):
         TextPart(type='text', text='Actual content here')
         The text may contain analysis followed by the actual spec.
         """
-        import re
-        
-        # Extract the text from TextPart
-        # Pattern matches: TextPart( type='text', text='...content...' )
-        pattern = r"TextPart\(\s*type='text',\s*text='([\s\S]*?)'\s*\)"
-        matches = re.findall(pattern, output)
+        # Only the last TextPart is needed; other events are scanned, not parsed
+        last = None
+        for event in iter_events(output, kinds=("TextPart",)):
+            last = event
         
-        if matches:
-            # Get the last TextPart
-            text = matches[-1]
-            # Unescape escaped quotes and newlines
-            text = text.replace("\\'", "'").replace('\\n', '\n')
+        if last is not None:
+            text = last.text
             
             # The spec starts at '# Spec' - find and extract from there
             spec_start = text.find('# Spec')
@@ -204,8 +248,11 @@ class KimiProvider(AIProvider):
         
         return output
     
-    def _interpolate_command(self, command: str, args: list) -> str:
-        """Interpolate command template with arguments."""
+    def _interpolate_command(self, command: str, args: list, working_dir: Optional[str] = None) -> str:
+        """Interpolate command template with arguments.
+        
+        `/implement` inlines the repository context digest of `working_dir`.
+        """
         
         if command == "/classify_issue":
             # Simulate classify_issue command
@@ -241,13 +288,16 @@ Classification:"""
             except:
                 spec_content = f"[Could not read spec file: {spec_file}]"
             
+            digest = context_digest(working_dir)
+            context = f"\n## Repository Context\n{digest}\n" if digest else ""
+            
             return f"""You are an expert software developer. Implement the following specification.
 
 Task ID: {task_id}
 
 ## Specification
 {spec_content}
-
+{context}
 ## Instructions
 1. Read and understand the spec above
 2. Identify the scope of implementation
@@ -301,61 +351,62 @@ Fix the errors now."""
     
     def _execute(
         self,
+        command: str,
         cmd_parts: list,
         working_dir: Optional[str],
-        output_file: Optional[str]
+        output_file: Optional[str],
+        on_line: Optional[Callable[[str], bool]] = None
     ) -> Tuple[bool, str]:
-        """Execute the Kimi command."""
-        is_ci = os.getenv("CI", "").lower() == "true"
-        
+        """Execute the Kimi command, streaming output to `output_file`."""
+        started_at = datetime.now()
+        timer = LineTimer(on_line)
+        success, output, stopped = False, "", False
         try:
-            if is_ci:
-                print(f"   [Running Kimi command: {cmd_parts[0]}]")
-                process = subprocess.Popen(
-                    cmd_parts,
-                    cwd=working_dir,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True
-                )
-                
-                output_lines = []
-                for line in process.stdout:
-                    line = line.rstrip()
-                    output_lines.append(line)
-                    print(f"   {line}")
-                
-                process.wait(timeout=600)
-                output = "\n".join(output_lines)
-                
-                if output_file:
-                    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-                    with open(output_file, "w") as f:
-                        f.write(output)
-                
-                return process.returncode == 0, output
+            print(f"   [Running Kimi command: {cmd_parts[0]}]")
+            result = stream_command(cmd_parts, None, working_dir, output_file, timer)
+            stopped = result.stopped
+            if result.timed_out:
+                output = f"Command timed out: {result.timed_out}"
             else:
-                result = subprocess.run(
-                    cmd_parts,
-                    cwd=working_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=300
-                )
-                
-                output = result.stdout + result.stderr
-                
-                if output_file:
-                    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-                    with open(output_file, "w") as f:
-                        f.write(output)
-                
-                return result.returncode == 0, output
-                
-        except subprocess.TimeoutExpired:
-            return False, "Command timed out"
+                success, output = result.returncode == 0 or result.stopped, result.output
         except Exception as e:
-            return False, str(e)
+            output = str(e)
+        
+        self._record_call(command, started_at, timer.started, timer.first_output, success,
+                          truncated=stopped)
+        return success, output
+
+
+class FakeProvider(ClaudeProvider):
+    """Local stand-in CLI (`adw_fake_cli.py`) for offline and load testing.
+    
+    Output format, latency, file edits and faults come from the
+    `ADW_FAKE_SCENARIO` scenario (see `fake.py`). The CLI takes its prompt on
+    stdin like Claude's; `kimi` format output is parsed as Kimi's is.
+    """
+    
+    name = "fake"
+    label = "fake"
+    
+    def get_binary_path(self) -> str:
+        return os.getenv("ADW_FAKE_CLI_PATH", str(Path(__file__).parent.parent / "adw_fake_cli.py"))
+    
+    def run_command(
+        self,
+        command: str,
+        args: list,
+        working_dir: Optional[str] = None,
+        output_file: Optional[str] = None,
+        on_line: Optional[Callable[[str], bool]] = None
+    ) -> Tuple[bool, str]:
+        """Run a command against the fake CLI."""
+        output_format = FAKE_FORMATS[load_scenario(command)["format"]]
+        cmd_parts = [sys.executable, self.get_binary_path(), "--output-format", output_format, command]
+        input_text = "\n".join(str(arg) for arg in args)
+        success, output = self._execute(command, cmd_parts, input_text, working_dir, output_file, on_line)
+        if success and output_format == "kimi":
+            output = KimiProvider()._parse_kimi_output(output)
+        return success, output
 
 
 def get_provider() -> AIProvider:
@@ -366,6 +417,8 @@ def get_provider() -> AIProvider:
         return KimiProvider()
     elif provider_name == "claude":
         return ClaudeProvider()
+    elif provider_name == "fake":
+        return FakeProvider()
     else:
         # Default to Claude for backward compatibility
         print(f"   [WARNING] Unknown AI_PROVIDER '{provider_name}', using Claude")
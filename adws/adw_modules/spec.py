@@ -0,0 +1,159 @@
+"""Incremental extraction of the spec from streamed planner output."""
+
+import re
+from typing import List
+
+from .kimi import KimiEvent, KimiStream, PlainText, PLAIN_TEXT
+
+
+SPEC_HEADERS = ("# Spec", "**ADW ID:**")
+# Trailing chatter that follows a spec, recognized at the start of a paragraph
+END_PHRASES = ("The spec is saved", "Let me know if")
+MIN_SPEC_LINES = 5
+
+_HEADER = re.compile("|".join(map(re.escape, SPEC_HEADERS)))
+_SPEC_NUMBER = re.compile(r"^# Spec \d+:", re.MULTILINE)
+_ADW_ID_LINE = re.compile(r"^\*\*ADW ID:\*\*[^\S\n]*\S*", re.MULTILINE)
+_END_PHRASE = re.compile(r"\s*(?:" + "|".join(map(re.escape, END_PHRASES)) + ")")
+
+
+class SpecExtractor:
+    """Finds the spec in provider output in a single pass as it streams.
+
+    Feed raw output with `feed()` (any chunking) or `feed_line()` (one line,
+    as `stream_command`'s `on_line`). Plain markdown (Claude) and Kimi
+    events (see `kimi.KimiStream`) are both understood; only TextParts are
+    parsed. The spec starts at a `# Spec` or `**ADW ID:**` header, or is a
+    ```markdown block containing one, and ends at a Kimi event other than
+    TextPart, the end of the block, or the end of output. A closing phrase
+    such as "Let me know if" also ends it when it opens a paragraph after the
+    first `##` section; the rest is ignored, but since a phrase can be wrong
+    the provider keeps running. `done` turns true only on the unambiguous
+    ends, so the provider can be stopped early.
+    """
+
+    def __init__(self, min_lines: int = MIN_SPEC_LINES):
+        self.min_lines = min_lines
+        self.state = "seek"  # seek | fence | body | tail | done
+        self.lines: List[str] = []
+        self.kimi = False  # seen a Kimi event, so text only comes from TextParts
+        self.seen = 0  # chunks consumed
+        self._events = KimiStream(kinds=("TextPart", PLAIN_TEXT), bare_others=True)
+        self._fence_depth = 0
+        self._fence_header = False
+        self._sections = False  # seen a `##` heading in the body
+        self._blank = False  # previous body line was blank
+
+    @property
+    def done(self) -> bool:
+        """The spec is complete and nothing after it can matter."""
+        return self.state == "done"
+
+    @property
+    def complete(self) -> bool:
+        return self.state in ("tail", "done")
+
+    @property
+    def spec(self) -> str:
+        """The spec once complete, else an empty string."""
+        return "\n".join(self.lines).strip() if self.complete else ""
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk of output; returns `done`."""
+        if not self.done:
+            self.seen += 1
+            for event in self._events.feed(chunk):
+                self._event(event)
+                if self.done:
+                    break
+        return self.done
+
+    def feed_line(self, line: str) -> bool:
+        """Consume one line of output (without its newline); returns `done`."""
+        return self.feed(line + "\n")
+
+    def finish(self) -> str:
+        """Flush buffered output at end of stream; returns the spec."""
+        if not self.done:
+            for event in self._events.finish():
+                self._event(event)
+        if self.state == "fence" and self._fence_header:
+            start = next(i for i, line in enumerate(self.lines) if _HEADER.search(line))
+            self.lines = self.lines[start:]
+            self.state = "done"
+        elif self.state in ("body", "tail"):
+            self._close()
+        return self.spec
+
+    # -- internals ----------------------------------------------------------
+
+    def _event(self, event: KimiEvent) -> None:
+        if isinstance(event, PlainText):
+            # After the first Kimi event, plain lines are CLI chatter
+            if not self.kimi:
+                self._line(event.text)
+            return
+        self.kimi = True
+        if event.kind == "TextPart":
+            # Each TextPart ends a line, as the parts are joined by newlines
+            for line in event.text.split("\n"):
+                self._line(line)
+                if self.done:
+                    return
+        elif self.state in ("body", "tail"):
+            self._close()
+
+    def _line(self, line: str) -> None:
+        """Advance on one line of spec-bearing text."""
+        if self.state == "seek":
+            if line.lstrip().startswith("```markdown"):
+                self.state = "fence"
+                self.lines = []
+                self._fence_depth = 0
+                self._fence_header = False
+                return
+            match = _HEADER.search(line)
+            if match:
+                self.state = "body"
+                self.lines = [line[match.start():]]
+                self._sections = self._blank = False
+        elif self.state == "fence":
+            fence = line.strip()
+            if fence.startswith("```"):
+                if fence != "```":
+                    self._fence_depth += 1
+                elif self._fence_depth:
+                    self._fence_depth -= 1
+                else:
+                    self.state = "done" if self._fence_header else "seek"
+                    return
+            self._fence_header = self._fence_header or bool(_HEADER.search(line))
+            self.lines.append(line)
+        elif self.state == "body":
+            if self._sections and self._blank and _END_PHRASE.match(line):
+                self._close("tail")
+                return
+            self.lines.append(line)
+            self._sections = self._sections or line.startswith("## ")
+            self._blank = not line.strip()
+
+    def _close(self, state: str = "done") -> None:
+        """End the spec body; too short a body was not a spec, so keep looking."""
+        if len("\n".join(self.lines).strip().split("\n")) > self.min_lines:
+            self.state = state
+        else:
+            self.state = "seek"
+            self.lines = []
+
+
+def extract_spec(output: str) -> str:
+    """Spec from complete provider output, or an empty string."""
+    extractor = SpecExtractor()
+    extractor.feed(output)
+    return extractor.finish()
+
+
+def stamp_spec(spec: str, spec_number: int, adw_id: str) -> str:
+    """Put this run's spec number and ADW ID into a spec, e.g. one from the prompt cache."""
+    spec = _SPEC_NUMBER.sub(f"# Spec {spec_number:03d}:", spec, count=1)
+    return _ADW_ID_LINE.sub(f"**ADW ID:** {adw_id}", spec, count=1)
@@ -1,10 +1,53 @@
-"""State management for ADW."""
+"""State management for ADW.
+
+Run state lives in an indexed SQLite store (`ADW_STATE_DB`, default
+`agents/.state.db` in the main checkout, shared by its worktrees) so runs can
+be looked up by issue, branch, phase, status and time without scanning
+`agents/`. Every save also exports `agents/{adw_id}/adw_state.json` for
+tools that read it directly. Provider calls (latency, turns, tokens) are
+kept in their own table, so concurrent saves of a run never drop them.
+"""
 
 import json
 import os
+import sqlite3
+import subprocess
+import time
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-from .data_types import ADWStateData
+from typing import Dict, Iterator, List, Optional
+from .data_types import ADWStateData, ProviderCall
+
+
+# Hidden, so `ls -t agents/` (issue-triggered.yml) still finds the newest run
+STATE_DB_NAME = ".state.db"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    adw_id TEXT PRIMARY KEY,
+    issue_number TEXT,
+    branch_name TEXT,
+    phase TEXT,
+    status TEXT,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_issue ON runs(issue_number, updated_at);
+CREATE INDEX IF NOT EXISTS runs_by_branch ON runs(branch_name);
+CREATE INDEX IF NOT EXISTS runs_by_phase ON runs(phase, status, updated_at);
+CREATE INDEX IF NOT EXISTS runs_by_status ON runs(status, updated_at);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs(updated_at);
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    adw_id TEXT NOT NULL,
+    phase TEXT,
+    started_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calls_by_run ON calls(adw_id, started_at);
+CREATE INDEX IF NOT EXISTS calls_by_time ON calls(started_at);
+"""
 
 
 def get_state_path(adw_id: str) -> Path:
@@ -12,22 +55,200 @@ def get_state_path(adw_id: str) -> Path:
     return Path(f"agents/{adw_id}/adw_state.json")
 
 
-def save_state(state: ADWStateData) -> None:
-    """Save state to file."""
+@lru_cache(maxsize=None)
+def _default_db_path(cwd: str) -> Path:
+    result = subprocess.run(
+        ["git", "rev-parse", "--path-format=absolute", "--git-common-dir"],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return Path(cwd) / "agents" / STATE_DB_NAME
+    return Path(result.stdout.strip()).parent / "agents" / STATE_DB_NAME
+
+
+def get_state_db_path() -> Path:
+    """State database (`ADW_STATE_DB`, default agents/.state.db of the main checkout)."""
+    if os.getenv("ADW_STATE_DB"):
+        return Path(os.environ["ADW_STATE_DB"])
+    return _default_db_path(os.getcwd())
+
+
+class StateStore:
+    """SQLite-backed run state with indexed lookups.
+
+    Writes are single transactions; WAL mode lets readers proceed while a
+    run is being saved. Connections are opened per call, so a store can be
+    shared between threads and processes.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or get_state_db_path())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA busy_timeout=30000")
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def save(self, state: ADWStateData) -> None:
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                """
+                INSERT INTO runs (adw_id, issue_number, branch_name, phase, status, data, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(adw_id) DO UPDATE SET
+                    issue_number = excluded.issue_number, branch_name = excluded.branch_name,
+                    phase = excluded.phase, status = excluded.status,
+                    data = excluded.data, updated_at = excluded.updated_at
+                """,
+                (state.adw_id, state.issue_number, state.branch_name, state.phase, state.status,
+                 state.model_dump_json(), now, now),
+            )
+
+    def load(self, adw_id: str) -> Optional[ADWStateData]:
+        with self._connect() as db:
+            row = db.execute("SELECT data FROM runs WHERE adw_id = ?", (adw_id,)).fetchone()
+        return ADWStateData.model_validate_json(row["data"]) if row else None
+
+    def find(
+        self,
+        issue_number: Optional[int] = None,
+        branch_name: Optional[str] = None,
+        phase: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """Runs matching every given filter, most recently updated first.
+
+        Rows hold `state` (ADWStateData) plus `created_at`/`updated_at`
+        as Unix timestamps.
+        """
+        filters = {
+            "issue_number = ?": None if issue_number is None else str(issue_number),
+            "branch_name = ?": branch_name,
+            "phase = ?": phase,
+            "status = ?": status,
+            "updated_at >= ?": since,
+            "updated_at < ?": until,
+        }
+        clauses = [clause for clause, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        query = "SELECT data, created_at, updated_at FROM runs"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY updated_at DESC"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        with self._connect() as db:
+            rows = db.execute(query, params).fetchall()
+        return [
+            {"state": ADWStateData.model_validate_json(row["data"]),
+             "created_at": row["created_at"], "updated_at": row["updated_at"]}
+            for row in rows
+        ]
+
+    def record_call(self, adw_id: str, call: ProviderCall) -> None:
+        """Add a provider call to a run, tagged with the run's current phase."""
+        with self._connect() as db:
+            phase = call.phase
+            if phase is None:
+                row = db.execute("SELECT phase FROM runs WHERE adw_id = ?", (adw_id,)).fetchone()
+                phase = row["phase"] if row else None
+            call = call.model_copy(update={"phase": phase})
+            db.execute(
+                "INSERT INTO calls (adw_id, phase, started_at, data) VALUES (?, ?, ?, ?)",
+                (adw_id, phase, call.started_at.timestamp(), call.model_dump_json()),
+            )
+
+    def calls(self, adw_id: Optional[str] = None, since: Optional[float] = None) -> List[ProviderCall]:
+        """Provider calls of one run, or of all runs since a Unix timestamp, oldest first."""
+        filters = {"adw_id = ?": adw_id, "started_at >= ?": since}
+        clauses = [clause for clause, value in filters.items() if value is not None]
+        query = "SELECT data FROM calls"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self._connect() as db:
+            rows = db.execute(query + " ORDER BY started_at, id",
+                              [value for value in filters.values() if value is not None]).fetchall()
+        return [ProviderCall.model_validate_json(row["data"]) for row in rows]
+
+    def import_json(self, agents_dir: Path = Path("agents")) -> int:
+        """Load `adw_state.json` files not yet in the store; returns how many."""
+        imported = 0
+        for state_file in sorted(Path(agents_dir).glob("*/adw_state.json")):
+            state = ADWStateData(**json.loads(state_file.read_text()))
+            if self.load(state.adw_id) is None:
+                self.save(state)
+                imported += 1
+        return imported
+
+
+_stores: Dict[Path, StateStore] = {}
+
+
+def get_store() -> StateStore:
+    """Store for the current `get_state_db_path()`."""
+    path = get_state_db_path()
+    if path not in _stores:
+        _stores[path] = StateStore(path)
+    return _stores[path]
+
+
+def export_state(state: ADWStateData) -> Path:
+    """Write `agents/{adw_id}/adw_state.json` atomically."""
     state_path = get_state_path(state.adw_id)
     state_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(state_path, "w") as f:
-        json.dump(state.model_dump(), f, indent=2)
+    tmp_path = state_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(state.model_dump(mode="json"), indent=2))
+    os.replace(tmp_path, state_path)
+    return state_path
+
+
+def save_state(state: ADWStateData) -> None:
+    """Save state to the store and export it as JSON."""
+    get_store().save(state)
+    export_state(state)
 
 
 def load_state(adw_id: str) -> Optional[ADWStateData]:
-    """Load state from file."""
-    state_path = get_state_path(adw_id)
-    if not state_path.exists():
-        return None
-    with open(state_path) as f:
-        data = json.load(f)
-        return ADWStateData(**data)
+    """Load state, importing a legacy JSON file the store has not seen."""
+    state = get_store().load(adw_id)
+    if state is None:
+        state_path = get_state_path(adw_id)
+        if not state_path.exists():
+            return None
+        with open(state_path) as f:
+            state = ADWStateData(**json.load(f))
+        get_store().save(state)
+    return state
+
+
+def record_phase(state: ADWStateData, phase: str, status: str) -> None:
+    """Mark `state` as being in `phase` with `status` and save it."""
+    state.phase = phase
+    state.status = status
+    save_state(state)
+
+
+def record_call(adw_id: str, call: ProviderCall) -> None:
+    """Record a provider call against a run in the default store."""
+    get_store().record_call(adw_id, call)
+
+
+def find_runs(**filters) -> List[Dict]:
+    """Query the default store; see `StateStore.find`."""
+    return get_store().find(**filters)
 
 
 def generate_adw_id() -> str:
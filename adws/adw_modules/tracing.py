@@ -0,0 +1,184 @@
+"""Nested timing spans for ADW runs.
+
+Wrap a run in `trace()`, then time any step with `span()`; spans nest
+through a context variable, so callees need no tracer argument. Finished
+spans are appended as JSON lines to `agents/{adw_id}/trace.jsonl`. Spans
+recorded before the ADW ID is known (e.g. during planning) are buffered
+until `bind_trace()`. Outside `trace()`, `span()` only times its block.
+"""
+
+import itertools
+import json
+import subprocess
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+WATERFALL_WIDTH = 40
+
+_tracer: ContextVar = ContextVar("adw_tracer", default=None)
+_current_span: ContextVar = ContextVar("adw_span", default=None)
+
+
+def get_trace_path(adw_id: str) -> Path:
+    return Path("agents") / adw_id / "trace.jsonl"
+
+
+@dataclass
+class Span:
+    """One timed step; `start` is a Unix timestamp."""
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    duration_seconds: Optional[float] = None
+    status: str = "ok"
+
+    def set(self, **attrs) -> None:
+        """Add attributes, e.g. a result code or byte count."""
+        self.attrs.update(attrs)
+
+    def to_json(self, trace_id: str) -> str:
+        return json.dumps({
+            "trace_id": trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_seconds": self.duration_seconds,
+            "status": self.status,
+            "attrs": self.attrs,
+        }, default=str)
+
+
+class Tracer:
+    """Collects the spans of one run and appends them to a JSONL file."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.path: Optional[Path] = None
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._unwritten: List[Span] = []
+        if path:
+            self.bind(path)
+
+    def next_id(self) -> str:
+        with self._lock:
+            return f"{next(self._ids):x}"
+
+    def bind(self, path: Path) -> None:
+        """Start writing to `path`, including spans buffered so far."""
+        with self._lock:
+            self.path = Path(path)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            unwritten, self._unwritten = self._unwritten, []
+            self._write(unwritten)
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+            if self.path:
+                self._write([span])
+            else:
+                self._unwritten.append(span)
+
+    def _write(self, spans: List[Span]) -> None:
+        if spans:
+            with open(self.path, "a") as f:
+                f.writelines(span.to_json(self.trace_id) + "\n" for span in spans)
+
+
+@contextmanager
+def trace(adw_id: Optional[str] = None) -> Iterator[Tracer]:
+    """Record spans started in this block (and in contexts copied from it)."""
+    tracer = Tracer(get_trace_path(adw_id) if adw_id else None)
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+
+
+def bind_trace(adw_id: str) -> None:
+    """Direct the active trace to `agents/{adw_id}/trace.jsonl` once the ID is known."""
+    tracer = _tracer.get()
+    if tracer and tracer.path is None:
+        tracer.bind(get_trace_path(adw_id))
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Span]:
+    """Time a block as a child of the current span."""
+    tracer = _tracer.get()
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        span_id=tracer.next_id() if tracer else "",
+        parent_id=parent.span_id if parent else None,
+        start=time.time(),
+        attrs=attrs,
+    )
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.attrs.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        current.duration_seconds = round(time.perf_counter() - started, 6)
+        _current_span.reset(token)
+        if tracer:
+            tracer.record(current)
+
+
+def traced_run(cmd: list, **kwargs) -> subprocess.CompletedProcess:
+    """`subprocess.run` inside a `subprocess` span."""
+    with span("subprocess", command=" ".join(map(str, cmd[:3]))) as current:
+        result = subprocess.run(cmd, **kwargs)
+        current.set(returncode=result.returncode)
+        return result
+
+
+def format_waterfall(spans: List[Span], width: int = WATERFALL_WIDTH) -> str:
+    """Spans as an indented tree with bars on a shared timeline."""
+    if not spans:
+        return ""
+    ids = {s.span_id for s in spans}
+    children: Dict[Optional[str], List[Span]] = {}
+    for s in spans:
+        children.setdefault(s.parent_id if s.parent_id in ids else None, []).append(s)
+
+    origin = min(s.start for s in spans)
+    total = max(s.start + (s.duration_seconds or 0) for s in spans) - origin or 1e-9
+    rows = []
+
+    def walk(parent_id: Optional[str], depth: int) -> None:
+        for s in sorted(children.get(parent_id, []), key=lambda s: s.start):
+            offset = s.start - origin
+            duration = s.duration_seconds or 0
+            left = min(width - 1, int(offset / total * width))
+            bar = max(1, round(duration / total * width))
+            label = "  " * depth + s.name
+            detail = " ".join(f"{k}={v}" for k, v in s.attrs.items() if k in ("phase", "command", "check", "issue"))
+            if detail:
+                label += f" [{detail}]"
+            if s.status != "ok":
+                label += " !"
+            rows.append(f"{label[:48]:<48} {offset:>8.2f}s {duration:>8.2f}s "
+                        f"|{' ' * left}{'█' * min(bar, width - left)}{' ' * max(0, width - left - bar)}|")
+            walk(s.span_id, depth + 1)
+
+    walk(None, 0)
+    header = f"{'span':<48} {'start':>9} {'duration':>9}  timeline ({total:.1f}s)"
+    return "\n".join([header] + rows)
@@ -0,0 +1,160 @@
+"""Synthetic provider transcripts for benchmarks and test doubles.
+
+Generators are deterministic for a given size and seed, and produce
+roughly `size` bytes shaped like real CLI output: tool calls with large
+results, thinking, assistant chatter and a spec at the end. The
+adversarial generators target the worst cases of the Kimi tokenizer.
+"""
+
+import json
+import random
+from typing import Callable, Dict, List
+
+
+WORDS = (
+    "supply", "inventory", "route", "handler", "prisma", "schema", "validate",
+    "request", "response", "component", "service", "query", "update", "error",
+    "session", "cache", "test", "migration", "field", "record", "page", "form",
+)
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _filler(rng: random.Random, size: int) -> str:
+    """Roughly `size` bytes of prose, one sentence per line."""
+    lines, total = [], 0
+    while total < size:
+        line = _sentence(rng)
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+
+def synthetic_spec(size: int = 4096, seed: int = 0, title: str = "Supply CRUD") -> str:
+    """A spec in the planner's format, padded to about `size` bytes."""
+    rng = random.Random(seed)
+    head = (
+        f"# Spec 001: {title}\n\n"
+        "**ADW ID:** abc12345  \n**Issue:** #1  \n**Type:** /feature  \n"
+        "**Status:** 🔄 In Progress\n\n## Overview\n\n"
+    )
+    tail = (
+        "\n\n## Acceptance Criteria\n\n- [ ] Supplies can be created\n"
+        "- [ ] Tests pass\n\n## Notes\n\n_Generated by ADW_"
+    )
+    body, total, n = [], len(head) + len(tail), 1
+    while total < size:
+        item = f"- [REQ-{n}] {_sentence(rng)}"
+        body.append(item)
+        total += len(item) + 1
+        n += 1
+    return head + _sentence(rng) + "\n\n## Requirements\n\n" + "\n".join(body) + tail
+
+
+def claude_text(size: int, seed: int = 0, text: str = "") -> str:
+    """Plain-text answer: some preamble, `text` or a spec, then trailing chatter."""
+    rng = random.Random(seed)
+    if text:
+        preamble = _filler(rng, size - len(text) - 40)
+    else:
+        preamble = _filler(rng, size // 8)
+        text = synthetic_spec(size - len(preamble) - 80, seed)
+    return f"{preamble}\n\n{text}\n\nLet me know if you want changes.\n"
+
+
+def claude_stream_json(size: int, seed: int = 0, result: str = "") -> str:
+    """`--output-format stream-json` lines; the final result is `result` or a spec."""
+    rng = random.Random(seed)
+    result = result or synthetic_spec(max(512, size // 8), seed)
+    lines = [json.dumps({"type": "system", "subtype": "init", "session_id": f"s{seed}"})]
+    total, turn = len(lines[0]) + len(result), 0
+    while total < size:
+        turn += 1
+        usage = {"input_tokens": rng.randint(500, 5000), "output_tokens": rng.randint(20, 800),
+                 "cache_read_input_tokens": rng.randint(0, 20000)}
+        content = [{"type": "text", "text": _filler(rng, 200)},
+                   {"type": "tool_use", "id": f"tu_{turn}", "name": rng.choice(("Read", "Edit", "Bash")),
+                    "input": {"file_path": f"lib/services/{rng.choice(WORDS)}.ts"}}]
+        assistant = json.dumps({"type": "assistant", "message": {"id": f"msg_{turn}", "usage": usage,
+                                                                 "content": content}})
+        tool_result = json.dumps({"type": "user", "message": {"content": [
+            {"type": "tool_result", "tool_use_id": f"tu_{turn}", "content": _filler(rng, 1500)}]}})
+        lines += [assistant, tool_result]
+        total += len(assistant) + len(tool_result) + 2
+    final = json.dumps({"type": "assistant", "message": {"id": f"msg_{turn + 1}", "usage": {
+        "input_tokens": 1000, "output_tokens": 400}, "content": [{"type": "text", "text": result}]}})
+    lines.append(final)
+    lines.append(json.dumps({
+        "type": "result", "subtype": "success", "is_error": False, "num_turns": turn + 1,
+        "result": result, "total_cost_usd": round(0.003 * (turn + 1), 4),
+        "usage": {"input_tokens": 1000 * (turn + 1), "output_tokens": 400 * (turn + 1)},
+    }))
+    return "\n".join(lines) + "\n"
+
+
+def kimi_transcript(size: int, seed: int = 0, text: str = "") -> str:
+    """Kimi `--print` output: think/tool events, then a TextPart with `text` or a spec."""
+    rng = random.Random(seed)
+    text = text or "Here is the spec.\n\n" + synthetic_spec(max(512, size // 8), seed)
+    events: List[str] = []
+    total, call = len(text), 0
+    while total < size:
+        call += 1
+        arguments = json.dumps({"command": f"cat lib/services/{rng.choice(WORDS)}.ts"})
+        batch = [
+            f"ThinkPart(type='think', think={_sentence(rng)!r}, encrypted=None)",
+            f"ToolCall(type='function', id='tool_{call}', "
+            f"function=FunctionBody(name='Shell', arguments={arguments!r}))",
+            f"ToolResult(tool_call_id='tool_{call}', return_value=ToolOk(is_error=False, "
+            f"output={_filler(rng, 2000)!r}, message='', brief=''))",
+            f"StatusUpdate(context_usage={min(0.99, call / 100):.2f}, "
+            f"token_usage=TokenUsage(input={call * 900}, output={call * 60}))",
+        ]
+        events += batch
+        total += sum(len(event) + 1 for event in batch)
+    events.append(f"TextPart(type='text', text={text!r})")
+    return "\n".join(events) + "\n"
+
+
+def kimi_unterminated(size: int, seed: int = 0) -> str:
+    """A TextPart whose string never closes."""
+    return "TextPart(type='text', text='" + "a" * size
+
+
+def kimi_unbalanced(size: int, seed: int = 0) -> str:
+    """Event openers with no arguments, one per line."""
+    return "TextPart(\n" * (size // 10)
+
+
+def kimi_escapes(size: int, seed: int = 0) -> str:
+    """A TextPart made almost entirely of escape sequences."""
+    return "TextPart(type='text', text='" + "\\'\\n\\\\" * (size // 6) + "')\n"
+
+
+def kimi_nested(size: int, seed: int = 0) -> str:
+    """A ToolResult whose output is deeply nested lists, then a TextPart."""
+    depth = min(size // 4, 200)
+    nested = "[" * depth + "1" + "]" * depth
+    record = f"ToolResult(tool_call_id='t', return_value=ToolOk(output={nested}))\n"
+    return record * max(1, size // len(record)) + "TextPart(type='text', text='done')\n"
+
+
+def kimi_strings(size: int, seed: int = 0) -> str:
+    """One long ToolResult line holding many short strings, then a TextPart."""
+    items = ", ".join(["'ab'", "''", r"'c\'d'"] * max(1, size // 20))
+    return f"ToolResult(tool_call_id='t', return_value=ToolOk(output=[{items}]))\nTextPart(type='text', text='done')\n"
+
+
+# name -> generator(size, seed)
+TRANSCRIPTS: Dict[str, Callable[..., str]] = {
+    "claude_text": claude_text,
+    "claude_stream_json": claude_stream_json,
+    "kimi": kimi_transcript,
+    "kimi_unterminated": kimi_unterminated,
+    "kimi_unbalanced": kimi_unbalanced,
+    "kimi_escapes": kimi_escapes,
+    "kimi_nested": kimi_nested,
+    "kimi_strings": kimi_strings,
+}
@@ -76,3 +76,12 @@ def find_spec_files():
         return []
     
     return sorted([f for f in specs_dir.glob("*.md") if f.is_file()])
+
+
+def percentile(values: list, q: float) -> Optional[float]:
+    """Nearest-rank percentile (`q` in 0-100) of `values`, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
@@ -0,0 +1,126 @@
+"""Time limits for provider CLI processes."""
+
+import os
+import signal
+import subprocess
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+DEFAULT_COMMAND_TIMEOUT = 600
+DEFAULT_IDLE_TIMEOUT = 300
+KILL_GRACE_SECONDS = 5
+
+# (phase name, monotonic deadline) of the innermost active budget
+_phase_deadline: ContextVar = ContextVar("adw_phase_deadline", default=None)
+
+
+def _env_seconds(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    seconds = float(value)
+    return seconds if seconds > 0 else None
+
+
+def get_command_timeout() -> Optional[float]:
+    """Wall-clock limit per command (`ADW_COMMAND_TIMEOUT`, 0 disables)."""
+    return _env_seconds("ADW_COMMAND_TIMEOUT", DEFAULT_COMMAND_TIMEOUT)
+
+
+def get_idle_timeout() -> Optional[float]:
+    """Limit on time without output (`ADW_IDLE_TIMEOUT`, 0 disables)."""
+    return _env_seconds("ADW_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT)
+
+
+@contextmanager
+def phase_budget(name: str, seconds: Optional[float] = None) -> Iterator[None]:
+    """Cap the total time provider commands may take inside this block.
+
+    `seconds` defaults to `ADW_PHASE_BUDGET`; with neither set this is a
+    no-op. Nested budgets never extend an outer one.
+    """
+    seconds = _env_seconds("ADW_PHASE_BUDGET", None) if seconds is None else seconds
+    if not seconds:
+        yield
+        return
+
+    deadline = time.monotonic() + seconds
+    outer = _phase_deadline.get()
+    if outer and outer[1] < deadline:
+        name, deadline = outer
+    token = _phase_deadline.set((name, deadline))
+    try:
+        yield
+    finally:
+        _phase_deadline.reset(token)
+
+
+class Watchdog:
+    """Tracks wall-clock, idle and phase-budget limits for one command."""
+
+    def __init__(
+        self,
+        wall_timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+    ):
+        now = time.monotonic()
+        self.wall_timeout = wall_timeout
+        self.idle_timeout = idle_timeout
+        self.started = now
+        self.last_output = now
+        self.phase = _phase_deadline.get()
+
+    @classmethod
+    def from_env(cls) -> "Watchdog":
+        return cls(get_command_timeout(), get_idle_timeout())
+
+    def touch(self) -> None:
+        """Record that the process produced output."""
+        self.last_output = time.monotonic()
+
+    def _deadlines(self) -> list:
+        deadlines = []
+        if self.wall_timeout:
+            deadlines.append((self.started + self.wall_timeout,
+                              f"exceeded {self.wall_timeout:g}s command timeout"))
+        if self.idle_timeout:
+            deadlines.append((self.last_output + self.idle_timeout,
+                              f"no output for {self.idle_timeout:g}s"))
+        if self.phase:
+            deadlines.append((self.phase[1], f"exhausted {self.phase[0]} phase budget"))
+        return deadlines
+
+    def expired(self) -> Optional[str]:
+        """Reason the command must stop, or None while within limits."""
+        now = time.monotonic()
+        for deadline, reason in self._deadlines():
+            if now >= deadline:
+                return reason
+        return None
+
+    def time_left(self) -> Optional[float]:
+        """Seconds until the nearest limit, or None when unlimited."""
+        deadlines = self._deadlines()
+        if not deadlines:
+            return None
+        return max(0.0, min(deadline for deadline, _ in deadlines) - time.monotonic())
+
+
+def kill_process_group(process: subprocess.Popen, grace: float = KILL_GRACE_SECONDS) -> None:
+    """Terminate a process started with `start_new_session` and its children."""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        return
+    try:
+        process.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    process.wait()
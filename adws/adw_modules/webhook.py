@@ -0,0 +1,186 @@
+"""GitHub webhook verification, filtering and per-issue event coalescing."""
+
+import hashlib
+import hmac
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+
+TRIGGER_ACTIONS = ("opened", "labeled")
+TRIGGER_LABEL = "adw"
+TRIGGER_TITLE = "[ADW]"
+DEFAULT_WINDOW_SECONDS = 10.0
+SEEN_DELIVERIES = 1024
+
+
+def get_webhook_secret() -> str:
+    """Shared secret configured on the GitHub webhook."""
+    return os.getenv("GITHUB_WEBHOOK_SECRET", "")
+
+
+def get_coalesce_window() -> float:
+    """Seconds to wait for more events on an issue (`ADW_WEBHOOK_WINDOW`)."""
+    return float(os.getenv("ADW_WEBHOOK_WINDOW", DEFAULT_WINDOW_SECONDS))
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check an `X-Hub-Signature-256` header against the raw request body."""
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+def triggering_issue(event: str, payload: dict) -> Optional[int]:
+    """Issue number an event should run ADW for, or None.
+
+    Mirrors the filter of issue-triggered.yml: `opened`/`labeled` issue
+    events on issues labelled `adw` or titled with `[ADW]`.
+    """
+    if event != "issues" or payload.get("action") not in TRIGGER_ACTIONS:
+        return None
+    issue = payload.get("issue") or {}
+    labels = [label.get("name") for label in issue.get("labels") or []]
+    if TRIGGER_LABEL in labels or TRIGGER_TITLE in (issue.get("title") or ""):
+        return issue.get("number")
+    return None
+
+
+class Coalescer:
+    """Collapses bursts of events for one issue into a single dispatch.
+
+    The first event for an issue opens a `window`-second timer; events that
+    arrive before it fires are folded into it. Events that arrive while that
+    issue's run is still going are held for one follow-up run, whose window
+    opens when the current run ends. `dispatch(issue_number, events)` must
+    not block and returns a Future that completes when the run ends.
+    """
+
+    def __init__(self, window: float, dispatch: Callable[[int, List[str]], Future]):
+        self.window = window
+        self.dispatch = dispatch
+        self.lock = threading.Lock()
+        self.pending: Dict[int, dict] = {}
+        self.running: Dict[int, Future] = {}
+        self.followups: Dict[int, List[str]] = {}
+        self.deliveries: OrderedDict = OrderedDict()
+
+    def submit(self, issue_number: int, event: str = "", delivery: Optional[str] = None) -> str:
+        """Record an event; returns `queued`, `coalesced`, `followup` or `duplicate`."""
+        with self.lock:
+            if delivery:
+                if delivery in self.deliveries:
+                    return "duplicate"
+                self.deliveries[delivery] = True
+                while len(self.deliveries) > SEEN_DELIVERIES:
+                    self.deliveries.popitem(last=False)
+            if issue_number in self.running:
+                self.followups.setdefault(issue_number, []).append(event)
+                return "followup"
+            if issue_number in self.pending:
+                self.pending[issue_number]["events"].append(event)
+                return "coalesced"
+            timer = self._schedule(issue_number, [event])
+        timer.start()
+        return "queued"
+
+    def _schedule(self, issue_number: int, events: List[str]) -> threading.Timer:
+        """Open a window for `events`; the caller holds the lock and starts the timer."""
+        timer = threading.Timer(self.window, self._fire, args=(issue_number,))
+        timer.daemon = True
+        self.pending[issue_number] = {"events": events, "timer": timer}
+        return timer
+
+    def _fire(self, issue_number: int) -> None:
+        with self.lock:
+            entry = self.pending.pop(issue_number, None)
+            if entry is None:
+                return
+            future = self.dispatch(issue_number, entry["events"])
+            self.running[issue_number] = future
+        future.add_done_callback(lambda _: self._done(issue_number))
+
+    def _done(self, issue_number: int) -> None:
+        with self.lock:
+            self.running.pop(issue_number, None)
+            events = self.followups.pop(issue_number, None)
+            if not events:
+                return
+            timer = self._schedule(issue_number, events)
+        timer.start()
+
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                "pending": sorted(self.pending),
+                "running": sorted(self.running),
+                "followup": sorted(self.followups),
+            }
+
+    def cancel(self) -> None:
+        """Drop pending and follow-up events; runs already dispatched are left alone."""
+        with self.lock:
+            for entry in self.pending.values():
+                entry["timer"].cancel()
+            self.pending.clear()
+            self.followups.clear()
+
+
+def make_server(coalescer: Coalescer, secret: str, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """HTTP server that feeds verified webhook deliveries to `coalescer`.
+
+    `POST` (any path) takes a delivery; `GET /healthz` reports pending,
+    running and follow-up issues.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/healthz":
+                self._reply(200, coalescer.status())
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if not verify_signature(secret, body, self.headers.get("X-Hub-Signature-256")):
+                self._reply(401, {"error": "bad signature"})
+                return
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                self._reply(400, {"error": "invalid JSON"})
+                return
+
+            event = self.headers.get("X-GitHub-Event", "")
+            issue_number = triggering_issue(event, payload)
+            if issue_number is None:
+                self._reply(202, {"status": "ignored"})
+                return
+            status = coalescer.submit(
+                issue_number,
+                f"{event}.{payload.get('action')}",
+                self.headers.get("X-GitHub-Delivery"),
+            )
+            print(f"📨 #{issue_number} {event}.{payload.get('action')}: {status}", flush=True)
+            self._reply(202, {"status": status, "issue": issue_number})
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
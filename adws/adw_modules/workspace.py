@@ -0,0 +1,204 @@
+"""Pool of pre-initialized worktrees with dependencies already installed."""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .worktrees import add_worktree, remove_worktree
+
+
+# Files whose content decides whether node_modules and the Prisma client are reusable
+ENV_KEY_FILES = ("pnpm-lock.yaml", "prisma/schema.prisma")
+INSTALL_COMMANDS = (
+    ["pnpm", "install", "--frozen-lockfile", "--prefer-offline"],
+    ["pnpm", "db:generate"],
+)
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class WorkspacePool:
+    """Hands out ready worktrees keyed by the lockfile and Prisma schema.
+
+    Entries are tracked in `<pool_dir>/pool.json` under an flock, so several
+    processes can share one pool. A workspace is `idle` or `busy`; busy
+    entries whose holder process died are treated as idle again.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        pool_dir: Optional[Path] = None,
+        install_commands: tuple = INSTALL_COMMANDS,
+    ):
+        self.root = Path(root)
+        self.pool_dir = Path(pool_dir or os.getenv("ADW_WORKSPACE_DIR") or self.root / "agents" / "workspaces")
+        self.install_commands = install_commands
+
+    # -- bookkeeping -------------------------------------------------------
+
+    @contextmanager
+    def _locked(self) -> Iterator[List[dict]]:
+        self.pool_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.pool_dir / "pool.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            state_file = self.pool_dir / "pool.json"
+            entries = json.loads(state_file.read_text()) if state_file.exists() else []
+            yield entries
+            tmp = state_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(entries, indent=2))
+            os.replace(tmp, state_file)
+
+    def env_key(self, ref: str) -> Optional[str]:
+        """Hash of the lockfile and schema blobs at `ref`."""
+        blobs = []
+        for path in ENV_KEY_FILES:
+            result = subprocess.run(
+                ["git", "rev-parse", f"{ref}:{path}"],
+                cwd=self.root, capture_output=True, text=True,
+            )
+            if result.returncode != 0:
+                return None
+            blobs.append(result.stdout.strip())
+        return hashlib.sha256(":".join(blobs).encode()).hexdigest()[:16]
+
+    def entries(self) -> List[dict]:
+        """Snapshot of the pool."""
+        with self._locked() as entries:
+            return [dict(entry) for entry in entries]
+
+    # -- workspace lifecycle -----------------------------------------------
+
+    def _reset(self, path: Path, ref: str) -> bool:
+        """Return a workspace to a clean checkout of `ref`, keeping dependencies."""
+        for command in (
+            ["git", "checkout", "--detach", "--force", ref],
+            ["git", "clean", "-ffdx", "-e", "node_modules", "-e", ".next"],
+        ):
+            if subprocess.run(command, cwd=path, capture_output=True).returncode != 0:
+                return False
+        return True
+
+    def _install(self, path: Path, key: str, templates: List[dict]) -> bool:
+        """Populate node_modules from a same-key workspace, or install it."""
+        for template in templates:
+            source = Path(template["path"]) / "node_modules"
+            if template["key"] == key and template.get("ready") and source.is_dir():
+                try:
+                    shutil.copytree(source, path / "node_modules", symlinks=True, copy_function=os.link)
+                    return True
+                except OSError:
+                    shutil.rmtree(path / "node_modules", ignore_errors=True)
+
+        for command in self.install_commands:
+            result = subprocess.run(command, cwd=path, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"❌ {' '.join(command)} failed in {path.name}: {result.stderr.strip()[-500:]}")
+                return False
+        return True
+
+    def _create(self, ref: str, key: str, templates: List[dict]) -> Optional[dict]:
+        name = f"ws-{key[:8]}-{int(time.time() * 1000) % 10**8:08d}-{os.getpid()}"
+        path = self.pool_dir / name
+        if not add_worktree(path, ref, str(self.root)):
+            return None
+        if not self._install(path, key, templates):
+            remove_worktree(path, str(self.root))
+            return None
+        return {"path": str(path), "key": key, "ready": True, "status": "idle",
+                "pid": None, "created_at": time.time(), "last_used": time.time()}
+
+    def evict_stale(self, ref: str = "origin/main") -> int:
+        """Remove idle workspaces whose lockfile/schema hash no longer matches `ref`."""
+        key = self.env_key(ref)
+        removed = 0
+        with self._locked() as entries:
+            for entry in list(entries):
+                holder_alive = entry["status"] == "busy" and _pid_alive(entry.get("pid"))
+                if entry["key"] != key and not holder_alive:
+                    remove_worktree(Path(entry["path"]), str(self.root))
+                    shutil.rmtree(entry["path"], ignore_errors=True)
+                    entries.remove(entry)
+                    removed += 1
+        return removed
+
+    def warm(self, count: int, ref: str = "origin/main") -> int:
+        """Make sure at least `count` idle workspaces exist for `ref`."""
+        key = self.env_key(ref)
+        if not key:
+            print(f"❌ Cannot hash {', '.join(ENV_KEY_FILES)} at {ref}")
+            return 0
+        self.evict_stale(ref)
+        created = 0
+        while True:
+            with self._locked() as entries:
+                idle = [e for e in entries if e["key"] == key and e["status"] == "idle"]
+                templates = [dict(e) for e in entries]
+            if len(idle) >= count:
+                return created
+            entry = self._create(ref, key, templates)
+            if not entry:
+                return created
+            with self._locked() as entries:
+                entries.append(entry)
+            created += 1
+
+    def acquire(self, ref: str = "origin/main") -> Optional[Path]:
+        """Check out a ready workspace at `ref`, creating one if the pool is empty."""
+        key = self.env_key(ref)
+        if not key:
+            print(f"❌ Cannot hash {', '.join(ENV_KEY_FILES)} at {ref}")
+            return None
+        self.evict_stale(ref)
+
+        with self._locked() as entries:
+            for entry in entries:
+                reclaimable = entry["status"] == "busy" and not _pid_alive(entry.get("pid"))
+                if entry["key"] == key and (entry["status"] == "idle" or reclaimable):
+                    entry.update(status="busy", pid=os.getpid(), last_used=time.time())
+                    path = Path(entry["path"])
+                    break
+            else:
+                path = None
+                templates = [dict(e) for e in entries]
+
+        if path:
+            if self._reset(path, ref):
+                return path
+            self.release(path)
+            return None
+
+        # Installing can take minutes; do it outside the pool lock
+        entry = self._create(ref, key, templates)
+        if not entry:
+            return None
+        entry.update(status="busy", pid=os.getpid())
+        with self._locked() as entries:
+            entries.append(entry)
+        return Path(entry["path"])
+
+    def release(self, path: Path, ref: Optional[str] = None) -> None:
+        """Return a workspace to the pool, resetting it to `ref` when given."""
+        if ref:
+            self._reset(Path(path), ref)
+        with self._locked() as entries:
+            for entry in entries:
+                if Path(entry["path"]) == Path(path):
+                    entry.update(status="idle", pid=None, last_used=time.time())
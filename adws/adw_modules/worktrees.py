@@ -0,0 +1,64 @@
+"""Git worktree helpers for isolated ADW runs."""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+
+def repo_root(cwd: Optional[str] = None) -> Path:
+    """Top-level directory of the main checkout."""
+    result = subprocess.run(
+        ["git", "rev-parse", "--path-format=absolute", "--git-common-dir"],
+        cwd=cwd, capture_output=True, text=True, check=True,
+    )
+    return Path(result.stdout.strip()).parent
+
+
+def resolve_ref(ref: str, cwd: Optional[str] = None) -> Optional[str]:
+    """Commit SHA for `ref`, or None if it does not exist."""
+    result = subprocess.run(
+        ["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def fetch_remote(remote: str = "origin", cwd: Optional[str] = None) -> bool:
+    """Update remote-tracking refs; False when the fetch fails (e.g. offline)."""
+    result = subprocess.run(
+        ["git", "fetch", "--quiet", remote],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    return result.returncode == 0
+
+
+def add_worktree(path: Path, ref: str, cwd: Optional[str] = None) -> bool:
+    """Create a detached worktree at `path` checked out at `ref`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    result = subprocess.run(
+        ["git", "worktree", "add", "--detach", str(path), ref],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(f"❌ git worktree add failed: {result.stderr.strip()}")
+    return result.returncode == 0
+
+
+def remove_worktree(path: Path, cwd: Optional[str] = None) -> bool:
+    """Remove a worktree, discarding its local changes."""
+    result = subprocess.run(
+        ["git", "worktree", "remove", "--force", str(path)],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    return result.returncode == 0
+
+
+def link_node_modules(worktree: Path, source_root: Path) -> bool:
+    """Point a fresh worktree at the main checkout's installed node_modules."""
+    source = source_root / "node_modules"
+    target = worktree / "node_modules"
+    if not source.is_dir() or target.exists() or target.is_symlink():
+        return False
+    os.symlink(source, target, target_is_directory=True)
+    return True
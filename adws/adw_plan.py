@@ -8,105 +8,73 @@ Usage:
 
 import sys
 import argparse
-import re
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from adw_modules.state import save_state, load_state
-from adw_modules.github import fetch_issue
+from adw_modules.github import fetch_issue, format_comments
 from adw_modules.utils import generate_adw_id, generate_branch_name, classify_issue
-from adw_modules.agent import run_slash_command
+from adw_modules.agent import run_slash_command, SPEC_COMMAND
+from adw_modules.spec import SpecExtractor, extract_spec, stamp_spec
+from adw_modules.context import context_digest
+from adw_modules.tracing import span
 
 
 def parse_spec_from_output(output: str) -> str:
-    """Parse spec content from AI output.
+    """Parse spec content from complete AI output.
     
     Handles both Claude (plain markdown) and Kimi (TextPart or plain text) outputs.
     """
-    import re
-    
-    # Try to find spec content in TextPart format (Kimi old format)
-    textpart_pattern = r"TextPart\([^)]*text='([^']*)'"
-    textparts = re.findall(textpart_pattern, output, re.DOTALL)
-    
-    if textparts:
-        combined = "\n".join(textparts)
-        combined = combined.replace('\\n', '\n').replace("\\'", "'")
-        if '# Spec' in combined or '**ADW ID:**' in combined:
-            return combined
-    
-    # Try to find content between markdown code blocks
-    codeblock_pattern = r'```markdown\n(.*?)\n```'
-    codeblocks = re.findall(codeblock_pattern, output, re.DOTALL)
-    if codeblocks:
-        for block in codeblocks:
-            if '# Spec' in block or '**ADW ID:**' in block:
-                return block
-    
-    # Look for spec header anywhere in the output (handles intro text before spec)
-    spec_start_idx = output.find('# Spec')
-    if spec_start_idx == -1:
-        spec_start_idx = output.find('**ADW ID:**')
-    
-    if spec_start_idx != -1:
-        spec_content = output[spec_start_idx:]
-        
-        # Stop at end markers
-        for marker in ['TurnBegin(', 'StepBegin(', 'ToolCall(', 'ThinkPart(', 
-                       'StatusUpdate(', '\nStatusUpdate(', 'ToolResult(']:
-            idx = spec_content.find(marker)
-            if idx != -1:
-                spec_content = spec_content[:idx]
-                break
-        
-        # Also check for ending phrases
-        for phrase in ['The spec is saved', 'This spec', 'Let me know if']:
-            idx = spec_content.find(phrase)
-            if idx != -1:
-                spec_content = spec_content[:idx]
-                break
-        
-        lines = spec_content.strip().split('\n')
-        if len(lines) > 5:
-            return spec_content.strip()
-    
-    return ""
+    return extract_spec(output)
 
 
-def main():
-    parser = argparse.ArgumentParser(description="ADW Plan - Create implementation plan")
-    parser.add_argument("issue_number", type=int, help="GitHub issue number")
-    parser.add_argument("--adw-id", help="Existing ADW ID (optional)")
-    args = parser.parse_args()
+def run(
+    issue_number: int,
+    adw_id: Optional[str] = None,
+    issue_class: Optional[str] = None,
+) -> Optional[str]:
+    """Run the plan phase and return the ADW ID of the planned run.
     
+    `issue_class` skips classification, e.g. when it comes from adw_classify.py.
+    """
     # Generate or use ADW ID
-    adw_id = args.adw_id or generate_adw_id()
+    adw_id = adw_id or generate_adw_id()
     print(f"🔹 ADW ID: {adw_id}")
     
     # Fetch issue
-    print(f"📥 Fetching issue #{args.issue_number}...")
-    issue = fetch_issue(args.issue_number)
+    print(f"📥 Fetching issue #{issue_number}...")
+    issue = fetch_issue(issue_number)
     
     if not issue:
         print("❌ Could not fetch issue. Continuing with minimal info.")
-        issue_title = f"Issue {args.issue_number}"
+        issue_title = f"Issue {issue_number}"
         issue_body = ""
         issue_labels = []
+        issue_comments = []
     else:
         issue_title = issue.title
         issue_body = issue.body
         issue_labels = issue.labels
+        issue_comments = issue.comments
         print(f"✅ Found: {issue_title}")
+        if issue_comments:
+            print(f"💬 Including {len(issue_comments)} comment(s)")
     
     # Classify issue
-    issue_class = classify_issue(issue_title, issue_body, issue_labels)
+    issue_class = issue_class or classify_issue(issue_title, issue_body, issue_labels)
     print(f"🏷️  Classified as: {issue_class}")
     
     # Generate branch name
-    branch_name = generate_branch_name(args.issue_number, issue_title, issue_class)
+    branch_name = generate_branch_name(issue_number, issue_title, issue_class)
     print(f"🌿 Branch: {branch_name}")
     
+    # Register the run so its provider calls are recorded against it
+    from adw_modules.data_types import ADWStateData
+    save_state(ADWStateData(adw_id=adw_id, issue_number=str(issue_number), branch_name=branch_name,
+                            issue_class=issue_class, phase="plan", status="running"))
+    
     # Create spec file path
     spec_number = len(list(Path("specs").glob("*.md"))) + 1 if Path("specs").exists() else 1
     spec_file = f"specs/{spec_number:03d}-{branch_name}.md"
@@ -116,6 +84,11 @@ def main():
     Path(spec_file).parent.mkdir(parents=True, exist_ok=True)
     Path(f"agents/{adw_id}/planner").mkdir(parents=True, exist_ok=True)
     
+    # Precomputed summary of the repo, so the planner does not explore it first
+    context = context_digest()
+    if context:
+        print(f"🗂️  Repository context: {len(context)} chars")
+    
     print("🤖 Generating spec with AI...")
     
     # Build prompt for spec generation
@@ -124,9 +97,14 @@ def main():
 Issue Title: {issue_title}
 Issue Description: {issue_body or "_No description provided_"}
 Issue Type: {issue_class}
-Issue Number: #{args.issue_number}
+Issue Number: #{issue_number}
 ADW ID: {adw_id}
 
+Issue Discussion (clarifications posted after the issue was opened):
+{format_comments(issue_comments) or "_No comments_"}
+
+{context or "Repository context: _not available, explore the repository as needed_"}
+
 IMPORTANT: Return ONLY the spec content in markdown format. Do not add any introduction, summary, or explanation before or after the spec.
 
 Start directly with:
@@ -134,7 +112,7 @@ Start directly with:
 # Spec {spec_number:03d}: {issue_title}
 
 **ADW ID:** {adw_id}  
-**Issue:** #{args.issue_number}  
+**Issue:** #{issue_number}  
 **Type:** {issue_class}  
 **Status:** 🔄 In Progress
 
@@ -171,25 +149,32 @@ Describe what needs to be built (2-3 sentences based on the issue).
 Any technical considerations or dependencies.
 """
     
+    # The extractor reads the raw stream and stops the provider once the
+    # spec is complete, instead of waiting out trailing chatter. The prompt
+    # cache is keyed on the issue, not on the run's ADW ID and spec number.
+    extractor = SpecExtractor()
     success, spec_content = run_slash_command(
-        "Generate a detailed implementation spec:",
+        SPEC_COMMAND,
         [spec_prompt],
-        output_file=f"agents/{adw_id}/planner/raw_output.txt"
+        output_file=f"agents/{adw_id}/planner/raw_output.txt",
+        on_line=extractor.feed_line,
+        adw_id=adw_id,
+        cache_inputs=[issue_number, issue_title, issue_body, format_comments(issue_comments),
+                      issue_class, context],
     )
     
     spec_parsed = ""
     if success and spec_content:
-        print(f"[DEBUG] Raw output length: {len(spec_content)}")
-        print(f"[DEBUG] Raw output preview: {spec_content[:200]}...")
-        
-        # Parse the output to extract the spec
-        spec_parsed = parse_spec_from_output(spec_content)
-        
-        print(f"[DEBUG] Parsed spec length: {len(spec_parsed)}")
-        print(f"[DEBUG] Has '# Spec': {'# Spec' in spec_parsed}")
+        # A cached response never streamed through the extractor
+        with span("plan.parse_spec", bytes=len(spec_content), streamed=bool(extractor.seen)) as current:
+            early_stop = extractor.done
+            if not extractor.seen:
+                extractor.feed(spec_content)
+            spec_parsed = extractor.finish()
+            current.set(early_stop=early_stop, spec_bytes=len(spec_parsed), has_spec="# Spec" in spec_parsed)
         
         if spec_parsed and '# Spec' in spec_parsed:
-            spec_content = spec_parsed
+            spec_content = stamp_spec(spec_parsed, spec_number, adw_id)
             print(f"✅ Generated detailed spec")
         else:
             print(f"⚠️  AI output didn't contain valid spec format")
@@ -204,7 +189,7 @@ Any technical considerations or dependencies.
         spec_content = f"""# Spec {spec_number:03d}: {issue_title}
 
 **ADW ID:** {adw_id}  
-**Issue:** #{args.issue_number}  
+**Issue:** #{issue_number}  
 **Type:** {issue_class}  
 **Status:** 🔄 In Progress
 
@@ -247,13 +232,14 @@ _Generated by ADW_
     # Save state
     state = {
         "adw_id": adw_id,
-        "issue_number": str(args.issue_number),
+        "issue_number": str(issue_number),
         "branch_name": branch_name,
         "plan_file": spec_file,
-        "issue_class": issue_class
+        "issue_class": issue_class,
+        "phase": "plan",
+        "status": "done",
     }
     
-    from adw_modules.data_types import ADWStateData
     save_state(ADWStateData(**state))
     print(f"💾 State saved to agents/{adw_id}/adw_state.json")
     
@@ -261,9 +247,20 @@ _Generated by ADW_
     print("\n📋 Next Steps:")
     print(f"  1. Edit spec: {spec_file}")
     print(f"  2. Create branch: git checkout -b {branch_name}")
-    print(f"  3. Build: python adws/adw_build.py {args.issue_number} {adw_id}")
+    print(f"  3. Build: python adws/adw_build.py {issue_number} {adw_id}")
+    
+    return adw_id
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Plan - Create implementation plan")
+    parser.add_argument("issue_number", type=int, help="GitHub issue number")
+    parser.add_argument("--adw-id", help="Existing ADW ID (optional)")
+    parser.add_argument("--issue-class", choices=["/chore", "/bug", "/feature"],
+                        help="Use this classification instead of classifying the issue")
+    args = parser.parse_args(argv)
     
-    return 0
+    return 0 if run(args.issue_number, args.adw_id, args.issue_class) else 1
 
 
 if __name__ == "__main__":
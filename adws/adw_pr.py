@@ -8,34 +8,32 @@ Usage:
 
 import sys
 import argparse
-import subprocess
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from adw_modules.state import load_state
+from adw_modules.state import load_state, record_phase
 from adw_modules.github import create_pull_request
+from adw_modules.tracing import traced_run
 
 
-def main():
-    parser = argparse.ArgumentParser(description="ADW PR - Create pull request")
-    parser.add_argument("issue_number", type=int, help="GitHub issue number")
-    parser.add_argument("adw_id", help="ADW ID")
-    args = parser.parse_args()
-    
-    print(f"🔹 ADW ID: {args.adw_id}")
+def run(issue_number: int, adw_id: str) -> int:
+    """Run the pull request phase for an existing run."""
+    print(f"🔹 ADW ID: {adw_id}")
     
     # Load state
-    state = load_state(args.adw_id)
+    state = load_state(adw_id)
     if not state:
-        print(f"❌ No state found for {args.adw_id}")
+        print(f"❌ No state found for {adw_id}")
         return 1
+    record_phase(state, "pr", "running")
     
     # Get git info
     print("📊 Gathering git info...")
     
     # Changed files
-    result = subprocess.run(
+    result = traced_run(
         ["git", "diff", "origin/main...HEAD", "--stat"],
         capture_output=True,
         text=True
@@ -43,7 +41,7 @@ def main():
     changed_files = result.stdout
     
     # Commits
-    result = subprocess.run(
+    result = traced_run(
         ["git", "log", "origin/main..HEAD", "--oneline"],
         capture_output=True,
         text=True
@@ -52,7 +50,7 @@ def main():
     
     # Push branch
     print(f"🚀 Pushing branch: {state.branch_name}")
-    subprocess.run(
+    traced_run(
         ["git", "push", "-u", "origin", state.branch_name],
         capture_output=True
     )
@@ -60,13 +58,13 @@ def main():
     # Create PR
     print("📝 Creating pull request...")
     
-    title = f"{state.issue_class.strip('/'): #<{args.issue_number}> - {Path(state.plan_file).stem}"
+    title = f"{state.issue_class.strip('/')}: #{issue_number} - {Path(state.plan_file).stem}"
     
     body = f"""## Summary
 
-Implementation for issue #{args.issue_number}
+Implementation for issue #{issue_number}
 
-**ADW ID:** {args.adw_id}
+**ADW ID:** {adw_id}
 **Plan:** {state.plan_file}
 
 ## Changes
@@ -88,18 +86,29 @@ Implementation for issue #{args.issue_number}
 - [x] Code reviewed
 - [x] Ready for merge
 
-Closes #{args.issue_number}
+Closes #{issue_number}
 """
     
     pr_url = create_pull_request(state.branch_name, title, body)
     
     if pr_url:
         print(f"✅ PR created: {pr_url}")
+        record_phase(state, "pr", "done")
         return 0
     else:
         print("❌ Failed to create PR")
+        record_phase(state, "pr", "failed")
         return 1
 
 
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW PR - Create pull request")
+    parser.add_argument("issue_number", type=int, help="GitHub issue number")
+    parser.add_argument("adw_id", help="ADW ID")
+    args = parser.parse_args(argv)
+    
+    return run(args.issue_number, args.adw_id)
+
+
 if __name__ == "__main__":
     sys.exit(main())
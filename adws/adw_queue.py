@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+ADW Queue - Durable job queue and workers for SDLC runs.
+
+Usage:
+    python adws/adw_queue.py enqueue <issue-number>... [--priority N]
+        [--skip-test] [--skip-review] [--max-attempts 3]
+    python adws/adw_queue.py work [--jobs N] [--lease 300] [--once] [--base origin/main]
+    python adws/adw_queue.py list [--status queued|running|done|failed]
+    python adws/adw_queue.py requeue
+    python adws/adw_queue.py reset <job-id>
+
+The queue is a SQLite database (ADW_QUEUE_DB, default agents/.queue.db).
+Each job is one issue; each of its SDLC phases is claimed separately by a
+worker under a lease that a heartbeat keeps alive. When a worker dies, its
+lease expires and the phase runs again. A job's phases run in one worktree,
+agents/worktrees/<adw-id>.
+
+The queue is single-host: SQLite WAL does not work over network
+filesystems, so every worker runs on the machine that holds ADW_QUEUE_DB.
+"""
+
+import sys
+import argparse
+import os
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from adw_batch import ADW_ENTRY, prepare_worktree, finish_pipeline
+from adw_modules.jobqueue import JobQueue, Lease, SDLC_PHASES, DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS
+from adw_modules.watchdog import kill_process_group
+from adw_modules.worktrees import repo_root, resolve_ref
+
+
+POLL_SECONDS = 5.0
+
+
+def phase_command(lease: Lease) -> list:
+    """`adw.py` invocation for a leased phase."""
+    if lease.phase == "plan":
+        return [sys.executable, str(ADW_ENTRY), "plan", str(lease.issue_number), "--adw-id", lease.adw_id]
+    return [sys.executable, str(ADW_ENTRY), lease.phase, str(lease.issue_number), lease.adw_id]
+
+
+def run_phase(queue: JobQueue, lease: Lease, worktree: Path, log_file: Path, lease_seconds: float) -> tuple:
+    """Run a phase while heartbeating its lease; returns (success, error)."""
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_file, "a") as log:
+        process = subprocess.Popen(
+            phase_command(lease), cwd=worktree, stdout=log, stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+        lost = threading.Event()
+
+        def heartbeat():
+            while process.poll() is None:
+                time.sleep(lease_seconds / 3)
+                if process.poll() is None and not queue.heartbeat(lease, lease_seconds):
+                    lost.set()
+                    kill_process_group(process)
+                    return
+
+        threading.Thread(target=heartbeat, daemon=True).start()
+        returncode = process.wait()
+    if lost.is_set():
+        return False, "lease lost"
+    return returncode == 0, None if returncode == 0 else f"exit code {returncode}"
+
+
+def work(
+    queue: JobQueue,
+    root: Path,
+    base: str,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    once: bool = False,
+    poll: float = POLL_SECONDS,
+    stop: Optional[threading.Event] = None,
+) -> int:
+    """Claim and run phases until stopped (or, with `once`, until idle)."""
+    host = socket.gethostname()
+    worker = f"{host}:{os.getpid()}:{threading.get_ident()}"
+    stop = stop or threading.Event()
+    completed = 0
+    while not stop.is_set():
+        lease = queue.claim(worker, host, lease_seconds)
+        if not lease:
+            if once:
+                break
+            stop.wait(poll)
+            continue
+
+        label = f"#{lease.issue_number} {lease.phase} ({lease.adw_id}, attempt {lease.attempt})"
+        print(f"▶️  {label}", flush=True)
+        worktree = root / "agents" / "worktrees" / lease.adw_id
+        if not worktree.is_dir() and not prepare_worktree(root, lease.adw_id, base):
+            success, error = False, "could not create worktree"
+        else:
+            log_file = root / "agents" / "queue" / f"{lease.job_id}-{lease.adw_id}.log"
+            success, error = run_phase(queue, lease, worktree, log_file, lease_seconds)
+
+        status = queue.complete(lease, success, error)
+        print(f"{'✅' if success else '❌'} {label}{': ' + error if error else ''} → job {status}", flush=True)
+        if status in ("done", "failed") and worktree.is_dir():
+            row = {"adw_id": lease.adw_id, "worktree": str(worktree),
+                   "returncode": 0 if status == "done" else 1}
+            finish_pipeline(row, root, base, cleanup=True)
+        completed += 1
+    return completed
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Queue - Durable SDLC job queue")
+    sub = parser.add_subparsers(dest="action", required=True)
+
+    enqueue = sub.add_parser("enqueue", help="Queue SDLC runs for issues")
+    enqueue.add_argument("issue_numbers", type=int, nargs="+")
+    enqueue.add_argument("--priority", type=int, default=0, help="Higher runs first")
+    enqueue.add_argument("--skip-test", action="store_true", help="Skip test phase")
+    enqueue.add_argument("--skip-review", action="store_true", help="Skip review phase")
+    enqueue.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+
+    worker = sub.add_parser("work", help="Run queued phases")
+    worker.add_argument("--jobs", type=int, default=1, help="Worker threads in this process")
+    worker.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS, help="Lease seconds")
+    worker.add_argument("--once", action="store_true", help="Exit when no phase is runnable")
+    worker.add_argument("--base", default="origin/main", help="Ref new worktrees start from")
+
+    listing = sub.add_parser("list", help="Show jobs and phase status")
+    listing.add_argument("--status", choices=["queued", "running", "done", "failed"])
+
+    sub.add_parser("requeue", help="Requeue phases whose lease expired")
+    reset = sub.add_parser("reset", help="Rerun a job's unfinished phases with fresh attempts")
+    reset.add_argument("job_id", type=int)
+    args = parser.parse_args(argv)
+
+    queue = JobQueue()
+
+    if args.action == "enqueue":
+        phases = tuple(p for p in SDLC_PHASES
+                       if not (p == "test" and args.skip_test) and not (p == "review" and args.skip_review))
+        for number in args.issue_numbers:
+            job_id = queue.enqueue(number, phases, args.priority, max_attempts=args.max_attempts)
+            print(f"📥 Job {job_id}: #{number} ({' → '.join(phases)})")
+    elif args.action == "work":
+        root = repo_root()
+        base = args.base if resolve_ref(args.base, str(root)) else "HEAD"
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=work, args=(queue, root, base, args.lease, args.once, POLL_SECONDS, stop))
+            for _ in range(args.jobs)
+        ]
+        print(f"👷 {args.jobs} worker(s) on {queue.path}", flush=True)
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            print("\n🛑 Finishing running phases...")
+            stop.set()
+            for thread in threads:
+                thread.join()
+    elif args.action == "list":
+        for job in queue.jobs(args.status):
+            phases = " ".join(
+                f"{p['phase']}:{p['status']}" + (f"({p['attempts']})" if p["attempts"] > 1 else "")
+                for p in job["phases"]
+            )
+            print(f"{job['id']:>5}  #{job['issue_number']:<5} {job['adw_id']}  p{job['priority']:<3} "
+                  f"{job['status']:<8} {job['host'] or '-':<20} {phases}")
+    elif args.action == "requeue":
+        print(f"♻️  Requeued {queue.requeue_expired()} expired phase(s)")
+    else:
+        queue.reset(args.job_id)
+        print(f"♻️  Job {args.job_id} reset")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
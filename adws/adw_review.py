@@ -9,26 +9,24 @@ Usage:
 import sys
 import argparse
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from adw_modules.state import load_state
+from adw_modules.state import load_state, record_phase
 from adw_modules.agent import run_slash_command
 
 
-def main():
-    parser = argparse.ArgumentParser(description="ADW Review - Review implementation")
-    parser.add_argument("issue_number", type=int, help="GitHub issue number")
-    parser.add_argument("adw_id", help="ADW ID")
-    args = parser.parse_args()
-    
-    print(f"🔹 ADW ID: {args.adw_id}")
+def run(issue_number: int, adw_id: str) -> int:
+    """Run the review phase for an existing run."""
+    print(f"🔹 ADW ID: {adw_id}")
     
     # Load state
-    state = load_state(args.adw_id)
+    state = load_state(adw_id)
     if not state:
-        print(f"❌ No state found for {args.adw_id}")
+        print(f"❌ No state found for {adw_id}")
         return 1
+    record_phase(state, "review", "running")
     
     print(f"📄 Spec: {state.plan_file}")
     
@@ -36,20 +34,31 @@ def main():
     print("🤖 Running reviewer...")
     success, output = run_slash_command(
         "/review",
-        [args.adw_id, state.plan_file, "reviewer"],
-        output_file=f"agents/{args.adw_id}/reviewer/raw_output.txt"
+        [adw_id, state.plan_file, "reviewer"],
+        output_file=f"agents/{adw_id}/reviewer/raw_output.txt",
+        adw_id=adw_id
     )
     
     if success:
         print("✅ Review complete")
         print("\n📋 Next Steps:")
-        print(f"  1. Check results in agents/{args.adw_id}/reviewer/")
-        print(f"  2. Create PR: python adws/adw_pr.py {args.issue_number} {args.adw_id}")
+        print(f"  1. Check results in agents/{adw_id}/reviewer/")
+        print(f"  2. Create PR: python adws/adw_pr.py {issue_number} {adw_id}")
     else:
         print("⚠️  Review found issues")
     
+    record_phase(state, "review", "done" if success else "failed")
     return 0 if success else 1
 
 
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Review - Review implementation")
+    parser.add_argument("issue_number", type=int, help="GitHub issue number")
+    parser.add_argument("adw_id", help="ADW ID")
+    args = parser.parse_args(argv)
+    
+    return run(args.issue_number, args.adw_id)
+
+
 if __name__ == "__main__":
     sys.exit(main())
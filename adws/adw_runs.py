@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+ADW Runs - Query the run-state store.
+
+Usage:
+    python adws/adw_runs.py list [--issue N] [--branch NAME] [--phase PHASE]
+        [--status running|done|failed] [--since 2d] [--limit 20] [--json]
+    python adws/adw_runs.py show <adw-id>
+    python adws/adw_runs.py usage [--since 1d] [--json]
+    python adws/adw_runs.py import [--agents-dir agents]
+
+`usage` summarizes provider calls per phase: latency, time to first output,
+turns and tokens. `import` loads existing agents/*/adw_state.json files
+into the store.
+"""
+
+import sys
+import argparse
+import json
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from adw_modules.state import get_store, load_state
+from adw_modules.utils import percentile
+
+
+UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_since(value: str) -> float:
+    """`30m`/`12h`/`2d`/`1w` ago, or an ISO date/time, as a Unix timestamp."""
+    match = re.fullmatch(r"(\d+)([mhdw])", value)
+    if match:
+        return time.time() - int(match.group(1)) * UNITS[match.group(2)]
+    return datetime.fromisoformat(value).timestamp()
+
+
+def summarize_calls(calls: list) -> list:
+    """Per-phase totals and latency percentiles of provider calls."""
+    groups = {}
+    for call in calls:
+        groups.setdefault(call.phase or "-", []).append(call)
+    rows = []
+    for phase, group in sorted(groups.items()):
+        latencies = [c.latency_seconds for c in group]
+        first_outputs = [c.first_output_seconds for c in group if c.first_output_seconds is not None]
+        turns = [c.turns for c in group if c.turns is not None]
+        rows.append({
+            "phase": phase,
+            "calls": len(group),
+            "failed": sum(1 for c in group if not c.success),
+            # Usage of these calls is partial
+            "truncated": sum(1 for c in group if c.truncated),
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "first_output_p50": percentile(first_outputs, 50),
+            "turns_mean": round(sum(turns) / len(turns), 1) if turns else None,
+            "input_tokens": sum(c.input_tokens or 0 for c in group),
+            "output_tokens": sum(c.output_tokens or 0 for c in group),
+            "cache_read_tokens": sum(c.cache_read_tokens or 0 for c in group),
+            "cost_usd": round(sum(c.cost_usd or 0 for c in group), 4),
+        })
+    return rows
+
+
+def _seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}s"
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Runs - Query run state")
+    sub = parser.add_subparsers(dest="action", required=True)
+
+    listing = sub.add_parser("list", help="List runs, most recent first")
+    listing.add_argument("--issue", type=int, help="Issue number")
+    listing.add_argument("--branch", help="Branch name")
+    listing.add_argument("--phase", choices=["plan", "build", "test", "review", "pr"])
+    listing.add_argument("--status", choices=["running", "done", "failed"])
+    listing.add_argument("--since", type=parse_since, help="e.g. 2d, 12h, 2025-01-31")
+    listing.add_argument("--limit", type=int, default=50)
+    listing.add_argument("--json", action="store_true", help="Print JSON lines")
+
+    show = sub.add_parser("show", help="Print one run's state as JSON")
+    show.add_argument("adw_id")
+
+    usage = sub.add_parser("usage", help="Summarize provider calls per phase")
+    usage.add_argument("--since", type=parse_since, default="1d", help="e.g. 1d (default), 12h, 2025-01-31")
+    usage.add_argument("--json", action="store_true", help="Print JSON lines")
+
+    importer = sub.add_parser("import", help="Load adw_state.json files into the store")
+    importer.add_argument("--agents-dir", default="agents")
+    args = parser.parse_args(argv)
+
+    store = get_store()
+    if args.action == "list":
+        rows = store.find(issue_number=args.issue, branch_name=args.branch, phase=args.phase,
+                          status=args.status, since=args.since, limit=args.limit)
+        for row in rows:
+            state = row["state"]
+            updated = datetime.fromtimestamp(row["updated_at"]).strftime("%Y-%m-%d %H:%M")
+            if args.json:
+                print(json.dumps(dict(state.model_dump(mode="json"), updated_at=row["updated_at"])))
+            else:
+                print(f"{state.adw_id}  #{state.issue_number or '-':<5} {state.phase or '-':<7} "
+                      f"{state.status or '-':<8} {updated}  {state.branch_name or ''}")
+    elif args.action == "show":
+        state = load_state(args.adw_id)
+        if not state:
+            print(f"❌ No state found for {args.adw_id}")
+            return 1
+        data = state.model_dump(mode="json")
+        data["provider_calls"] = [call.model_dump(mode="json") for call in store.calls(adw_id=args.adw_id)]
+        print(json.dumps(data, indent=2))
+    elif args.action == "usage":
+        for row in summarize_calls(store.calls(since=args.since)):
+            if args.json:
+                print(json.dumps(row))
+            else:
+                print(f"{row['phase']:<7} {row['calls']:>5} calls {row['failed']:>3} failed "
+                      f"{row['truncated']:>3} stopped early  "
+                      f"p50 {_seconds(row['latency_p50']):>7} p95 {_seconds(row['latency_p95']):>7}  "
+                      f"first output {_seconds(row['first_output_p50']):>6}  turns {row['turns_mean'] or '-':>5}  "
+                      f"tokens {row['input_tokens']:>9} in {row['output_tokens']:>8} out  ${row['cost_usd']:.2f}")
+    else:
+        print(f"📥 Imported {store.import_json(Path(args.agents_dir))} run(s) into {store.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,94 +3,133 @@
 ADW SDLC - Complete Software Development Life Cycle.
 
 Usage:
-    python adws/adw_sdlc.py <issue-number>
+    python adws/adw_sdlc.py <issue-number> [--resume] [--adw-id ID]
+
+With --resume, phases of the issue's latest run (or --adw-id) whose inputs
+are unchanged since they completed are skipped; the run restarts at the
+first incomplete or invalidated phase.
+
+Each run is traced: a timing waterfall is printed at the end and the spans
+are written to agents/<adw-id>/trace.jsonl.
 """
 
 import sys
-import subprocess
 import argparse
 from pathlib import Path
+from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).parent))
 
-def main():
-    parser = argparse.ArgumentParser(description="ADW SDLC - Complete workflow")
-    parser.add_argument("issue_number", type=int, help="GitHub issue number")
-    parser.add_argument("--skip-test", action="store_true", help="Skip test phase")
-    parser.add_argument("--skip-review", action="store_true", help="Skip review phase")
-    args = parser.parse_args()
+
+def run(
+    issue_number: int,
+    skip_test: bool = False,
+    skip_review: bool = False,
+    adw_id: Optional[str] = None,
+    resume: bool = False,
+) -> int:
+    """Run every SDLC phase in this process, recording a checkpoint per phase."""
+    from adw_modules.checkpoints import PhaseTracker, latest_run
+    from adw_modules.tracing import trace, format_waterfall, get_trace_path
     
     print("=" * 60)
     print("ADW SDLC - Complete Workflow")
     print("=" * 60)
     
+    if resume:
+        adw_id = adw_id or latest_run(issue_number)
+        if adw_id:
+            print(f"♻️  Resuming {adw_id}")
+        else:
+            print(f"⚠️  No previous run for #{issue_number}, starting fresh")
+    tracker = PhaseTracker(issue_number, adw_id, resume)
+    
+    with trace(adw_id) as tracer:
+        try:
+            return _run_phases(tracker, issue_number, skip_test, skip_review)
+        finally:
+            if tracer.spans:
+                print("\n⏱️  Timing")
+                print(format_waterfall(tracer.spans))
+                if tracker.adw_id:
+                    print(f"📈 Trace: {get_trace_path(tracker.adw_id)}")
+
+
+def _run_phases(tracker, issue_number: int, skip_test: bool, skip_review: bool) -> int:
+    # Phase modules pull in pydantic/requests, so import them on demand
+    import adw_plan
+    import adw_build
+    import adw_test
+    import adw_review
+    import adw_pr
+    from adw_modules.tracing import bind_trace
+    from adw_modules.watchdog import phase_budget
+    
+    adw_id = tracker.adw_id
+    
     # Step 1: Plan
     print("\n📋 PHASE 1: PLAN")
     print("-" * 40)
-    result = subprocess.run(
-        ["python3", "adws/adw_plan.py", str(args.issue_number)],
-        capture_output=False
-    )
+    if tracker.fresh("plan"):
+        print("⏭️  Unchanged since last run")
+    else:
+        with phase_budget("plan"):
+            adw_id = tracker.run("plan", adw_plan.run, issue_number, adw_id)
     
-    if result.returncode != 0:
+    if not adw_id:
         print("\n❌ Planning failed")
         return 1
-    
-    # Get ADW ID
-    agents_dir = Path("agents")
-    adw_ids = sorted([d.name for d in agents_dir.iterdir() if d.is_dir()]) if agents_dir.exists() else []
-    if not adw_ids:
-        print("\n❌ Could not find ADW ID")
-        return 1
-    adw_id = adw_ids[-1]
+    bind_trace(adw_id)
     
     # Step 2: Build
     print("\n🔨 PHASE 2: BUILD")
     print("-" * 40)
-    result = subprocess.run(
-        ["python3", "adws/adw_build.py", str(args.issue_number), adw_id],
-        capture_output=False
-    )
-    
-    if result.returncode != 0:
-        print("\n❌ Build failed")
-        return 1
+    if tracker.fresh("build"):
+        print("⏭️  Unchanged since last run")
+    else:
+        with phase_budget("build"):
+            build_status = tracker.run("build", adw_build.run, issue_number, adw_id)
+        if build_status != 0:
+            print("\n❌ Build failed")
+            return 1
     
     # Step 3: Test (optional)
-    if not args.skip_test:
+    if skip_test:
+        print("\n⏭️  PHASE 3: TEST (skipped)")
+    else:
         print("\n🧪 PHASE 3: TEST")
         print("-" * 40)
-        result = subprocess.run(
-            ["python3", "adws/adw_test.py", str(args.issue_number), adw_id],
-            capture_output=False
-        )
-        
-        if result.returncode != 0:
-            print("\n❌ Tests failed")
-            return 1
-    else:
-        print("\n⏭️  PHASE 3: TEST (skipped)")
+        if tracker.fresh("test"):
+            print("⏭️  Unchanged since last run")
+        else:
+            with phase_budget("test"):
+                test_status = tracker.run("test", adw_test.run, issue_number, adw_id)
+            if test_status != 0:
+                print("\n❌ Tests failed")
+                return 1
     
     # Step 4: Review (optional)
-    if not args.skip_review:
+    if skip_review:
+        print("\n⏭️  PHASE 4: REVIEW (skipped)")
+    else:
         print("\n👁️  PHASE 4: REVIEW")
         print("-" * 40)
-        result = subprocess.run(
-            ["python3", "adws/adw_review.py", str(args.issue_number), adw_id],
-            capture_output=False
-        )
-        
-        if result.returncode != 0:
-            print("\n⚠️  Review found issues")
-    else:
-        print("\n⏭️  PHASE 4: REVIEW (skipped)")
+        if tracker.fresh("review"):
+            print("⏭️  Unchanged since last run")
+        else:
+            with phase_budget("review"):
+                review_status = tracker.run("review", adw_review.run, issue_number, adw_id)
+            if review_status != 0:
+                print("\n⚠️  Review found issues")
     
     # Step 5: PR
     print("\n📝 PHASE 5: PULL REQUEST")
     print("-" * 40)
-    result = subprocess.run(
-        ["python3", "adws/adw_pr.py", str(args.issue_number), adw_id],
-        capture_output=False
-    )
+    if tracker.fresh("pr"):
+        print("⏭️  Unchanged since last run")
+    else:
+        with phase_budget("pr"):
+            tracker.run("pr", adw_pr.run, issue_number, adw_id)
     
     print("\n" + "=" * 60)
     print("✅ SDLC Complete!")
@@ -100,5 +139,18 @@ def main():
     return 0
 
 
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW SDLC - Complete workflow")
+    parser.add_argument("issue_number", type=int, help="GitHub issue number")
+    parser.add_argument("--skip-test", action="store_true", help="Skip test phase")
+    parser.add_argument("--skip-review", action="store_true", help="Skip review phase")
+    parser.add_argument("--adw-id", help="ADW ID to plan under (optional)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip phases whose inputs are unchanged since they completed")
+    args = parser.parse_args(argv)
+    
+    return run(args.issue_number, args.skip_test, args.skip_review, args.adw_id, args.resume)
+
+
 if __name__ == "__main__":
     sys.exit(main())
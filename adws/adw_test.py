@@ -3,109 +3,152 @@
 ADW Test - Run test suite.
 
 Usage:
-    python adws/adw_test.py <issue-number> <adw-id>
+    python adws/adw_test.py <issue-number> <adw-id> [--parallel] [--jobs N]
+                            [--changed-only [--base origin/main]] [--no-cache]
 """
 
 import sys
 import argparse
-import subprocess
 import json
+import shlex
+from dataclasses import replace
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from adw_modules.state import load_state
+from adw_modules.state import load_state, record_phase
+from adw_modules.checks import (
+    Check,
+    CheckRunner,
+    check_cache_enabled,
+    default_workers,
+    get_check_cache,
+    load_checks,
+    run_checks_parallel,
+)
+from adw_modules.impact import Selection, select_tests
 
 
-def run_test(name: str, command: str, purpose: str) -> dict:
+def run_test(check: Check, runner: Optional[CheckRunner] = None) -> dict:
     """Run a single test."""
-    print(f"  ▶️  {name}...", end=" ")
-    
-    try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-        
-        passed = result.returncode == 0
+    print(f"  ▶️  {check.name}...", end=" ", flush=True)
+    result = (runner or CheckRunner()).run(check)
+    print(f"{_status_icon(result)} ({_timing(result)})")
+    return result
+
+
+def _timing(result: dict) -> str:
+    if result.get("cached"):
+        return "cached"
+    return f"{result['duration_seconds']:.1f}s"
+
+
+def _status_icon(result: dict) -> str:
+    if result.get("cached"):
+        return "♻️"
+    if result["passed"]:
+        return "✅"
+    error = result.get("error", "")
+    if error.startswith("Test timed out"):
+        return "⏱️"
+    if error == "Cancelled":
+        return "⏹️"
+    return "❌"
+
+
+def run_sequential(checks: list, runner: Optional[CheckRunner] = None) -> list:
+    """Run checks one after another, stopping on the first failure."""
+    results = []
+    for check in checks:
+        result = run_test(check, runner)
+        results.append(result)
         
-        if passed:
-            print("✅")
-            return {
-                "test_name": name,
-                "passed": True,
-                "execution_command": command,
-                "test_purpose": purpose
-            }
-        else:
-            print("❌")
-            return {
-                "test_name": name,
-                "passed": False,
-                "execution_command": command,
-                "test_purpose": purpose,
-                "error": result.stderr[:500] if result.stderr else "Test failed"
-            }
-            
-    except subprocess.TimeoutExpired:
-        print("⏱️")
-        return {
-            "test_name": name,
-            "passed": False,
-            "execution_command": command,
-            "test_purpose": purpose,
-            "error": "Test timed out after 5 minutes"
-        }
-    except Exception as e:
-        print(f"💥 {e}")
-        return {
-            "test_name": name,
-            "passed": False,
-            "execution_command": command,
-            "test_purpose": purpose,
-            "error": str(e)
-        }
-
-
-def main():
-    parser = argparse.ArgumentParser(description="ADW Test - Run test suite")
-    parser.add_argument("issue_number", type=int, help="GitHub issue number")
-    parser.add_argument("adw_id", help="ADW ID")
-    args = parser.parse_args()
+        # Stop on first failure
+        if not result["passed"]:
+            print(f"\n⛔ Stopping: {check.name} failed")
+            break
+    return results
+
+
+def run_parallel(checks: list, jobs: Optional[int] = None, runner: Optional[CheckRunner] = None) -> list:
+    """Run independent checks side by side, cancelling the rest on failure."""
+    jobs = jobs or default_workers(checks)
+    print(f"  ⚡ Running {len(checks)} checks on {jobs} workers")
     
-    print(f"🔹 ADW ID: {args.adw_id}")
+    def report(check: Check, result: dict):
+        print(f"  {_status_icon(result)} {check.name} ({_timing(result)})")
+    
+    results = run_checks_parallel(checks, max_workers=jobs, on_result=report, runner=runner)
+    
+    failed = [r for r in results if not r["passed"]]
+    if failed:
+        print(f"\n⛔ Stopping: {failed[0]['test_name']} failed")
+    return results
+
+
+def scope_checks(checks: list, selection: Selection) -> list:
+    """Narrow the lint and unit test checks to the selected files."""
+    if selection.full:
+        return checks
+    
+    scoped = []
+    for check in checks:
+        if check.key == "unit":
+            if not selection.tests:
+                print(f"  ⏭️  {check.name}: no affected tests")
+                continue
+            files = " ".join(shlex.quote(path) for path in selection.tests)
+            check = replace(check, command=f"pnpm exec vitest run {files}")
+        elif check.key == "lint":
+            if not selection.lint_files:
+                print(f"  ⏭️  {check.name}: no changed source files")
+                continue
+            files = " ".join(shlex.quote(path) for path in selection.lint_files)
+            check = replace(check, command=f"pnpm exec eslint {files}")
+        scoped.append(check)
+    return scoped
+
+
+def run(
+    issue_number: int,
+    adw_id: str,
+    parallel: bool = False,
+    jobs: Optional[int] = None,
+    changed_only: bool = False,
+    base: str = "origin/main",
+    use_cache: bool = True,
+) -> int:
+    """Run the test phase for an existing run."""
+    print(f"🔹 ADW ID: {adw_id}")
     
     # Load state
-    state = load_state(args.adw_id)
+    state = load_state(adw_id)
     if not state:
-        print(f"❌ No state found for {args.adw_id}")
+        print(f"❌ No state found for {adw_id}")
         return 1
+    record_phase(state, "test", "running")
     
     print("🧪 Running test suite...\n")
     
-    # Define tests
-    tests = [
-        ("TypeScript Check", "pnpm tsc --noEmit", "Validate TypeScript types"),
-        ("Lint Check", "pnpm lint", "Check code quality"),
-        ("Unit Tests", "pnpm test", "Run unit tests"),
-        ("Build Test", "pnpm build", "Verify production build"),
-    ]
-    
-    results = []
-    for name, command, purpose in tests:
-        result = run_test(name, command, purpose)
-        results.append(result)
-        
-        # Stop on first failure
-        if not result["passed"]:
-            print(f"\n⛔ Stopping: {name} failed")
-            break
+    checks = load_checks()
+    if changed_only:
+        selection = select_tests(base)
+        if selection.full:
+            print(f"  🔁 Full suite: {selection.reason}")
+        else:
+            print(f"  🎯 {len(selection.tests)} affected tests, "
+                  f"{len(selection.lint_files)} files to lint ({selection.reason})")
+        checks = scope_checks(checks, selection)
+    cache = get_check_cache() if use_cache and check_cache_enabled() else None
+    runner = CheckRunner(cache=cache)
+    if parallel:
+        results = run_parallel(checks, jobs, runner)
+    else:
+        results = run_sequential(checks, runner)
     
     # Save results
-    results_file = f"agents/{args.adw_id}/test_results.json"
+    results_file = f"agents/{adw_id}/test_results.json"
     Path(results_file).parent.mkdir(parents=True, exist_ok=True)
     with open(results_file, "w") as f:
         json.dump(results, f, indent=2)
@@ -113,16 +156,38 @@ def main():
     # Summary
     passed = sum(1 for r in results if r["passed"])
     total = len(results)
-    print(f"\n📊 Results: {passed}/{total} passed")
+    wall_time = sum(r["duration_seconds"] for r in results)
+    cached = sum(1 for r in results if r.get("cached"))
+    print(f"\n📊 Results: {passed}/{total} passed, {cached} cached ({wall_time:.1f}s of check time)")
     
-    if passed == total:
+    if passed == total == len(checks):
+        record_phase(state, "test", "done")
         print("\n📋 Next Steps:")
-        print(f"  1. Review: python adws/adw_review.py {args.issue_number} {args.adw_id}")
+        print(f"  1. Review: python adws/adw_review.py {issue_number} {adw_id}")
         return 0
     else:
+        record_phase(state, "test", "failed")
         print("\n⚠️  Fix failing tests before continuing")
         return 1
 
 
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Test - Run test suite")
+    parser.add_argument("issue_number", type=int, help="GitHub issue number")
+    parser.add_argument("adw_id", help="ADW ID")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run independent checks concurrently")
+    parser.add_argument("--jobs", type=int, help="Worker count for --parallel (default: CPU count)")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="Only run tests and lint affected by changes since --base")
+    parser.add_argument("--base", default="origin/main", help="Base ref for --changed-only")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always run checks, ignoring cached passes")
+    args = parser.parse_args(argv)
+    
+    return run(args.issue_number, args.adw_id, args.parallel, args.jobs,
+               args.changed_only, args.base, not args.no_cache)
+
+
 if __name__ == "__main__":
     sys.exit(main())
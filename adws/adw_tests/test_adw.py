@@ -2,10 +2,14 @@
 """Tests for ADW system."""
 
 import sys
+import tempfile
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from adw_modules.utils import generate_adw_id, slugify, generate_branch_name, classify_issue
+from adw_modules import classify
+import adw_bench
+import adw_microbench
 
 
 def test_generate_adw_id():
@@ -41,6 +45,78 @@ def test_classify_issue():
     print("✅ test_classify_issue passed")
 
 
+def test_classify_issues_batch():
+    """Batch classification parses JSON and falls back per issue."""
+    issues = [
+        classify.issue_from_dict({"number": 1, "title": "Login crashes", "body": ""}),
+        classify.issue_from_dict({"number": 2, "title": "Add export", "labels": ["chore"]}),
+        classify.issue_from_dict({"number": 3, "title": "Fix typo", "body": ""}),
+    ]
+    responses = [
+        'Here you go:\n```json\n[{"number": 1, "class": "/bug"}, {"number": 2, "class": "/feature"}]\n```',
+        "I could not decide.",
+    ]
+    calls = []
+    
+    def fake_run(command, args):
+        calls.append(command)
+        return True, responses[len(calls) - 1]
+    
+    saved = classify.run_slash_command
+    classify.run_slash_command = fake_run
+    try:
+        rows = classify.classify_issues(issues)
+        unparsed = classify.classify_issues(issues[:1])
+    finally:
+        classify.run_slash_command = saved
+    
+    assert len(calls) == 2
+    assert [(r["issue_class"], r["source"]) for r in rows] == [
+        ("/bug", "provider"), ("/feature", "provider"), ("/bug", "keyword"),
+    ]
+    assert rows[2]["branch_name"] == "fix-3-fix-typo"
+    assert unparsed[0]["source"] == "keyword"
+    assert classify.parse_batch_response('[{"number": 4, "class": "/patch"}]') == {}
+    print("✅ test_classify_issues_batch passed")
+
+
+def test_microbench_flags_regressions():
+    """Benchmark results are compared with the baseline, which covers every case."""
+    suite = adw_microbench.run_suite(["small"], pattern="slugify", min_time=0.001, repeat=1)
+    [result] = suite["results"]
+    assert result["case"] == "slugify" and result["score"] > 0 and result["peak_bytes"] > 0
+    
+    same = {"cases": {"slugify@small": {"score": result["score"], "peak_bytes": result["peak_bytes"]}}}
+    assert adw_microbench.compare(suite["results"], same) == []
+    faster = {"cases": {"slugify@small": {"score": result["score"] / 3, "peak_bytes": result["peak_bytes"]}}}
+    assert [r.split(":")[0] for r in adw_microbench.compare(suite["results"], faster)] == ["slugify@small"]
+    leaner = {"cases": {"slugify@small": {"score": result["score"], "peak_bytes": 1}}}
+    assert "peak memory" in adw_microbench.compare(suite["results"], leaner)[0]
+    
+    stored = adw_microbench.load_baseline()["cases"]
+    expected = {f"{case.name}@{size}" for case in adw_microbench.CASES for size in adw_microbench.SIZES}
+    assert expected <= set(stored), f"baseline is missing {sorted(expected - set(stored))}"
+    print("✅ test_microbench_flags_regressions passed")
+
+
+def test_bench_drives_fake_issues_to_pull_requests():
+    """Every synthetic issue goes through the full pipeline and opens a PR."""
+    scenario = {**adw_bench.DEFAULT_SCENARIO, "latency": 0, "size": 2048, "commands": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        results = adw_bench.run_bench(issues=2, concurrency=(2,), scenario=scenario, workdir=Path(tmp))
+    [level] = results["levels"]
+    assert level["succeeded"] == 2 and level["failed"] == [], level["failed"]
+    assert results["pull_requests"] == 2
+    assert level["runs_per_hour"] > 0 and level["peak_rss_mb"] > 0
+    assert set(level["phase_seconds"]) == set(adw_bench.PHASES)
+    assert all(latency["p95"] is not None for latency in level["phase_seconds"].values())
+    
+    slower = {"levels": [{**level, "runs_per_hour": level["runs_per_hour"] * 2}]}
+    assert adw_bench.compare(results["levels"], slower)[0].startswith("concurrency 2:")
+    assert adw_bench.compare(results["levels"], results) == []
+    print("✅ test_bench_drives_fake_issues_to_pull_requests passed")
+
+
 def main():
     """Run all tests."""
     print("Running ADW tests...\n")
@@ -49,6 +125,9 @@ def main():
     test_slugify()
     test_generate_branch_name()
     test_classify_issue()
+    test_classify_issues_batch()
+    test_microbench_flags_regressions()
+    test_bench_drives_fake_issues_to_pull_requests()
     
     print("\n✅ All tests passed!")
     return 0
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Tests for the test-phase check runners."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adw_modules.cache import DiskCache
+from adw_modules.checks import Check, CheckRunner, run_checks_parallel
+from adw_modules.impact import affected_tests, needs_full_suite
+from adw_modules.limits import slot
+
+
+def test_parallel_checks_respect_dependencies():
+    """Independent checks overlap; dependents wait for their inputs."""
+    checks = [
+        Check("a", "A", "sleep 0.3", "first"),
+        Check("b", "B", "sleep 0.3", "independent"),
+        Check("c", "C", "true", "after a", depends_on=("a",)),
+    ]
+    order = []
+    start = time.monotonic()
+    results = run_checks_parallel(checks, max_workers=3, on_result=lambda c, r: order.append(c.key))
+    elapsed = time.monotonic() - start
+    
+    assert [r["passed"] for r in results] == [True, True, True]
+    assert order.index("c") > order.index("a")
+    assert elapsed < 0.55, f"checks did not overlap ({elapsed:.2f}s)"
+    assert all(r["duration_seconds"] >= 0 for r in results)
+    print("✅ test_parallel_checks_respect_dependencies passed")
+
+
+def test_parallel_checks_fail_fast():
+    """A failing blocking check cancels the others and skips dependents."""
+    checks = [
+        Check("fail", "Fail", "exit 3", "fails"),
+        Check("slow", "Slow", "sleep 5", "gets cancelled"),
+        Check("after", "After", "true", "never runs", depends_on=("fail",)),
+    ]
+    start = time.monotonic()
+    results = run_checks_parallel(checks, max_workers=3)
+    elapsed = time.monotonic() - start
+    
+    assert [r["test_name"] for r in results] == ["Fail"]
+    assert not results[0]["passed"]
+    assert elapsed < 2, f"slow check was not cancelled ({elapsed:.2f}s)"
+    print("✅ test_parallel_checks_fail_fast passed")
+
+
+def test_affected_tests_follow_imports():
+    """Tests are selected through alias, relative and mocked imports."""
+    files = {
+        "lib/db.ts": "export const prisma = {};\n",
+        "lib/services/stock.ts": 'import { prisma } from "../db";\n',
+        "lib/types/supplies.ts": "export type SupplyDTO = {};\n",
+        "app/components/List.tsx": 'import type { SupplyDTO } from "@/lib/types/supplies";\n',
+        "tests/services/stock.test.ts": 'import {\n  move,\n} from "@/lib/services/stock";\n',
+        "tests/components/List.test.tsx": 'import { List } from "@/app/components/List";\n',
+        "tests/api/health.test.ts": 'vi.mock("@/lib/db", () => ({}));\n',
+    }
+    with tempfile.TemporaryDirectory() as root:
+        for rel, text in files.items():
+            path = Path(root) / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        
+        assert affected_tests(["lib/db.ts"], root) == [
+            "tests/api/health.test.ts",
+            "tests/services/stock.test.ts",
+        ]
+        assert affected_tests(["lib/types/supplies.ts"], root) == ["tests/components/List.test.tsx"]
+        assert affected_tests(["README.md"], root) == []
+    
+    assert needs_full_suite("prisma/schema.prisma")
+    assert needs_full_suite("vitest.config.ts")
+    assert not needs_full_suite("lib/services/stock-movements.ts")
+    print("✅ test_affected_tests_follow_imports passed")
+
+
+def test_check_cache_reuses_passes():
+    """A pass is reused until the check's inputs change."""
+    with tempfile.TemporaryDirectory() as root:
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+        (Path(root) / "lib").mkdir()
+        (Path(root) / "lib" / "a.ts").write_text("export const a = 1;\n")
+        (Path(root) / "README.md").write_text("not an input\n")
+        
+        cache = DiskCache("checks", root=Path(root) / ".cache")
+        check = Check("unit", "Unit", "echo run >> runs.log", "count runs", inputs=("lib",))
+        
+        def run_once():
+            return CheckRunner(cwd=root, cache=cache).run(check)
+        
+        first = run_once()
+        assert first["passed"] and not first.get("cached")
+        second = run_once()
+        assert second["cached"] and second["cache_key"]
+        
+        (Path(root) / "README.md").write_text("still not an input\n")
+        assert run_once()["cached"]
+        
+        (Path(root) / "lib" / "a.ts").write_text("export const a = 2;\n")
+        assert not run_once().get("cached")
+        assert (Path(root) / "runs.log").read_text().count("run") == 2
+    print("✅ test_check_cache_reuses_passes passed")
+
+
+def test_disk_cache_evicts_least_recently_used():
+    """Entries past the size bound are evicted oldest-access first."""
+    import os
+    with tempfile.TemporaryDirectory() as root:
+        cache = DiskCache("lru", max_bytes=250, root=Path(root))
+        cache.put("aa1", "x" * 50)
+        cache.put("bb2", "y" * 50)
+        os.utime(cache._path("aa1"), (1, 1))
+        os.utime(cache._path("bb2"), (2, 2))
+        assert cache.get("aa1") == "x" * 50  # bumps aa1 past bb2
+        cache.put("cc3", "z" * 50)
+        
+        assert cache.get("bb2") is None
+        assert cache.get("aa1") is not None
+        assert cache.get("cc3") is not None
+        
+        cache.put("dd4", "ttl", ttl=-1)
+        assert cache.get("dd4") is None
+    print("✅ test_disk_cache_evicts_least_recently_used passed")
+
+
+def test_slots_cap_concurrency():
+    """Holders of a limited slot kind never exceed the limit."""
+    import os
+    import threading
+    
+    active = []
+    peak = []
+    lock = threading.Lock()
+    
+    def hold():
+        with slot("check"):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.1)
+            with lock:
+                active.pop()
+    
+    saved = {name: os.environ.get(name) for name in ("ADW_MAX_CHECK_JOBS", "ADW_LOCK_DIR")}
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["ADW_MAX_CHECK_JOBS"] = "2"
+        os.environ["ADW_LOCK_DIR"] = root
+        try:
+            threads = [threading.Thread(target=hold) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+    
+    assert max(peak) == 2
+    print("✅ test_slots_cap_concurrency passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running check runner tests...\n")
+    
+    test_parallel_checks_respect_dependencies()
+    test_parallel_checks_fail_fast()
+    test_affected_tests_follow_imports()
+    test_check_cache_reuses_passes()
+    test_disk_cache_evicts_least_recently_used()
+    test_slots_cap_concurrency()
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
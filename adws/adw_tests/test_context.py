@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Tests for the repository context index."""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adw_modules.cache import DiskCache
+from adw_modules.context import RepoIndex, build_index, format_digest, load_index
+from adw_modules.providers import KimiProvider
+
+
+def test_context_index_updates_incrementally():
+    """The index covers services, routes, models and tests, re-reading only changed files."""
+    files = {
+        "lib/db.ts": "export const prisma = {};\n",
+        "lib/services/stock.ts": 'import { prisma } from "../db";\nexport async function move() {}\n'
+                                 "export interface MoveInput {}\n",
+        "app/api/stock/[id]/route.ts": "export async function GET() {}\nexport const POST = () => {};\n",
+        "prisma/schema.prisma": "model Supply {\n  id String @id // key\n  name String\n\n  @@index([name])\n}\n"
+                                "enum Kind {\n  IN\n  OUT\n}\n",
+        "tests/services/stock.test.ts": 'import { move } from "@/lib/services/stock";\nvi.mock("@/lib/db");\n',
+    }
+    with tempfile.TemporaryDirectory() as root:
+        for rel, text in files.items():
+            path = Path(root) / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+        subprocess.run(git + ["add", "."], cwd=root, check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=root, check=True)
+        cache = DiskCache("context", root=Path(root) / ".cache")
+        
+        counts = {}
+        index = build_index(root, cache, counts=counts)
+        assert counts == {"parsed": 4, "reused": 0}
+        assert index.services == {"lib/services/stock.ts": ["function move", "interface MoveInput"]}
+        assert index.routes == {"app/api/stock/[id]/route.ts": ["GET", "POST"]}
+        assert index.models == {"Supply": ["id String @id", "name String"]}
+        assert index.enums == {"Kind": ["IN", "OUT"]}
+        assert index.tests == {"tests/services/stock.test.ts": ["lib/services/stock.ts", "lib/db.ts"]}
+        digest = format_digest(index)
+        assert "GET POST /api/stock/[id]" in digest and "- lib/: db.ts" in digest
+        assert "more directories" in format_digest(index, max_bytes=len(digest) - 20)
+        
+        # Every section is capped, so large repos stay within the budget
+        big = RepoIndex(
+            key="k", tree="t" * 40,
+            files=[f"lib/d{i}/f.ts" for i in range(500)],
+            services={f"lib/services/s{i:03d}.ts": [f"function f{j}" for j in range(200)] for i in range(100)},
+            routes={f"app/api/r{i}/route.ts": ["GET"] for i in range(100)},
+            models={f"M{i}": ["id String @id"] for i in range(100)},
+            tests={f"tests/t{i}.test.ts": [] for i in range(100)},
+        )
+        for limit in (6000, 2000, 300):
+            digest = format_digest(big, max_bytes=limit)
+            assert len(digest.encode()) <= limit, (limit, len(digest.encode()))
+        digest = format_digest(big, max_bytes=100_000)
+        assert "- ... 70 more files" in digest and "- ... 70 more tests" in digest
+        assert max(len(line.encode()) for line in digest.splitlines()) <= 300
+        assert "more routes" in format_digest(big)
+        
+        # An uncommitted edit changes the key and re-reads only that file
+        with open(Path(root) / "lib/services/stock.ts", "a") as f:
+            f.write("export class StockError extends Error {}\n")
+        edited = build_index(root, cache, counts=counts)
+        assert counts == {"parsed": 1, "reused": 3} and edited.key != index.key
+        assert edited.services["lib/services/stock.ts"][-1] == "class StockError"
+        
+        os.environ["ADW_CACHE_DIR"] = str(Path(root) / ".cache")
+        try:
+            assert load_index(root).key == edited.key
+            (Path(root) / "spec.md").write_text("# Spec 001: Move stock\n")
+            prompt = KimiProvider()._interpolate_command("/implement", [str(Path(root) / "spec.md"), "abc"], root)
+            assert "## Repository Context" in prompt and "class StockError" in prompt
+            os.environ["ADW_CONTEXT_INDEX"] = "0"
+            assert "## Repository Context" not in KimiProvider()._interpolate_command("/implement", ["x", "abc"], root)
+        finally:
+            os.environ.pop("ADW_CACHE_DIR")
+            os.environ.pop("ADW_CONTEXT_INDEX", None)
+    print("✅ test_context_index_updates_incrementally passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running context index tests...\n")
+    
+    test_context_index_updates_incrementally()
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
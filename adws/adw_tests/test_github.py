@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Tests for the GitHub client against the local stand-in."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adw_modules import github
+from adw_modules.cache import DiskCache
+from adw_modules.github_stub import GitHubStub
+
+
+def _client(stub: GitHubStub, cache_root: str, sleeps: list) -> github.GitHubClient:
+    return github.GitHubClient(
+        token="test-token",
+        repo_url=stub.repo_url,
+        api_url=stub.url,
+        cache=DiskCache("github", root=Path(cache_root)),
+        sleep=sleeps.append,
+    )
+
+
+def test_client_revalidates_with_etag():
+    """A repeated GET sends If-None-Match and is served from the cache on 304."""
+    with GitHubStub() as stub, tempfile.TemporaryDirectory() as root:
+        stub.add_issue(7, "Add login", "Users need accounts", labels=("feature",))
+        client = _client(stub, root, [])
+
+        first = client.get(client.repo_path("/issues/7"))
+        second = client.get(client.repo_path("/issues/7"))
+        assert not first.from_cache
+        assert second.from_cache
+        assert second.json()["title"] == "Add login"
+        assert "If-None-Match" not in stub.requests[0][2]
+        assert stub.requests[1][2]["If-None-Match"] == first.headers["ETag"]
+
+        stub.issues[7]["title"] = "Add login and logout"
+        assert client.get(client.repo_path("/issues/7")).json()["title"] == "Add login and logout"
+    print("✅ test_client_revalidates_with_etag passed")
+
+
+def test_client_backs_off_on_rate_limits():
+    """429s and secondary limits are retried, honouring Retry-After; 5xx only for idempotent requests."""
+    with GitHubStub() as stub, tempfile.TemporaryDirectory() as root:
+        stub.add_issue(1, "Fix crash")
+        sleeps = []
+        client = _client(stub, root, sleeps)
+
+        stub.fail_next(429, {"Retry-After": "3"})
+        stub.fail_next(403, body='{"message": "You have exceeded a secondary rate limit"}')
+        response = client.post(client.repo_path("/issues/1/comments"), json={"body": "hi"})
+        assert response.status_code == 201
+        assert len(sleeps) == 2
+        assert sleeps[0] == 3
+        assert len(stub.comments[1]) == 1
+
+        # A POST that may have gone through is not resent; a GET is
+        sleeps.clear()
+        stub.fail_next(502)
+        assert client.post(client.repo_path("/issues/1/comments"), json={"body": "again"}).status_code == 502
+        assert sleeps == [] and len(stub.comments[1]) == 1
+        stub.fail_next(502)
+        assert client.get(client.repo_path("/issues/1")).status_code == 200
+        assert len(sleeps) == 1
+
+        # Plain 404s and permission errors are final
+        sleeps.clear()
+        assert client.get(client.repo_path("/issues/99")).status_code == 404
+        stub.fail_next(403, body='{"message": "Resource not accessible"}')
+        assert client.get(client.repo_path("/issues/1")).status_code == 403
+        assert sleeps == []
+    print("✅ test_client_backs_off_on_rate_limits passed")
+
+
+def test_comments_paginate_concurrently():
+    """Comments stream in order across pages; the prompt budget keeps the newest."""
+    with GitHubStub() as stub, tempfile.TemporaryDirectory() as root:
+        stub.add_issue(5, "Long thread")
+        for i in range(230):
+            stub.add_comment(5, f"comment {i:03d}", login=f"user{i % 3}")
+        client = _client(stub, root, [])
+
+        comments = github.iter_comments(5, client, per_page=50, max_workers=2)
+        assert next(comments).body == "comment 000"
+        bodies = ["comment 000"] + [c.body for c in comments]
+        assert bodies == [f"comment {i:03d}" for i in range(230)]
+        pages = [r for r in stub.requests if r[1].endswith("/issues/5/comments")]
+        assert len(pages) == 5
+
+        recent = github.fetch_comments(5, max_bytes=40, client=client)
+        assert [c.body for c in recent] == ["comment 227", "comment 228", "comment 229"]
+        assert github.format_comments(recent).startswith("@user2 (")
+        stub.add_comment(5, "x" * 100)
+        assert github.fetch_comments(5, max_bytes=40, client=client)[-1].body == "x" * 40
+    print("✅ test_comments_paginate_concurrently passed")
+
+
+def test_bulk_fetch_uses_few_graphql_queries():
+    """fetch_issues gets issues, labels and first comments in batched queries."""
+    with GitHubStub() as stub, tempfile.TemporaryDirectory() as root:
+        for number in range(1, 8):
+            stub.add_issue(number, f"Issue {number}", labels=("bug",) if number % 2 else ())
+            for i in range(number):
+                stub.add_comment(number, f"note {i}")
+        client = _client(stub, root, [])
+
+        issues = github.fetch_issues([1, 2, 3, 4, 5, 6, 7, 42], comments=3, batch_size=5, client=client)
+        assert sorted(issues) == [1, 2, 3, 4, 5, 6, 7]
+        assert len(stub.requests) == 2
+        assert all(r[1] == "/graphql" for r in stub.requests)
+        assert issues[3].title == "Issue 3"
+        assert issues[3].state == "open"
+        assert [l.name for l in issues[3].labels] == ["bug"]
+        assert issues[4].labels == []
+        assert [c.body for c in issues[6].comments] == ["note 0", "note 1", "note 2"]
+    print("✅ test_bulk_fetch_uses_few_graphql_queries passed")
+
+
+def test_module_functions_use_shared_client():
+    """fetch_issue, post_comment and create_pull_request go through the stand-in."""
+    saved = {name: os.environ.get(name) for name in
+             ("GITHUB_API_URL", "GITHUB_REPO_URL", "GITHUB_PAT", "ADW_CACHE_DIR")}
+    with GitHubStub() as stub, tempfile.TemporaryDirectory() as root:
+        os.environ.update(GITHUB_API_URL=stub.url, GITHUB_REPO_URL=stub.repo_url,
+                          GITHUB_PAT="test-token", ADW_CACHE_DIR=root)
+        try:
+            stub.add_issue(3, "Export CSV", labels=("enhancement",))
+            stub.add_comment(3, "Use semicolons as the delimiter", login="pm")
+            issue = github.fetch_issue(3)
+            assert issue.title == "Export CSV"
+            assert issue.labels[0].name == "enhancement"
+            assert [c.body for c in issue.comments] == ["Use semicolons as the delimiter"]
+            assert github.post_comment(3, "🤖 working on it")
+            assert github.create_pull_request("feat-3", "feat: #3", "body").endswith("/pull/1001")
+            assert github.get_client() is github.get_client()
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+    print("✅ test_module_functions_use_shared_client passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running GitHub tests...\n")
+
+    test_client_revalidates_with_etag()
+    test_client_backs_off_on_rate_limits()
+    test_comments_paginate_concurrently()
+    test_bulk_fetch_uses_few_graphql_queries()
+    test_module_functions_use_shared_client()
+
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
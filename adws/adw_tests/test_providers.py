@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""Tests for provider execution and output handling."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adw_modules import agent
+from adw_modules.executor import stream_command
+from adw_modules.kimi import KimiStream, PlainText, TextPart, ToolCall, ToolResult, iter_events, parse_event
+from adw_modules.providers import ClaudeProvider, FakeProvider, KimiProvider, get_provider
+from adw_modules.state import StateStore
+from adw_modules.spec import SpecExtractor, extract_spec
+from adw_modules import fake, transcripts
+from adw_modules.watchdog import Watchdog, phase_budget
+
+
+def test_stream_command_bounds_memory():
+    """Full output goes to the artifact; only the tail stays in memory."""
+    script = "import sys\nfor i in range(2000):\n    print(f'line {i:04d}', flush=True)\n"
+    seen = []
+    with tempfile.TemporaryDirectory() as root:
+        artifact = Path(root) / "out" / "raw_output.txt"
+        result = stream_command(
+            [sys.executable, "-c", script],
+            output_file=str(artifact),
+            on_line=seen.append,
+            echo_prefix=None,
+            max_tail_bytes=100,
+        )
+        
+        assert result.returncode == 0
+        assert result.truncated
+        assert len(result.output) <= 100
+        assert result.output.endswith("line 1999")
+        assert len(seen) == 2000
+        assert artifact.read_text().splitlines()[0] == "line 0000"
+        assert len(artifact.read_text().splitlines()) == 2000
+    print("✅ test_stream_command_bounds_memory passed")
+
+
+def test_stream_command_passes_stdin():
+    """Input text reaches the child and stderr is merged into the output."""
+    script = "import sys\nprint(sys.stdin.read().upper())\nprint('oops', file=sys.stderr)\n"
+    result = stream_command([sys.executable, "-c", script], input_text="hello", echo_prefix=None)
+    assert result.returncode == 0
+    assert "HELLO" in result.output and "oops" in result.output
+    assert not result.truncated
+    print("✅ test_stream_command_passes_stdin passed")
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Orphans killed with the group may linger as zombies until reaped
+    stat = Path(f"/proc/{pid}/stat")
+    if stat.exists():
+        return stat.read_text().rsplit(")", 1)[1].split()[0] != "Z"
+    return True
+
+
+def test_watchdog_kills_silent_process_group():
+    """A silent process and the children it spawned are killed on idle timeout."""
+    script = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "print(child.pid, flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    start = time.monotonic()
+    result = stream_command(
+        [sys.executable, "-c", script],
+        echo_prefix=None,
+        watchdog=Watchdog(wall_timeout=30, idle_timeout=0.5),
+    )
+    elapsed = time.monotonic() - start
+    
+    assert result.timed_out == "no output for 0.5s"
+    assert elapsed < 10, f"watchdog fired late ({elapsed:.1f}s)"
+    child_pid = int(result.output.split()[0])
+    time.sleep(0.2)
+    assert not _alive(child_pid)
+    print("✅ test_watchdog_kills_silent_process_group passed")
+
+
+def test_watchdog_enforces_wall_and_phase_limits():
+    """Chatty processes still stop at the wall clock or the phase budget."""
+    script = "import time\nwhile True:\n    print('tick', flush=True)\n    time.sleep(0.05)\n"
+    result = stream_command(
+        [sys.executable, "-c", script],
+        echo_prefix=None,
+        watchdog=Watchdog(wall_timeout=0.5, idle_timeout=5),
+    )
+    assert result.timed_out == "exceeded 0.5s command timeout"
+    
+    with phase_budget("build", 0.5):
+        result = stream_command(
+            [sys.executable, "-c", script],
+            echo_prefix=None,
+            watchdog=Watchdog(wall_timeout=30, idle_timeout=5),
+        )
+    assert result.timed_out == "exhausted build phase budget"
+    print("✅ test_watchdog_enforces_wall_and_phase_limits passed")
+
+
+SPEC = "# Spec 001: Widgets\n\n**ADW ID:** abc12345\n\n## Summary\nAdd widgets.\n\n## Notes\nNone."
+
+
+def test_spec_extractor_formats():
+    """Plain, fenced and Kimi TextPart specs are found however output is chunked."""
+    outputs = {
+        "plain": f"Here is the spec:\n\n{SPEC}\n\nLet me know if you want changes.\n",
+        "fenced": f"Sure.\n```markdown\n{SPEC}\n```bash\nls\n```\n```\nThe spec is saved.\n",
+        "kimi": (
+            "TurnBegin(user_input='plan')\n"
+            "ThinkPart(type='think', think='Draft a # Spec header')\n"
+            f"TextPart(type='text', text={('Plan:' + chr(10) + SPEC)!r})\n"
+            "StatusUpdate(context_usage=0.2)\n"
+        ),
+    }
+    for name, output in outputs.items():
+        # Nested code blocks stay inside a fenced spec
+        expected = SPEC + "\n```bash\nls\n```" if name == "fenced" else SPEC
+        assert extract_spec(output) == expected, name
+        
+        extractor = SpecExtractor()
+        for i in range(0, len(output), 7):
+            extractor.feed(output[i:i + 7])
+        assert extractor.finish() == expected, name
+    
+    # A header with too little after it is not a spec
+    assert extract_spec("# Spec\nTBD\nLet me know if") == ""
+    
+    # Closing phrases only end the spec when they open a paragraph after a section
+    overview = SPEC.replace("## Summary\nAdd widgets.", "## Overview\n\nThis spec adds widgets.\nLet me know if in doubt.")
+    assert extract_spec(overview + "\n\nLet me know if this works.") == overview
+    extractor = SpecExtractor()
+    extractor.feed(f"{SPEC}\n\nLet me know if this works.\nMore chatter.\n")
+    assert not extractor.done and extractor.spec == SPEC
+    print("✅ test_spec_extractor_formats passed")
+
+
+def test_stream_command_stops_when_spec_complete():
+    """The command is killed once a fenced spec closes, but not on a closing phrase."""
+    script = (
+        "import time\n"
+        f"print('```markdown\\n' + {SPEC!r} + '\\n```', flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    extractor = SpecExtractor()
+    start = time.monotonic()
+    result = stream_command([sys.executable, "-c", script], echo_prefix=None, on_line=extractor.feed_line)
+    
+    assert result.stopped and not result.timed_out
+    assert time.monotonic() - start < 10
+    assert extractor.spec == SPEC
+    
+    script = f"print({SPEC!r} + '\\n\\nLet me know if this works.', flush=True)\nprint('bye')\n"
+    extractor = SpecExtractor()
+    result = stream_command([sys.executable, "-c", script], echo_prefix=None, on_line=extractor.feed_line)
+    assert not result.stopped and result.returncode == 0 and "bye" in result.output
+    assert extractor.finish() == SPEC
+    print("✅ test_stream_command_stops_when_spec_complete passed")
+
+
+KIMI_TRANSCRIPT = "\n".join([
+    "TurnBegin(user_input='plan it')",
+    "ThinkPart(type='think', think=\"it's (tricky\", encrypted=None)",
+    "ToolCall(type='function', id='tool_1', function=FunctionBody(name='Shell', arguments='{\"command\": \"ls )\"}'))",
+    "ToolResult(tool_call_id='tool_1', return_value=ToolOk(is_error=False, output='a\\nb', message=''))",
+    "TextPart(type='text', text='never closed",
+    "TextPart(",
+    "    type='text',",
+    "    text='Path C:\\\\new\\n# Spec 001: \\'Quoted\\''",
+    ")",
+    "StatusUpdate(context_usage=0.25, token_usage=TokenUsage(input=10, output=5))",
+    "To resume this session: kimi -r abc",
+    "",
+])
+
+
+def test_kimi_stream_typed_events():
+    """Kimi output becomes typed events, however it is chunked."""
+    events = list(iter_events(KIMI_TRANSCRIPT))
+    assert [e.kind for e in events] == [
+        "TurnBegin", "ThinkPart", "ToolCall", "ToolResult", "PlainText", "TextPart", "StatusUpdate", "PlainText",
+    ]
+    think, call, result, broken, text, status = events[1:7]
+    assert think.think == "it's (tricky"
+    assert isinstance(call, ToolCall) and call.name == "Shell" and call.arguments == '{"command": "ls )"}'
+    assert isinstance(result, ToolResult) and result.output == "a\nb" and not result.is_error
+    # An unterminated string does not swallow the events after it
+    assert isinstance(broken, PlainText) and broken.text.endswith("never closed")
+    assert isinstance(text, TextPart) and text.text == "Path C:\\new\n# Spec 001: 'Quoted'"
+    assert status.context_usage == 0.25 and status.token_usage["output"] == 5
+    
+    stream = KimiStream()
+    chunked = []
+    for i in range(0, len(KIMI_TRANSCRIPT), 5):
+        chunked += stream.feed(KIMI_TRANSCRIPT[i:i + 5])
+    assert chunked + stream.finish() == events
+    
+    # Unrequested kinds are skipped, or reported without their fields
+    assert [e.kind for e in iter_events(KIMI_TRANSCRIPT, kinds=("TextPart",))] == ["TextPart"]
+    bare = list(iter_events(KIMI_TRANSCRIPT, kinds=("TextPart",), bare_others=True))
+    assert len(bare) == 6 and bare[2].fields == {}
+    
+    assert KimiProvider()._parse_kimi_output(KIMI_TRANSCRIPT) == "# Spec 001: 'Quoted'"
+    print("✅ test_kimi_stream_typed_events passed")
+
+
+def test_kimi_stream_large_transcripts():
+    """Multi-megabyte and malformed transcripts parse in linear time."""
+    record = (
+        "ToolResult(tool_call_id='t', return_value=ToolOk(output=" + repr("x" * 4000) + "))\n"
+        "TextPart(type='text', text='step done')\n"
+    )
+    transcript = record * 1000
+    start = time.monotonic()
+    texts = [e.text for e in iter_events(transcript, kinds=("TextPart",))]
+    assert len(texts) == 1000 and texts[-1] == "step done"
+    
+    unterminated = "TextPart(type='text', text='" + "a" * 2_000_000
+    assert [e.kind for e in iter_events(unterminated)] == ["PlainText"]
+    unbalanced = "TextPart(\n" * 50_000
+    assert len(list(iter_events(unbalanced, kinds=("TextPart",)))) == 0
+    assert time.monotonic() - start < 10
+    print("✅ test_kimi_stream_large_transcripts passed")
+
+
+def test_kimi_escaped_strings_and_synthetic_transcripts():
+    """Escapes are honoured without regex backtracking; generated transcripts parse."""
+    text, extra = "it's \\", 'a\\"b\'c'
+    event = parse_event(f"TextPart(type='text', text={text!r}, extra={extra!r})")
+    assert event.text == text and event.fields["extra"] == extra
+    # Stray closers are skipped rather than stalling the parser
+    assert parse_event("TextPart(type='text', stray=], text='ok')").text == "ok"
+    # A backslash escaping the line break leaves the event unterminated
+    broken = "TextPart(type='text', text='cut\\\nTextPart(type='text', text='next')\n"
+    assert [e.text for e in iter_events(broken, kinds=("TextPart",))] == ["next"]
+    
+    escapes = transcripts.kimi_escapes(200_000)
+    [event] = iter_events(escapes, kinds=("TextPart",))
+    assert event.text.startswith("'\n\\'")
+    
+    spec = transcripts.synthetic_spec(2000)
+    assert KimiProvider()._parse_kimi_output(transcripts.kimi_transcript(50_000)).startswith("# Spec 001")
+    assert extract_spec(transcripts.kimi_transcript(50_000, text=spec)) == spec
+    assert extract_spec(transcripts.claude_text(20_000)).startswith("# Spec 001")
+    print("✅ test_kimi_escaped_strings_and_synthetic_transcripts passed")
+
+
+def test_kimi_tokenizer_adversarial_inputs():
+    """Unterminated strings, stray closers and escape runs stay bounded and terminate."""
+    # A 4 MB unterminated string is scanned once, not copied per line
+    unterminated = "TextPart(type='text', text='" + "a" * 4_000_000
+    tracemalloc.start()
+    try:
+        events = list(iter_events(unterminated))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert [e.kind for e in events] == ["PlainText"]
+    assert peak < 64 * 1024 * 1024, f"peak {peak} bytes"
+    
+    # Stray closers of every kind inside a call still terminate
+    start = time.monotonic()
+    for stray in ("]", "}", "]]", "}]"):
+        line = f"TextPart(type='text', stray={stray}, text='ok')\n"
+        assert parse_event(line).text == "ok"
+        assert [e.text for e in iter_events(line * 3, kinds=("TextPart",))] == ["ok"] * 3
+    # A closer for an outer opener ends the inner ones with it
+    unclosed = "TextPart(type='text', stray=[), text='ok')\nTextPart(type='text', text='next')\n"
+    assert [e.text for e in iter_events(unclosed, kinds=("TextPart",))] == ["", "next"]
+    # Nesting too deep to parse still frames as one event
+    nested = "TextPart(type='text', x=" + "[" * 100_000 + "]" * 100_000 + ")\nTextPart(type='text', text='next')\n"
+    assert [e.text for e in iter_events(nested, kinds=("TextPart",))] == ["", "next"]
+    stray_lines = "TextPart(type='text', x=])\n" * 20_000 + "TextPart(type='text', text='last')\n"
+    assert [e.text for e in iter_events(stray_lines, kinds=("TextPart",))][-1] == "last"
+    
+    # Escape-heavy strings: long backslash runs and escaped quotes
+    backslashes = "\\" * 500_000
+    event = parse_event(f"TextPart(type='text', text={backslashes!r})")
+    assert event.text == backslashes
+    quotes = "\\'" * 200_000
+    event = parse_event(f"TextPart(type='text', text={quotes!r})")
+    assert event.text == quotes
+    # An odd trailing backslash escapes the quote, so the string never closes
+    assert [e.kind for e in iter_events("TextPart(type='text', text='" + "\\" * 100_001 + "')")] == ["PlainText"]
+    assert time.monotonic() - start < 10
+    
+    # Many strings on one long line are scanned in linear time
+    [result, _] = iter_events(transcripts.kimi_strings(1000))
+    assert result.output[:3] == ["ab", "", "c'd"] and len(result.output) == 150
+    strings = transcripts.kimi_strings(2_000_000)
+    start = time.monotonic()
+    assert [e.text for e in iter_events(strings, kinds=("TextPart",))] == ["done"]
+    assert time.monotonic() - start < 3
+    print("✅ test_kimi_tokenizer_adversarial_inputs passed")
+
+
+FAKE_CLAUDE = """#!/usr/bin/env python3
+import json, sys, time
+assert "--output-format" in sys.argv and sys.argv[-1] == "/implement"
+sys.stdin.read()
+print("warning: not json", flush=True)
+time.sleep(0.2)
+def emit(event):
+    print(json.dumps(event), flush=True)
+emit({"type": "system", "subtype": "init", "session_id": "s1"})
+usage = {"input_tokens": 100, "output_tokens": 20}
+emit({"type": "assistant", "message": {"id": "m1", "usage": usage,
+      "content": [{"type": "text", "text": "Reading files"}, {"type": "tool_use", "name": "Read"}]}})
+emit({"type": "user", "message": {"content": [{"type": "tool_result", "content": "ok"}]}})
+emit({"type": "assistant", "message": {"id": "m2", "usage": usage,
+      "content": [{"type": "text", "text": "Done:\\n- edited app.py"}]}})
+emit({"type": "result", "subtype": "success", "is_error": False, "num_turns": 2,
+      "result": "Done:\\n- edited app.py", "total_cost_usd": 0.0125,
+      "usage": {"input_tokens": 200, "output_tokens": 40, "cache_read_input_tokens": 1000}})
+"""
+
+
+def test_fake_provider_scenarios_and_faults():
+    """The fake CLI follows its scenario: format, latency, edits and injected faults."""
+    saved = {name: os.environ.get(name) for name in ("AI_PROVIDER", "ADW_FAKE_SCENARIO", "ADW_IDLE_TIMEOUT")}
+    
+    def play(scenario, command="/implement", args=("specs/001.md", "abc"), cwd=None):
+        os.environ["ADW_FAKE_SCENARIO"] = json.dumps({"size": 3000, "seed": 7, **scenario})
+        provider = get_provider()
+        return (*provider.run_command(command, list(args), working_dir=cwd), provider.last_call)
+    
+    try:
+        os.environ["AI_PROVIDER"] = "fake"
+        os.environ["ADW_IDLE_TIMEOUT"] = "1"
+        assert isinstance(get_provider(), FakeProvider)
+        # The fake CLI shares the command names without importing agent.py
+        loaded = subprocess.run(
+            [sys.executable, "-c", "import sys, adw_modules.fake; print('adw_modules.agent' in sys.modules)"],
+            cwd=Path(__file__).parent.parent, capture_output=True, text=True,
+        )
+        assert loaded.stdout.strip() == "False", loaded.stderr
+        
+        prompt = "Issue Title: Widget\n\n# Spec 007: Widget\n"
+        for output_format in fake.FORMATS:
+            ok, output, call = play({"format": output_format}, agent.SPEC_COMMAND, [prompt])
+            assert ok and extract_spec(output).startswith("# Spec 007: Widget"), output_format
+        assert call.provider == "fake"
+        
+        with tempfile.TemporaryDirectory() as root:
+            edits = [{"path": "app/widget.ts", "content": "export const widget = 1\n"}]
+            ok, output, call = play({"latency": "fixed:0.3", "commands": {"/implement": {"edits": edits}}},
+                                    cwd=root)
+            assert ok and output.endswith("- app/widget.ts")
+            assert (Path(root) / "app/widget.ts").read_text() == "export const widget = 1\n"
+            assert call.latency_seconds >= 0.3 and call.turns and call.input_tokens
+        
+        ok, output, _ = play({"faults": {"exit": 1}, "exit_code": 3})
+        assert not ok
+        ok, output, _ = play({"format": "kimi", "faults": {"garbage": 1}})
+        assert ok and "# Spec" not in extract_spec(output)
+        ok, output, _ = play({"format": "claude-text", "faults": {"partial": 1}})
+        assert ok and "Done: /implement" not in output
+        start = time.monotonic()
+        ok, output, _ = play({"faults": {"hang": 1}})
+        assert not ok and "timed out" in output and time.monotonic() - start < 10
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    
+    rng = fake.make_rng({"seed": 1}, "/implement", "")
+    assert fake.sample_latency(2, rng) == 2.0
+    assert 1 <= fake.sample_latency("uniform:1,2", rng) <= 2
+    samples = sorted(fake.sample_latency("lognormal:5,0.5", rng) for _ in range(2001))
+    assert 4 < samples[1000] < 6
+    print("✅ test_fake_provider_scenarios_and_faults passed")
+
+
+def test_claude_stream_json_records_usage():
+    """stream-json output yields the answer text plus timing and token usage."""
+    saved_path, saved_db = os.environ.get("CLAUDE_CODE_PATH"), os.environ.get("ADW_STATE_DB")
+    saved_provider = agent.get_provider
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            cli = Path(root) / "claude"
+            cli.write_text(FAKE_CLAUDE)
+            cli.chmod(0o755)
+            os.environ["CLAUDE_CODE_PATH"] = str(cli)
+            os.environ["ADW_STATE_DB"] = str(Path(root) / "state.db")
+            agent.get_provider = ClaudeProvider
+            
+            lines = []
+            success, output = agent.run_slash_command(
+                "/implement", ["spec.md", "abc12345"], working_dir=root,
+                output_file=str(Path(root) / "raw_output.txt"), on_line=lines.append, adw_id="abc12345",
+            )
+            assert success and output == "Done:\n- edited app.py"
+            assert lines == ["Reading files", "Done:", "- edited app.py"]
+            assert '"type": "result"' in (Path(root) / "raw_output.txt").read_text()
+            
+            calls = StateStore(Path(root) / "state.db").calls(adw_id="abc12345")
+            assert len(calls) == 1
+            call = calls[0]
+            assert call.provider == "claude" and call.command == "/implement" and call.success
+            assert call.turns == 2 and call.input_tokens == 200 and call.output_tokens == 40
+            assert call.cache_read_tokens == 1000 and call.cost_usd == 0.0125
+            assert 0.2 <= call.first_output_seconds <= call.latency_seconds
+            assert not call.truncated
+            
+            # Stopping early leaves the call marked truncated, with partial usage
+            success, output = agent.run_slash_command(
+                "/implement", ["spec.md", "abc12345"], working_dir=root,
+                on_line=lambda line: line == "Reading files", adw_id="abc12345",
+            )
+            assert success and output == "Reading files"
+            call = StateStore(Path(root) / "state.db").calls(adw_id="abc12345")[-1]
+            assert call.truncated and call.turns == 1
+            assert call.input_tokens == 100 and call.cost_usd is None
+    finally:
+        agent.get_provider = saved_provider
+        for name, value in (("CLAUDE_CODE_PATH", saved_path), ("ADW_STATE_DB", saved_db)):
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    print("✅ test_claude_stream_json_records_usage passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running provider tests...\n")
+    
+    test_stream_command_bounds_memory()
+    test_stream_command_passes_stdin()
+    test_watchdog_kills_silent_process_group()
+    test_watchdog_enforces_wall_and_phase_limits()
+    test_kimi_stream_typed_events()
+    test_kimi_stream_large_transcripts()
+    test_kimi_escaped_strings_and_synthetic_transcripts()
+    test_kimi_tokenizer_adversarial_inputs()
+    test_spec_extractor_formats()
+    test_stream_command_stops_when_spec_complete()
+    test_fake_provider_scenarios_and_faults()
+    test_claude_stream_json_records_usage()
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Tests for the SQLite job queue."""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adw_modules.jobqueue import JobQueue
+
+
+def test_queue_runs_phases_in_priority_order():
+    """Phases of a job run in order; higher priority jobs are claimed first."""
+    with tempfile.TemporaryDirectory() as root:
+        queue = JobQueue(Path(root) / "queue.db")
+        low = queue.enqueue(1, ("plan", "build"))
+        high = queue.enqueue(2, ("plan", "build"), priority=5)
+
+        first = queue.claim("w1", "host-a")
+        assert (first.job_id, first.phase) == (high, "plan")
+        # build of the same job waits for plan; the other job is free
+        second = queue.claim("w2", "host-a")
+        assert (second.job_id, second.phase) == (low, "plan")
+        assert queue.claim("w3", "host-a") is None
+
+        assert queue.complete(first, True) == "running"
+        # Any worker takes the next phase; the host is only recorded
+        build = queue.claim("w4", "host-b")
+        assert (build.job_id, build.phase) == (high, "build")
+        assert queue.jobs("running")[0]["host"] == "host-b"
+        assert queue.complete(build, True) == "done"
+        assert [job["status"] for job in queue.jobs()] == ["done", "running"]
+    print("✅ test_queue_runs_phases_in_priority_order passed")
+
+
+def test_expired_leases_are_requeued():
+    """A phase whose worker stops heartbeating is handed to another worker."""
+    with tempfile.TemporaryDirectory() as root:
+        queue = JobQueue(Path(root) / "queue.db", retry_delay=0)
+        job = queue.enqueue(3, ("plan",), max_attempts=2)
+
+        lease = queue.claim("w1", "host", lease_seconds=0.2)
+        assert queue.heartbeat(lease, lease_seconds=0.2)
+        time.sleep(0.3)
+        retry = queue.claim("w2", "host", lease_seconds=5)
+        assert (retry.job_id, retry.attempt) == (job, 2)
+        # The original worker lost its lease and cannot renew or complete it
+        assert not queue.heartbeat(lease)
+        assert queue.complete(lease, True) == "running"
+        assert queue.complete(retry, False, "exit code 1") == "failed"
+        assert queue.jobs("failed")[0]["phases"][0]["error"] == "exit code 1"
+
+        queue.reset(job)
+        assert queue.claim("w3", "other-host").attempt == 1
+    print("✅ test_expired_leases_are_requeued passed")
+
+
+def test_failures_retry_and_review_is_nonblocking():
+    """Failed phases retry until out of attempts; a failed review does not stop the job."""
+    with tempfile.TemporaryDirectory() as root:
+        queue = JobQueue(Path(root) / "queue.db", retry_delay=0)
+        queue.enqueue(4, ("build", "review", "pr"), max_attempts=2)
+
+        assert queue.complete(queue.claim("w", "h"), False, "boom") == "running"
+        assert queue.complete(queue.claim("w", "h"), True) == "running"
+        review = queue.claim("w", "h")
+        assert review.phase == "review"
+        assert queue.complete(review, False, "findings") == "running"
+        assert queue.claim("w", "h").phase == "pr"
+    print("✅ test_failures_retry_and_review_is_nonblocking passed")
+
+
+def test_concurrent_claims_never_share_a_phase():
+    """Workers in parallel threads each get distinct phases."""
+    with tempfile.TemporaryDirectory() as root:
+        queue = JobQueue(Path(root) / "queue.db")
+        for number in range(20):
+            queue.enqueue(number, ("plan",))
+        claimed = []
+
+        def worker(name):
+            while True:
+                lease = queue.claim(name, "host")
+                if not lease:
+                    return
+                claimed.append(lease.job_id)
+                queue.complete(lease, True)
+
+        threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(claimed) == list(range(1, 21))
+        assert {job["status"] for job in queue.jobs()} == {"done"}
+    print("✅ test_concurrent_claims_never_share_a_phase passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running queue tests...\n")
+
+    test_queue_runs_phases_in_priority_order()
+    test_expired_leases_are_requeued()
+    test_failures_retry_and_review_is_nonblocking()
+    test_concurrent_claims_never_share_a_phase()
+
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Tests for the run-state store."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adw_modules import checkpoints
+from adw_modules import state as state_module
+from adw_modules.data_types import ADWStateData
+from adw_modules.state import StateStore
+
+
+def test_store_queries_by_index():
+    """Runs can be found by issue, branch, phase, status and time."""
+    with tempfile.TemporaryDirectory() as root:
+        store = StateStore(Path(root) / "state.db")
+        for i in range(30):
+            store.save(ADWStateData(
+                adw_id=f"run{i:05d}", issue_number=str(i % 5), branch_name=f"feat-{i}-x",
+                phase="build" if i % 2 else "test", status="failed" if i % 3 == 0 else "done",
+            ))
+        cutoff = time.time()
+        store.save(ADWStateData(adw_id="run00007", issue_number="2", branch_name="feat-7-x",
+                                phase="pr", status="running"))
+
+        assert store.load("run00012").branch_name == "feat-12-x"
+        assert store.load("missing") is None
+        assert [r["state"].adw_id for r in store.find(issue_number=2)][0] == "run00007"
+        assert len(store.find(issue_number=2)) == 6
+        assert [r["state"].adw_id for r in store.find(branch_name="feat-9-x")] == ["run00009"]
+        assert len(store.find(phase="build", status="failed")) == 5
+        assert [r["state"].adw_id for r in store.find(since=cutoff)] == ["run00007"]
+        assert len(store.find(limit=3)) == 3
+        # Updating keeps the creation time
+        row = store.find(branch_name="feat-7-x")[0]
+        assert row["created_at"] < row["updated_at"]
+
+        with store._connect() as db:
+            plan = db.execute(
+                "EXPLAIN QUERY PLAN SELECT data FROM runs WHERE branch_name = ?", ("x",)
+            ).fetchall()
+        assert "runs_by_branch" in str([tuple(r) for r in plan])
+    print("✅ test_store_queries_by_index passed")
+
+
+def test_save_state_exports_json_and_reads_legacy_files():
+    """save_state keeps adw_state.json; load_state imports old JSON-only runs."""
+    saved_cwd, saved_db = os.getcwd(), os.environ.get("ADW_STATE_DB")
+    with tempfile.TemporaryDirectory() as root:
+        os.chdir(root)
+        os.environ["ADW_STATE_DB"] = str(Path(root) / "state.db")
+        try:
+            state = ADWStateData(adw_id="abc12345", issue_number="4", branch_name="fix-4-bug")
+            state_module.save_state(state)
+            exported = json.loads(Path("agents/abc12345/adw_state.json").read_text())
+            assert exported["branch_name"] == "fix-4-bug"
+            state_module.record_phase(state, "build", "running")
+            assert state_module.load_state("abc12345").status == "running"
+            assert state_module.find_runs(phase="build")[0]["state"].adw_id == "abc12345"
+
+            legacy = Path("agents/old00001/adw_state.json")
+            legacy.parent.mkdir(parents=True)
+            legacy.write_text(json.dumps({"adw_id": "old00001", "issue_number": "1"}))
+            assert state_module.load_state("old00001").issue_number == "1"
+            assert state_module.find_runs(issue_number=1)[0]["state"].adw_id == "old00001"
+        finally:
+            os.chdir(saved_cwd)
+            if saved_db is None:
+                os.environ.pop("ADW_STATE_DB", None)
+            else:
+                os.environ["ADW_STATE_DB"] = saved_db
+    print("✅ test_save_state_exports_json_and_reads_legacy_files passed")
+
+
+def test_concurrent_writers_and_readers():
+    """Threads saving and reading at once never see partial state."""
+    with tempfile.TemporaryDirectory() as root:
+        store = StateStore(Path(root) / "state.db")
+        errors = []
+
+        def writer(n):
+            try:
+                for i in range(25):
+                    store.save(ADWStateData(adw_id=f"w{n}-{i}", issue_number=str(n), status="running"))
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            try:
+                for _ in range(25):
+                    for row in store.find(status="running", limit=10):
+                        assert row["state"].status == "running"
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert len(store.find(limit=1000)) == 100
+    print("✅ test_concurrent_writers_and_readers passed")
+
+
+def test_sdlc_resume_skips_unchanged_phases():
+    """--resume skips completed phases and reruns from the first stale one."""
+    import adw_sdlc
+
+    calls = []
+    outcome = {"test": 1}
+
+    def plan(issue_number, adw_id=None):
+        calls.append("plan")
+        Path("specs").mkdir(exist_ok=True)
+        Path("specs/spec.md").write_text("# Spec")
+        state_module.save_state(ADWStateData(adw_id="res00001", issue_number=str(issue_number),
+                                             plan_file="specs/spec.md", phase="plan", status="done"))
+        return "res00001"
+
+    def phase(name, artifact):
+        def run(issue_number, adw_id):
+            calls.append(name)
+            path = Path("agents") / adw_id / artifact
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(name)
+            if name == "build":
+                Path("lib").mkdir(exist_ok=True)
+                Path("lib/stock.ts").write_text("export const built = true;\n")
+            return outcome.get(name, 0)
+        return types.SimpleNamespace(run=run)
+
+    fakes = {
+        "adw_plan": types.SimpleNamespace(run=plan),
+        "adw_build": phase("build", "implementor/raw_output.txt"),
+        "adw_test": phase("test", "test_results.json"),
+        "adw_review": phase("review", "reviewer/raw_output.txt"),
+        "adw_pr": phase("pr", "pr.txt"),
+    }
+    saved = {name: sys.modules.get(name) for name in fakes}
+    saved_cwd, saved_db = os.getcwd(), os.environ.get("ADW_STATE_DB")
+    saved_fingerprint = checkpoints.issue_fingerprint
+    with tempfile.TemporaryDirectory() as root:
+        subprocess.run(["git", "init", "-q", root], check=True)
+        subprocess.run(["git", "-C", root, "-c", "user.name=t", "-c", "user.email=t@t",
+                        "commit", "-q", "--allow-empty", "-m", "init"], check=True)
+        os.chdir(root)
+        os.environ["ADW_STATE_DB"] = str(Path(root) / "agents" / ".state.db")
+        checkpoints.issue_fingerprint = lambda issue_number: "issue"
+        sys.modules.update(fakes)
+        try:
+            assert adw_sdlc.run(7) == 1
+            assert calls == ["plan", "build", "test"]
+            first = state_module.load_state("res00001").checkpoints
+            assert first["test"].status == "failed"
+            assert first["build"].outputs == ["agents/res00001/implementor/raw_output.txt"]
+            assert json.loads(Path("agents/res00001/adw_state.json").read_text())["checkpoints"]["plan"]
+
+            calls.clear()
+            outcome["test"] = 0
+            assert adw_sdlc.run(7, resume=True) == 0
+            assert calls == ["test", "review", "pr"]
+
+            calls.clear()
+            assert adw_sdlc.run(7, resume=True) == 0
+            assert calls == []
+
+            # Dependencies and build output are not inputs
+            for path in ("node_modules/pkg/index.js", ".next/cache/x", "tsconfig.tsbuildinfo", "lib/.next/y"):
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                Path(path).write_text("generated")
+            assert adw_sdlc.run(7, resume=True) == 0
+            assert calls == []
+
+            # A changed source file invalidates test and everything after it
+            calls.clear()
+            Path("lib/stock.ts").write_text("export const built = false;\n")
+            assert adw_sdlc.run(7, resume=True) == 0
+            assert calls == ["test", "review", "pr"]
+
+            # A changed spec reruns the build
+            calls.clear()
+            Path("specs/spec.md").write_text("# Spec v2")
+            assert adw_sdlc.run(7, resume=True) == 0
+            assert calls == ["build", "test", "review", "pr"]
+        finally:
+            os.chdir(saved_cwd)
+            if saved_db is None:
+                os.environ.pop("ADW_STATE_DB", None)
+            else:
+                os.environ["ADW_STATE_DB"] = saved_db
+            checkpoints.issue_fingerprint = saved_fingerprint
+            for name, module in saved.items():
+                if module is None:
+                    sys.modules.pop(name, None)
+                else:
+                    sys.modules[name] = module
+    print("✅ test_sdlc_resume_skips_unchanged_phases passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running state tests...\n")
+
+    test_store_queries_by_index()
+    test_save_state_exports_json_and_reads_legacy_files()
+    test_concurrent_writers_and_readers()
+    test_sdlc_resume_skips_unchanged_phases()
+
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
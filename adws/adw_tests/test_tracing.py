@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Tests for run tracing."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adw_modules.checks import Check, run_checks_parallel
+from adw_modules.tracing import trace, bind_trace, span, format_waterfall
+
+
+def test_check_spans_nest_under_trace():
+    """Spans from check worker threads nest under the caller's span and reach the trace file."""
+    # B waits for A, so fail-fast cannot cancel A before its span is recorded
+    checks = [Check("a", "A", "true", "first"), Check("b", "B", "false", "second", depends_on=("a",))]
+    with tempfile.TemporaryDirectory() as root:
+        cwd = Path.cwd()
+        try:
+            os.chdir(root)
+            with trace() as tracer:
+                with span("phase", phase="test") as phase:
+                    run_checks_parallel(checks, max_workers=2)
+                assert not Path("agents").exists(), "spans are buffered until the ID is known"
+                bind_trace("run1")
+            lines = Path("agents/run1/trace.jsonl").read_text().splitlines()
+        finally:
+            os.chdir(cwd)
+    
+    by_name = {}
+    for s in tracer.spans:
+        by_name.setdefault(s.name, []).append(s)
+    assert len(lines) == len(tracer.spans)
+    assert {s.parent_id for s in by_name["check"]} == {phase.span_id}
+    assert [s.attrs["passed"] for s in by_name["check"]] == [True, False]
+    waterfall = format_waterfall(tracer.spans)
+    assert "phase [phase=test]" in waterfall and "  check [check=A]" in waterfall
+    print("✅ test_check_spans_nest_under_trace passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running tracing tests...\n")
+    
+    test_check_spans_nest_under_trace()
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Tests for webhook intake and event coalescing."""
+
+import hashlib
+import hmac
+import json
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import requests
+
+from adw_modules.webhook import Coalescer, make_server, triggering_issue, verify_signature
+
+SECRET = "s3cret"
+
+
+def _sign(body: bytes) -> str:
+    return "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _issue_event(number: int, action: str = "opened", labels=("adw",), title: str = "Add export") -> dict:
+    return {
+        "action": action,
+        "issue": {"number": number, "title": title, "labels": [{"name": name} for name in labels]},
+    }
+
+
+def test_signature_and_filter():
+    """Only correctly signed, ADW-labelled issue events trigger runs."""
+    body = b'{"action": "opened"}'
+    assert verify_signature(SECRET, body, _sign(body))
+    assert not verify_signature(SECRET, body + b" ", _sign(body))
+    assert not verify_signature(SECRET, body, None)
+    assert not verify_signature("", body, _sign(body))
+
+    assert triggering_issue("issues", _issue_event(4)) == 4
+    assert triggering_issue("issues", _issue_event(4, labels=(), title="[ADW] Export")) == 4
+    assert triggering_issue("issues", _issue_event(4, labels=("bug",))) is None
+    assert triggering_issue("issues", _issue_event(4, action="closed")) is None
+    assert triggering_issue("issue_comment", _issue_event(4)) is None
+    print("✅ test_signature_and_filter passed")
+
+
+def test_server_coalesces_events_per_issue():
+    """opened + labeled bursts for one issue produce a single dispatch."""
+    dispatched = []
+    release = threading.Event()
+
+    def dispatch(number, events):
+        dispatched.append((number, list(events)))
+        future = Future()
+        threading.Thread(target=lambda: (release.wait(5), future.set_result(None)), daemon=True).start()
+        return future
+
+    coalescer = Coalescer(0.3, dispatch)
+    server = make_server(coalescer, SECRET)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    def deliver(payload: dict, delivery: str, signature: str = None) -> requests.Response:
+        body = json.dumps(payload).encode()
+        return requests.post(url, data=body, headers={
+            "X-GitHub-Event": "issues",
+            "X-GitHub-Delivery": delivery,
+            "X-Hub-Signature-256": signature or _sign(body),
+        })
+
+    try:
+        assert deliver(_issue_event(9), "d1").json() == {"status": "queued", "issue": 9}
+        assert deliver(_issue_event(9, "labeled"), "d2").json()["status"] == "coalesced"
+        assert deliver(_issue_event(9, "labeled"), "d2").json()["status"] == "duplicate"
+        assert deliver(_issue_event(10), "d3").json()["status"] == "queued"
+        assert deliver(_issue_event(11, labels=()), "d4").json() == {"status": "ignored"}
+        assert deliver(_issue_event(12), "d5", signature="sha256=bad").status_code == 401
+
+        deadline = time.time() + 5
+        while len(dispatched) < 2 and time.time() < deadline:
+            time.sleep(0.05)
+        assert sorted(dispatched) == [(9, ["issues.opened", "issues.labeled"]), (10, ["issues.opened"])]
+        assert requests.get(url + "healthz").json() == {"pending": [], "running": [9, 10], "followup": []}
+
+        # Events during a run queue one follow-up run after it
+        assert deliver(_issue_event(9, "labeled"), "d6").json()["status"] == "followup"
+        assert deliver(_issue_event(9, "opened"), "d7").json()["status"] == "followup"
+        assert requests.get(url + "healthz").json()["followup"] == [9]
+        assert len(dispatched) == 2
+        release.set()
+        deadline = time.time() + 5
+        while (len(dispatched) < 3 or coalescer.status()["running"]) and time.time() < deadline:
+            time.sleep(0.05)
+        assert dispatched[2] == (9, ["issues.labeled", "issues.opened"])
+        assert coalescer.status() == {"pending": [], "running": [], "followup": []}
+        assert deliver(_issue_event(9, "labeled"), "d8").json()["status"] == "queued"
+    finally:
+        release.set()
+        coalescer.cancel()
+        server.shutdown()
+        server.server_close()
+    print("✅ test_server_coalesces_events_per_issue passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running webhook tests...\n")
+
+    test_signature_and_filter()
+    test_server_coalesces_events_per_issue()
+
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
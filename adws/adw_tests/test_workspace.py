@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Tests for worktree-backed workspaces."""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adw_modules.workspace import WorkspacePool
+
+GIT = ["git", "-c", "user.name=adw", "-c", "user.email=adw@example.com"]
+
+
+def _commit(root: Path, files: dict, message: str) -> None:
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    subprocess.run(GIT + ["add", "-A"], cwd=root, check=True)
+    subprocess.run(GIT + ["commit", "-qm", message], cwd=root, check=True)
+
+
+def test_workspace_pool_reuses_and_evicts():
+    """Workspaces are installed once, hardlinked, reused and evicted on lockfile change."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "repo"
+        root.mkdir()
+        subprocess.run(GIT + ["init", "-q"], cwd=root, check=True)
+        _commit(root, {"pnpm-lock.yaml": "v1\n", "prisma/schema.prisma": "model A {}\n"}, "init")
+        
+        install_log = Path(tmp) / "installs.log"
+        install = (
+            [sys.executable, "-c",
+             "import os; os.makedirs('node_modules/.prisma', exist_ok=True); "
+             "open('node_modules/.prisma/client.js', 'w').write('x'); "
+             f"open({str(install_log)!r}, 'a').write('install\\n')"],
+        )
+        pool = WorkspacePool(root, Path(tmp) / "pool", install_commands=install)
+        
+        assert pool.warm(1, "HEAD") == 1
+        first = pool.acquire("HEAD")
+        assert (first / "node_modules" / ".prisma" / "client.js").exists()
+        
+        # Pool is empty now: the next workspace is hardlinked from the first
+        second = pool.acquire("HEAD")
+        assert second != first
+        assert (second / "node_modules" / ".prisma" / "client.js").stat().st_nlink == 2
+        assert install_log.read_text().count("install") == 1
+        
+        (first / "scratch.txt").write_text("left over")
+        pool.release(first, "HEAD")
+        assert pool.acquire("HEAD") == first
+        assert not (first / "scratch.txt").exists()
+        assert (first / "node_modules").is_dir()
+        pool.release(first)
+        pool.release(second)
+        
+        _commit(root, {"pnpm-lock.yaml": "v2\n"}, "bump lockfile")
+        assert pool.evict_stale("HEAD") == 2
+        assert pool.entries() == []
+        assert not first.exists()
+    print("✅ test_workspace_pool_reuses_and_evicts passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running workspace tests...\n")
+    
+    test_workspace_pool_reuses_and_evicts()
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
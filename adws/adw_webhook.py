@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+ADW Webhook - Long-running intake for GitHub issue webhooks.
+
+Usage:
+    python adws/adw_webhook.py [--host 0.0.0.0] [--port 8787] [--jobs N]
+        [--window 10] [--base origin/main] [--no-warm]
+
+Point a repository webhook (content type `application/json`, "Issues"
+events) at this server and set the same secret in GITHUB_WEBHOOK_SECRET.
+Deliveries are verified against X-Hub-Signature-256 and filtered like
+issue-triggered.yml. Events for one issue that arrive within --window
+seconds trigger a single run; events that arrive while its run is in
+progress queue one follow-up run after it.
+
+Runs execute `adw.py sdlc` on a pool of --jobs local workers, in worktrees
+taken from the warm workspace pool, so dependencies are already installed.
+Before each run the remote of --base is fetched and --base re-resolved, so
+a long-lived daemon does not keep building on the commit it started at.
+"""
+
+import sys
+import argparse
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from adw_batch import prepare_worktree, finish_pipeline, run_pipeline, sdlc_flags
+from adw_modules.utils import generate_adw_id
+from adw_modules.webhook import Coalescer, make_server, get_webhook_secret, get_coalesce_window
+from adw_modules.workspace import WorkspacePool
+from adw_modules.worktrees import fetch_remote, repo_root, resolve_ref
+
+
+DEFAULT_PORT = 8787
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Webhook - Issue webhook intake daemon")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=int(os.getenv("ADW_WEBHOOK_PORT", DEFAULT_PORT)))
+    parser.add_argument("--jobs", type=int, default=2, help="Pipelines to run at once")
+    parser.add_argument("--window", type=float, default=get_coalesce_window(),
+                        help="Seconds to coalesce events per issue")
+    parser.add_argument("--base", default="origin/main", help="Ref each run starts from")
+    parser.add_argument("--skip-test", action="store_true", help="Skip test phase")
+    parser.add_argument("--skip-review", action="store_true", help="Skip review phase")
+    parser.add_argument("--no-warm", action="store_true", help="Use fresh worktrees instead of the pool")
+    args = parser.parse_args(argv)
+
+    secret = get_webhook_secret()
+    if not secret:
+        print("❌ GITHUB_WEBHOOK_SECRET is not set")
+        return 1
+
+    root = repo_root()
+    # Only a remote-tracking --base (e.g. origin/main) moves on fetch
+    remote = args.base.split("/", 1)[0] if resolve_ref(f"refs/remotes/{args.base}", str(root)) else None
+    fetch_lock = threading.Lock()
+
+    def current_base() -> str:
+        """Fetch and resolve --base; runs start from the commit, not the moving ref."""
+        with fetch_lock:
+            if remote and not fetch_remote(remote, str(root)):
+                print(f"⚠️  git fetch {remote} failed, using the last fetched {args.base}", flush=True)
+            return resolve_ref(args.base, str(root)) or "HEAD"
+
+    base = current_base()
+    pool = None if args.no_warm else WorkspacePool(root)
+    if pool:
+        print(f"🔥 Warming {args.jobs} workspaces at {base[:12]}...")
+        pool.warm(args.jobs, base)
+
+    env = dict(os.environ)
+    flags = sdlc_flags(args.skip_test, args.skip_review)
+    log_dir = root / "agents" / "webhook"
+
+    def run_issue(issue_number: int, events: list) -> dict:
+        # Nothing reads the worker's future, so an error is logged here or lost
+        try:
+            return start_issue(issue_number, events)
+        except Exception as exc:
+            print(f"❌ #{issue_number}: {type(exc).__name__}: {exc}", flush=True)
+            traceback.print_exc()
+            return {"issue_number": issue_number, "adw_id": None, "returncode": None}
+
+    def start_issue(issue_number: int, events: list) -> dict:
+        adw_id = generate_adw_id()
+        base = current_base()
+        print(f"🚀 #{issue_number} ({adw_id}) at {base[:12]} for {len(events)} event(s): "
+              f"{', '.join(events)}", flush=True)
+        worktree = prepare_worktree(root, adw_id, base, pool)
+        if not worktree:
+            print(f"❌ #{issue_number}: could not create worktree", flush=True)
+            return {"issue_number": issue_number, "adw_id": adw_id, "returncode": None}
+        row = run_pipeline(issue_number, adw_id, worktree,
+                           log_dir / f"{issue_number}-{adw_id}.log", env, flags)
+        finish_pipeline(row, root, base, pool, cleanup=True)
+        icon = "✅" if row["returncode"] == 0 else "❌"
+        print(f"{icon} #{issue_number} ({adw_id}) in {row['duration_seconds']:.0f}s", flush=True)
+        return row
+
+    workers = ThreadPoolExecutor(max_workers=args.jobs)
+    coalescer = Coalescer(args.window, lambda number, events: workers.submit(run_issue, number, events))
+    server = make_server(coalescer, secret, args.host, args.port)
+    print(f"📡 Listening on http://{args.host}:{server.server_address[1]} "
+          f"({args.jobs} workers, {args.window:g}s window)", flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down, waiting for running pipelines...")
+    finally:
+        server.server_close()
+        coalescer.cancel()
+        workers.shutdown(wait=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+ADW Workspaces - Manage the warm workspace pool.
+
+Usage:
+    python adws/adw_workspaces.py warm <count> [--base origin/main]
+    python adws/adw_workspaces.py list
+    python adws/adw_workspaces.py evict [--base origin/main]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from adw_modules.worktrees import repo_root
+from adw_modules.workspace import WorkspacePool
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="ADW Workspaces - Warm workspace pool")
+    parser.add_argument("action", choices=["warm", "list", "evict"])
+    parser.add_argument("count", type=int, nargs="?", default=1, help="Idle workspaces to keep (warm)")
+    parser.add_argument("--base", default="origin/main", help="Ref workspaces are checked out at")
+    args = parser.parse_args(argv)
+    
+    pool = WorkspacePool(repo_root())
+    
+    if args.action == "warm":
+        print(f"🔥 Warming {args.count} workspaces at {args.base}...")
+        created = pool.warm(args.count, args.base)
+        print(f"✅ Created {created} workspaces")
+    elif args.action == "evict":
+        removed = pool.evict_stale(args.base)
+        print(f"🧹 Evicted {removed} stale workspaces")
+    else:
+        key = pool.env_key(args.base)
+        for entry in pool.entries():
+            marker = "" if entry["key"] == key else " (stale)"
+            print(f"{entry['status']:<5} {entry['key']} {entry['path']}{marker}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())